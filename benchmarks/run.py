@@ -0,0 +1,281 @@
+"""Benchmarks for the hot paths of the rhinoscript package
+
+The rhinoscript package normally runs inside Rhino. The modules in the stubs
+directory stand in for the Rhino, System and RhinoPython assemblies with an
+in-memory document, so these benchmarks run on a plain CPython 2.7 install:
+
+  python2 benchmarks/run.py
+  python2 benchmarks/run.py --sizes 1000,100000 --repeat 5 --output before.json
+  python2 benchmarks/run.py --filter coerce
+
+Results are written as JSON. Times are in seconds, the best of --repeat runs.
+Setup (creating documents and input data) is not included in the times.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, "stubs"), os.path.join(HERE, "..", "scripts")]
+
+import rhinodoc
+import System
+import Rhino
+import rhinoscript
+
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Registers a benchmark. The decorated function takes the problem size,
+    does its setup and returns the function to time"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def random_points(count, seed=1):
+    rnd = random.Random(seed)
+    return [(rnd.random()*100.0, rnd.random()*100.0, rnd.random()*100.0) for i in xrange(count)]
+
+
+def add_points(count):
+    with rhinoscript.document.batch():
+        return rhinoscript.geometry.AddPoints(random_points(count))
+
+
+def grid_mesh(count):
+    """vertices and faces of a square grid mesh with about count vertices"""
+    side = max(int(count**0.5), 2)
+    vertices = [(float(i), float(j), 0.0) for j in xrange(side) for i in xrange(side)]
+    faces = []
+    for j in xrange(side-1):
+        for i in xrange(side-1):
+            a = j*side + i
+            faces.append((a, a+1, a+side+1, a+side))
+    return vertices, faces
+
+
+@benchmark("coerce3dpointlist.tuples")
+def bench_coerce_tuples(size):
+    points = random_points(size)
+    return lambda: rhinoscript.utility.coerce3dpointlist(points)
+
+
+@benchmark("coerce3dpointlist.point3d")
+def bench_coerce_point3d(size):
+    points = [Rhino.Geometry.Point3d(*point) for point in random_points(size)]
+    return lambda: rhinoscript.utility.coerce3dpointlist(points)
+
+
+@benchmark("coerce3dpointlist.flat")
+def bench_coerce_flat(size):
+    values = [c for point in random_points(size) for c in point]
+    return lambda: rhinoscript.utility.coerce3dpointlist(values)
+
+
+@benchmark("coerceguid")
+def bench_coerceguid(size):
+    ids = [str(System.Guid.NewGuid()) for i in xrange(size)]
+    coerceguid = rhinoscript.utility.coerceguid
+    return lambda: [coerceguid(id) for id in ids]
+
+
+@benchmark("AllObjects")
+def bench_allobjects(size):
+    add_points(size)
+    return lambda: rhinoscript.selection.AllObjects()
+
+
+@benchmark("ObjectsByLayer")
+def bench_objectsbylayer(size):
+    layers = [rhinoscript.layer.AddLayer("Layer %02d" % i) for i in range(10)]
+    ids = add_points(size)
+    for i, id in enumerate(ids): rhinoscript.object.ObjectLayer(id, layers[i%10])
+    return lambda: rhinoscript.selection.ObjectsByLayer("Layer 03")
+
+
+@benchmark("CullDuplicatePointsEx")
+def bench_cullduplicatepointsex(size):
+    points = random_points(size/2)
+    points += [(x+1e-5, y, z) for x, y, z in points]
+    return lambda: rhinoscript.utility.CullDuplicatePointsEx(points, 0.001)
+
+
+@benchmark("DivideCurves")
+def bench_dividecurves(size):
+    with rhinoscript.document.batch():
+        ids = [rhinoscript.curve.AddLine((0, i, 0), (10, i, 0)) for i in xrange(size)]
+    return lambda: rhinoscript.curve.DivideCurves(ids, 10)
+
+
+@benchmark("EvaluateCurve.packed")
+def bench_evaluatecurve_packed(size):
+    id = rhinoscript.curve.AddLine((0, 0, 0), (10, 0, 0))
+    params = [10.0*i/size for i in xrange(size)]
+    return lambda: rhinoscript.curve.EvaluateCurve(id, params)
+
+
+@benchmark("IterObjects.first")
+def bench_iterobjects_first(size):
+    add_points(size)
+    return lambda: next(rhinoscript.selection.IterObjects(1))
+
+
+@benchmark("MeshVertices")
+def bench_meshvertices(size):
+    vertices, faces = grid_mesh(size)
+    id = rhinoscript.mesh.AddMesh(vertices, faces)
+    return lambda: rhinoscript.mesh.MeshVertices(id)
+
+
+@benchmark("AddMesh")
+def bench_addmesh(size):
+    vertices, faces = grid_mesh(size)
+    return lambda: rhinoscript.mesh.AddMesh(vertices, faces)
+
+
+@benchmark("MeshExport.ply")
+def bench_meshexport_ply(size):
+    vertices, faces = grid_mesh(size)
+    id = rhinoscript.mesh.AddMesh(vertices, faces)
+    filename = os.path.join(tempfile.gettempdir(), "rhinoscript_bench_mesh.ply")
+    return lambda: rhinoscript.mesh.MeshExport(id, filename)
+
+
+@benchmark("MeshImport.ply")
+def bench_meshimport_ply(size):
+    vertices, faces = grid_mesh(size)
+    id = rhinoscript.mesh.AddMesh(vertices, faces)
+    filename = os.path.join(tempfile.gettempdir(), "rhinoscript_bench_mesh.ply")
+    rhinoscript.mesh.MeshExport(id, filename)
+    return lambda: rhinoscript.mesh.MeshImport(filename)
+
+
+@benchmark("StickyCache")
+def bench_stickycache(size):
+    import scriptcontext
+    cache = scriptcontext.StickyCache(max_items=size/2)
+    def run():
+        for i in xrange(size):
+            if cache.get(i%(size*3/4)) is None: cache.set(i%(size*3/4), i)
+    return run
+
+
+@benchmark("TransformObjects")
+def bench_transformobjects(size):
+    ids = add_points(size)
+    xform = Rhino.Geometry.Transform.Translation(1.0, 2.0, 3.0)
+    return lambda: rhinoscript.object.TransformObjects(ids, xform)
+
+
+@benchmark("ObjectTableSnapshot")
+def bench_objecttablesnapshot(size):
+    add_points(size)
+    return lambda: rhinoscript.object.ObjectTableSnapshot()
+
+
+@benchmark("ReadPoints.ply")
+def bench_readpoints_ply(size):
+    filename = os.path.join(tempfile.gettempdir(), "rhinoscript_bench.ply")
+    rhinoscript.pointio.WritePoints(filename, random_points(size))
+    return lambda: [len(coords) for coords in rhinoscript.pointio.ReadPoints(filename)]
+
+
+@benchmark("ReadPoints.xyz")
+def bench_readpoints_xyz(size):
+    filename = os.path.join(tempfile.gettempdir(), "rhinoscript_bench.xyz")
+    rhinoscript.pointio.WritePoints(filename, random_points(size))
+    return lambda: [len(coords) for coords in rhinoscript.pointio.ReadPoints(filename)]
+
+
+@benchmark("SetObjectAttributes")
+def bench_setobjectattributes(size):
+    ids = add_points(size)
+    colors = [(i%256, 0, 0) for i in xrange(size)]
+    return lambda: rhinoscript.object.SetObjectAttributes(ids, color=colors)
+
+
+@benchmark("SortPoints")
+def bench_sortpoints(size):
+    points = [Rhino.Geometry.Point3d(*point) for point in random_points(size)]
+    return lambda: rhinoscript.utility.SortPoints(points)
+
+
+@benchmark("SortPoints.hilbert")
+def bench_sortpoints_hilbert(size):
+    points = [Rhino.Geometry.Point3d(*point) for point in random_points(size)]
+    return lambda: rhinoscript.utility.SortPoints(points, order=7, return_indices=True)
+
+
+def git_revision():
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=HERE,
+                                         stderr=open(os.devnull, "w"))
+        return output.strip()
+    except Exception:
+        return None
+
+
+def run(names, sizes, repeat, log):
+    results = []
+    for name, setup in BENCHMARKS:
+        if names and not any(n in name for n in names): continue
+        for size in sizes:
+            rhinodoc.new_document()
+            func = setup(size)
+            runs = []
+            for i in range(repeat):
+                start = timeit.default_timer()
+                func()
+                runs.append(timeit.default_timer() - start)
+            results.append({"name": name, "size": size, "best": min(runs), "runs": runs})
+            log.write("%-28s %9d %12.6f s\n" % (name, size, min(runs)))
+            log.flush()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="comma separated problem sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per benchmark and size, the best is reported (default: %(default)s)")
+    parser.add_argument("--filter", action="append", default=[],
+                        help="only run benchmarks whose name contains this text, can be repeated")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+    if args.list:
+        for name, setup in BENCHMARKS: print name
+        return 0
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run(args.filter, sizes, max(args.repeat, 1), sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f: f.write(text + "\n")
+    else:
+        print text
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
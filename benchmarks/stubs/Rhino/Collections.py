@@ -0,0 +1,17 @@
+import _autostub
+from Geometry import Point3d
+
+
+class Point3dList(list):
+    @property
+    def Count(self): return len(self)
+
+    @staticmethod
+    def ClosestIndexInList(points, test_point):
+        best = -1; bestd = None
+        for i, pt in enumerate(points):
+            d = pt.DistanceTo(test_point)
+            if bestd is None or d < bestd: best, bestd = i, d
+        return best
+
+_autostub.wrap(__name__)
@@ -0,0 +1,14 @@
+"""Rhino.Commands.Command with the EndCommand event and the command stack"""
+from __future__ import absolute_import
+import _autostub
+from Rhino import Event
+
+
+EndCommand = Event()
+_stack = [] # ids of the running commands, innermost last
+
+
+def GetCommandStack(): return list(_stack)
+
+
+_autostub.wrap(__name__)
@@ -0,0 +1,3 @@
+"""Rhino.Commands namespace"""
+import _autostub
+_autostub.wrap(__name__)
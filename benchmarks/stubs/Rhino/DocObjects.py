@@ -0,0 +1,254 @@
+"""Document object model: RhinoObject, ObjectAttributes, Layer and enums"""
+import copy
+
+import _autostub
+import Geometry
+
+
+class ObjectType(object):
+    Point = 1
+    PointSet = 2
+    Curve = 4
+    Surface = 8
+    Brep = 16
+    Mesh = 32
+    Light = 256
+    Annotation = 512
+    InstanceReference = 4096
+    TextDot = 8192
+    Grip = 16384
+    Detail = 32768
+    Hatch = 65536
+    MorphControl = 131072
+    PolysrfFilter = 2097152
+    Cage = 134217728
+    Phantom = 268435456
+    ClipPlane = 536870912
+    Extrusion = 1073741824
+    AnyObject = 0xFFFFFFFF
+setattr(ObjectType, "None", 0)
+
+
+class ObjectColorSource(object):
+    ColorFromLayer = 0
+    ColorFromObject = 1
+    ColorFromMaterial = 2
+    ColorFromParent = 3
+
+class ObjectPlotColorSource(object):
+    PlotColorFromLayer = 0
+    PlotColorFromObject = 1
+    PlotColorFromDisplay = 2
+    PlotColorFromParent = 3
+
+class ObjectPlotWeightSource(object):
+    PlotWeightFromLayer = 0
+    PlotWeightFromObject = 1
+    PlotWeightFromParent = 3
+
+class ObjectLinetypeSource(object):
+    LinetypeFromLayer = 0
+    LinetypeFromObject = 1
+    LinetypeFromParent = 3
+
+class ObjectMaterialSource(object):
+    MaterialFromLayer = 0
+    MaterialFromObject = 1
+    MaterialFromParent = 3
+
+class ActiveSpace(object):
+    ModelSpace = 0
+    PageSpace = 1
+setattr(ActiveSpace, "None", 0)
+
+
+class ObjectEnumeratorSettings(object):
+    def __init__(self):
+        self.NormalObjects = True
+        self.LockedObjects = True
+        self.HiddenObjects = False
+        self.ActiveObjects = True
+        self.ReferenceObjects = True
+        self.DeletedObjects = False
+        self.IncludeLights = False
+        self.IncludeGrips = False
+        self.IncludePhantoms = False
+        self.SelectedObjectsFilter = False
+        self.VisibleFilter = False
+        self.ObjectTypeFilter = ObjectType.AnyObject
+        self.LayerIndexFilter = -1
+        self.NameFilter = None
+        self.ObjectColorFilter = None
+
+
+class ObjectAttributes(object):
+    def __init__(self):
+        self.Name = None
+        self.LayerIndex = 0
+        self.ObjectColor = None
+        self.ColorSource = ObjectColorSource.ColorFromLayer
+        self.PlotColor = None
+        self.PlotColorSource = ObjectPlotColorSource.PlotColorFromLayer
+        self.PlotWeight = 0.0
+        self.PlotWeightSource = ObjectPlotWeightSource.PlotWeightFromLayer
+        self.LinetypeIndex = -1
+        self.LinetypeSource = ObjectLinetypeSource.LinetypeFromLayer
+        self.MaterialIndex = -1
+        self.MaterialSource = ObjectMaterialSource.MaterialFromLayer
+        self.Space = ActiveSpace.ModelSpace
+        self.Visible = True
+        self._groups = []
+        self._userstrings = {}
+
+    def Duplicate(self):
+        rc = copy.copy(self)
+        rc._groups = list(self._groups)
+        rc._userstrings = dict(self._userstrings)
+        return rc
+
+    def DrawColor(self, doc):
+        if self.ColorSource == ObjectColorSource.ColorFromObject and self.ObjectColor is not None:
+            return self.ObjectColor
+        return doc.Layers[self.LayerIndex].Color
+
+    def SetUserString(self, key, value):
+        if value is None: self._userstrings.pop(key, None)
+        else: self._userstrings[key] = value
+        return True
+    def GetUserString(self, key): return self._userstrings.get(key)
+    def GetUserStrings(self): return NameValueCollection(self._userstrings)
+    @property
+    def UserStringCount(self): return len(self._userstrings)
+
+    @property
+    def GroupCount(self): return len(self._groups)
+    def GetGroupList(self): return list(self._groups)
+    def AddToGroup(self, index):
+        if index not in self._groups: self._groups.append(index)
+
+
+class NameValueCollection(object):
+    def __init__(self, values):
+        self._keys = sorted(values)
+        self._values = dict(values)
+    @property
+    def Count(self): return len(self._keys)
+    def GetKey(self, index): return self._keys[index]
+    def Get(self, key): return self._values.get(key)
+    @property
+    def AllKeys(self): return list(self._keys)
+
+
+class RhinoObject(object):
+    NextRuntimeSerialNumber = 1
+
+    def __init__(self, doc, geometry, attributes, id):
+        self.Document = doc
+        self.Id = id
+        self._geometry = geometry
+        self._attributes = attributes
+        self.IsDeleted = False
+        self.IsHidden = False
+        self.IsLocked = False
+        self.IsReference = False
+        self._selected = False
+        self.RuntimeSerialNumber = RhinoObject.NextRuntimeSerialNumber
+        RhinoObject.NextRuntimeSerialNumber += 1
+        self._committed = attributes.Duplicate()
+
+    @property
+    def Geometry(self): return self._geometry
+    @property
+    def Attributes(self): return self._attributes
+    @Attributes.setter
+    def Attributes(self, value): self._attributes = value
+    @property
+    def ObjectType(self): return self._geometry.ObjectType
+    @property
+    def Name(self): return self._attributes.Name
+    @property
+    def GroupCount(self): return self._attributes.GroupCount
+    def GetGroupList(self): return self._attributes.GetGroupList()
+    @property
+    def IsNormal(self): return not (self.IsHidden or self.IsLocked)
+
+    def IsSelected(self, check_subobjects=False): return 2 if self._selected else 0
+    def IsSelectable(self, *args): return not (self.IsHidden or self.IsLocked)
+    def Select(self, on, *args):
+        self._selected = bool(on)
+        return 1
+
+    def ShortDescription(self, plural): return type(self._geometry).__name__.lower()
+
+    def CommitChanges(self):
+        return self.Document.Objects._commit(self)
+
+
+class PointObject(RhinoObject): pass
+class CurveObject(RhinoObject): pass
+class MeshObject(RhinoObject): pass
+class BrepObject(RhinoObject): pass
+class PointCloudObject(RhinoObject): pass
+
+
+class ObjRef(object):
+    def __init__(self, id): self.ObjectId = id
+
+
+class Tables(object):
+    class LayerTableEventType(object):
+        Added, Deleted, Undeleted, Modified, Sorted, Current = range(6)
+
+
+class Layer(object):
+    def __init__(self):
+        self.Name = ""
+        self.Id = None
+        self.LayerIndex = -1
+        self.ParentLayerId = None
+        self.IsVisible = True
+        self.IsLocked = False
+        self.IsExpanded = False
+        self.IsDeleted = False
+        self.IsReference = False
+        self.Color = None
+        self.PlotColor = None
+        self.PlotWeight = 0.0
+        self.LinetypeIndex = -1
+        self.RenderMaterialIndex = -1
+        self.SortIndex = -1
+        self._table = None
+
+    @staticmethod
+    def GetDefaultLayerProperties():
+        drawing = __import__("System.Drawing", {}, {}, ["Color"], 0) # not Rhino.System
+        rc = Layer()
+        rc.Color = drawing.Color.Black
+        return rc
+
+    @property
+    def FullPath(self):
+        if self._table is None: return self.Name
+        parent = self._table._by_id(self.ParentLayerId)
+        if parent is None: return self.Name
+        return parent.FullPath + "::" + self.Name
+
+    def GetChildren(self):
+        if self._table is None: return None
+        rc = [l for l in self._table if l.ParentLayerId == self.Id and not l.IsDeleted]
+        return rc or None
+
+    def IsChildOf(self, other):
+        parent = self._table._by_id(self.ParentLayerId)
+        while parent is not None:
+            if parent.Id == other.Id: return True
+            parent = self._table._by_id(parent.ParentLayerId)
+        return False
+
+    def IsParentOf(self, other): return other.IsChildOf(self)
+
+    def CommitChanges(self):
+        if self._table is None: return False
+        return self._table.Modify(self, self.LayerIndex, True)
+
+_autostub.wrap(__name__)
@@ -0,0 +1,642 @@
+"""Pure-Python models of the RhinoCommon geometry types used by rhinoscript"""
+import math
+
+import _autostub
+
+
+class _XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if not isinstance(x, (int, long, float)):
+            x, y, z = x.X, x.Y, x.Z
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.X == other.X and self.Y == other.Y and self.Z == other.Z
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return hash((self.X, self.Y, self.Z))
+    def __getitem__(self, index): return (self.X, self.Y, self.Z)[index]
+    def __len__(self): return 3
+    def __repr__(self): return "%s,%s,%s" % (self.X, self.Y, self.Z)
+    __str__ = __repr__
+
+    def CompareTo(self, other):
+        return cmp((self.X, self.Y, self.Z), (other.X, other.Y, other.Z))
+
+    def Transform(self, xform):
+        rc = xform * self
+        self.X, self.Y, self.Z = rc.X, rc.Y, rc.Z
+
+    @property
+    def IsValid(self): return True
+
+
+class Point3d(_XYZ):
+    __slots__ = ()
+
+    def __add__(self, other): return Point3d(self.X+other.X, self.Y+other.Y, self.Z+other.Z)
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if type(other) is Vector3d:
+            return Point3d(self.X-other.X, self.Y-other.Y, self.Z-other.Z)
+        return Vector3d(self.X-other.X, self.Y-other.Y, self.Z-other.Z)
+
+    def __mul__(self, s): return Point3d(self.X*s, self.Y*s, self.Z*s)
+    __rmul__ = __mul__
+    def __div__(self, s): return Point3d(self.X/s, self.Y/s, self.Z/s)
+    __truediv__ = __div__
+
+    def DistanceTo(self, other):
+        dx = self.X-other.X; dy = self.Y-other.Y; dz = self.Z-other.Z
+        return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+    @staticmethod
+    def CullDuplicates(points, tolerance):
+        rc = []
+        for pt in points:
+            for other in rc:
+                if pt.DistanceTo(other) <= tolerance: break
+            else:
+                rc.append(pt)
+        return rc
+
+    @staticmethod
+    def SortAndCullPointList(points, tolerance):
+        return sorted(Point3d.CullDuplicates(points, tolerance), key=lambda p: (p.X, p.Y, p.Z))
+
+    @staticmethod
+    def ArePointsCoplanar(points, tolerance):
+        pts = list(points)
+        if len(pts) < 4: return True
+        rc, plane = Plane.FitPlaneToPoints(pts)
+        return all(abs(plane.DistanceTo(p)) <= tolerance for p in pts)
+
+Point3d.Origin = Point3d(0, 0, 0)
+Point3d.Unset = Point3d(-1.23432101234321e+308, -1.23432101234321e+308, -1.23432101234321e+308)
+
+
+class Point3f(_XYZ):
+    __slots__ = ()
+
+
+class Vector3d(_XYZ):
+    __slots__ = ()
+
+    def __add__(self, other):
+        if type(other) is Point3d:
+            return Point3d(self.X+other.X, self.Y+other.Y, self.Z+other.Z)
+        return Vector3d(self.X+other.X, self.Y+other.Y, self.Z+other.Z)
+    def __sub__(self, other): return Vector3d(self.X-other.X, self.Y-other.Y, self.Z-other.Z)
+    def __neg__(self): return Vector3d(-self.X, -self.Y, -self.Z)
+
+    def __mul__(self, other):
+        if isinstance(other, _XYZ):
+            return self.X*other.X + self.Y*other.Y + self.Z*other.Z
+        return Vector3d(self.X*other, self.Y*other, self.Z*other)
+    __rmul__ = __mul__
+    def __div__(self, s): return Vector3d(self.X/s, self.Y/s, self.Z/s)
+    __truediv__ = __div__
+
+    @property
+    def Length(self): return math.sqrt(self.X*self.X + self.Y*self.Y + self.Z*self.Z)
+
+    @property
+    def IsZero(self): return self.X == 0 and self.Y == 0 and self.Z == 0
+
+    def IsTiny(self, tolerance=1.0e-12):
+        return abs(self.X) <= tolerance and abs(self.Y) <= tolerance and abs(self.Z) <= tolerance
+
+    def Unitize(self):
+        length = self.Length
+        if length == 0: return False
+        self.X /= length; self.Y /= length; self.Z /= length
+        return True
+
+    def Reverse(self):
+        self.X, self.Y, self.Z = -self.X, -self.Y, -self.Z
+        return True
+
+    def IsParallelTo(self, other):
+        a = Vector3d(self); b = Vector3d(other)
+        if not a.Unitize() or not b.Unitize(): return 0
+        d = a*b
+        if d >= 1 - 1e-9: return 1
+        if d <= -1 + 1e-9: return -1
+        return 0
+
+    def IsPerpendicularTo(self, other):
+        a = Vector3d(self); b = Vector3d(other)
+        if not a.Unitize() or not b.Unitize(): return False
+        return abs(a*b) <= 1e-9
+
+    def Rotate(self, angle, axis):
+        rc = Transform.Rotation(angle, axis, Point3d.Origin) * self
+        self.X, self.Y, self.Z = rc.X, rc.Y, rc.Z
+        return True
+
+    @staticmethod
+    def CrossProduct(a, b):
+        return Vector3d(a.Y*b.Z - a.Z*b.Y, a.Z*b.X - a.X*b.Z, a.X*b.Y - a.Y*b.X)
+
+Vector3d.Zero = Vector3d(0, 0, 0)
+Vector3d.XAxis = Vector3d(1, 0, 0)
+Vector3d.YAxis = Vector3d(0, 1, 0)
+Vector3d.ZAxis = Vector3d(0, 0, 1)
+Vector3d.Unset = Vector3d(-1.23432101234321e+308, -1.23432101234321e+308, -1.23432101234321e+308)
+
+
+class Vector3f(_XYZ):
+    __slots__ = ()
+
+
+class Point2d(object):
+    __slots__ = ("X", "Y")
+    def __init__(self, x=0.0, y=0.0):
+        if not isinstance(x, (int, long, float)): x, y = x.X, x.Y
+        self.X = float(x); self.Y = float(y)
+
+Point2f = Point2d
+
+
+class Interval(object):
+    def __init__(self, t0=0.0, t1=0.0): self.T0 = t0; self.T1 = t1
+    def __getitem__(self, index): return (self.T0, self.T1)[index]
+    @property
+    def Length(self): return self.T1 - self.T0
+    @property
+    def Min(self): return min(self.T0, self.T1)
+    @property
+    def Max(self): return max(self.T0, self.T1)
+    def ParameterAt(self, normalized): return self.T0 + normalized*(self.T1-self.T0)
+
+
+class Transform(object):
+    """4x4 matrix stored row-major in a flat list"""
+    __slots__ = ("_m",)
+
+    def __init__(self, diagonal=0.0):
+        d = float(diagonal)
+        self._m = [d, 0.0, 0.0, 0.0, 0.0, d, 0.0, 0.0, 0.0, 0.0, d, 0.0, 0.0, 0.0, 0.0, d]
+
+    def __getitem__(self, index):
+        i, j = index
+        return self._m[i*4+j]
+    def __setitem__(self, index, value):
+        i, j = index
+        self._m[i*4+j] = float(value)
+
+    @property
+    def M00(self): return self._m[0]
+
+    def __mul__(self, other):
+        m = self._m
+        if isinstance(other, Transform):
+            o = other._m
+            rc = Transform()
+            rc._m = [sum(m[i*4+k]*o[k*4+j] for k in range(4)) for i in range(4) for j in range(4)]
+            return rc
+        x, y, z = other.X, other.Y, other.Z
+        if type(other) is Vector3d:
+            return Vector3d(m[0]*x+m[1]*y+m[2]*z, m[4]*x+m[5]*y+m[6]*z, m[8]*x+m[9]*y+m[10]*z)
+        w = m[12]*x+m[13]*y+m[14]*z+m[15]
+        if w == 0: w = 1.0
+        return Point3d((m[0]*x+m[1]*y+m[2]*z+m[3])/w, (m[4]*x+m[5]*y+m[6]*z+m[7])/w,
+                       (m[8]*x+m[9]*y+m[10]*z+m[11])/w)
+
+    @property
+    def IsValid(self): return True
+
+    @staticmethod
+    def Translation(*args):
+        v = args[0] if len(args) == 1 else Vector3d(*args)
+        rc = Transform(1.0)
+        rc._m[3], rc._m[7], rc._m[11] = v.X, v.Y, v.Z
+        return rc
+
+    @staticmethod
+    def Scale(*args):
+        if isinstance(args[0], Point3d):
+            center, s = args
+            rc = Transform(s); rc._m[15] = 1.0
+            rc._m[3] = center.X*(1-s); rc._m[7] = center.Y*(1-s); rc._m[11] = center.Z*(1-s)
+            return rc
+        plane, sx, sy, sz = args
+        rc = Transform(1.0)
+        rc._m[0], rc._m[5], rc._m[10] = sx, sy, sz
+        return rc
+
+    @staticmethod
+    def Rotation(angle, axis, center):
+        a = Vector3d(axis); a.Unitize()
+        c = math.cos(angle); s = math.sin(angle); t = 1-c
+        x, y, z = a.X, a.Y, a.Z
+        rc = Transform(1.0)
+        rc._m[0:3] = [t*x*x+c, t*x*y-s*z, t*x*z+s*y]
+        rc._m[4:7] = [t*x*y+s*z, t*y*y+c, t*y*z-s*x]
+        rc._m[8:11] = [t*x*z-s*y, t*y*z+s*x, t*z*z+c]
+        p = Point3d(center)
+        moved = rc*p
+        rc._m[3] = p.X-moved.X; rc._m[7] = p.Y-moved.Y; rc._m[11] = p.Z-moved.Z
+        return rc
+
+Transform.Identity = Transform(1.0)
+
+
+class BoundingBox(object):
+    def __init__(self, *args):
+        if len(args) == 2 and isinstance(args[0], _XYZ):
+            a, b = args
+            self.Min = Point3d(min(a.X, b.X), min(a.Y, b.Y), min(a.Z, b.Z))
+            self.Max = Point3d(max(a.X, b.X), max(a.Y, b.Y), max(a.Z, b.Z))
+        elif len(args) == 6:
+            self.Min = Point3d(*args[:3]); self.Max = Point3d(*args[3:])
+        else:
+            pts = list(args[0]) if args else []
+            if not pts:
+                self.Min = Point3d(1, 1, 1); self.Max = Point3d(-1, -1, -1)
+            else:
+                self.Min = Point3d(min(p.X for p in pts), min(p.Y for p in pts), min(p.Z for p in pts))
+                self.Max = Point3d(max(p.X for p in pts), max(p.Y for p in pts), max(p.Z for p in pts))
+
+    @property
+    def IsValid(self):
+        return self.Min.X <= self.Max.X and self.Min.Y <= self.Max.Y and self.Min.Z <= self.Max.Z
+
+    @property
+    def Center(self): return (self.Min + self.Max) / 2.0
+
+    def Contains(self, other):
+        if isinstance(other, BoundingBox):
+            return self.Contains(other.Min) and self.Contains(other.Max)
+        return (self.Min.X <= other.X <= self.Max.X and self.Min.Y <= other.Y <= self.Max.Y
+                and self.Min.Z <= other.Z <= self.Max.Z)
+
+    def ClosestPoint(self, point):
+        return Point3d(min(max(point.X, self.Min.X), self.Max.X),
+                       min(max(point.Y, self.Min.Y), self.Max.Y),
+                       min(max(point.Z, self.Min.Z), self.Max.Z))
+
+    def GetCorners(self):
+        a, b = self.Min, self.Max
+        return [Point3d(a.X, a.Y, a.Z), Point3d(b.X, a.Y, a.Z), Point3d(b.X, b.Y, a.Z), Point3d(a.X, b.Y, a.Z),
+                Point3d(a.X, a.Y, b.Z), Point3d(b.X, a.Y, b.Z), Point3d(b.X, b.Y, b.Z), Point3d(a.X, b.Y, b.Z)]
+
+    @staticmethod
+    def Union(a, b):
+        if not a.IsValid: return BoundingBox(b.Min, b.Max)
+        if not b.IsValid: return BoundingBox(a.Min, a.Max)
+        return BoundingBox([a.Min, a.Max, b.Min, b.Max])
+
+    @staticmethod
+    def Intersection(a, b):
+        rc = BoundingBox(Point3d(), Point3d())
+        rc.Min = Point3d(max(a.Min.X, b.Min.X), max(a.Min.Y, b.Min.Y), max(a.Min.Z, b.Min.Z))
+        rc.Max = Point3d(min(a.Max.X, b.Max.X), min(a.Max.Y, b.Max.Y), min(a.Max.Z, b.Max.Z))
+        return rc
+
+BoundingBox.Empty = BoundingBox()
+
+
+class Plane(object):
+    def __init__(self, origin=None, xaxis=None, yaxis=None):
+        self.Origin = Point3d(origin) if origin is not None else Point3d()
+        self.XAxis = Vector3d(1, 0, 0)
+        self.YAxis = Vector3d(0, 1, 0)
+        if xaxis is not None and yaxis is not None:
+            if type(xaxis) is Point3d: xaxis = xaxis - self.Origin
+            if type(yaxis) is Point3d: yaxis = yaxis - self.Origin
+            self.XAxis = Vector3d(xaxis); self.XAxis.Unitize()
+            z = Vector3d.CrossProduct(self.XAxis, yaxis); z.Unitize()
+            self.YAxis = Vector3d.CrossProduct(z, self.XAxis)
+        elif xaxis is not None:
+            z = Vector3d(xaxis); z.Unitize()
+            helper = Vector3d(1, 0, 0) if abs(z.X) < 0.9 else Vector3d(0, 1, 0)
+            self.XAxis = Vector3d.CrossProduct(helper, z); self.XAxis.Unitize()
+            self.YAxis = Vector3d.CrossProduct(z, self.XAxis)
+
+    @property
+    def ZAxis(self): return Vector3d.CrossProduct(self.XAxis, self.YAxis)
+    Normal = ZAxis
+
+    def DistanceTo(self, point): return (point - self.Origin) * self.ZAxis
+
+    @staticmethod
+    def FitPlaneToPoints(points):
+        pts = list(points)
+        c = Point3d(sum(p.X for p in pts)/len(pts), sum(p.Y for p in pts)/len(pts), sum(p.Z for p in pts)/len(pts))
+        return 0, Plane(c, pts[1]-pts[0], pts[2]-pts[0])
+
+Plane.WorldXY = Plane()
+
+
+class GeometryBase(object):
+    ObjectType = 0
+    def __init__(self):
+        self._userstrings = {}
+
+    def GetBoundingBox(self, accurate_or_xform=True):
+        return BoundingBox(list(self._points()))
+
+    def Transform(self, xform):
+        return False
+
+    def Duplicate(self):
+        import copy
+        return copy.deepcopy(self)
+
+    def SetUserString(self, key, value):
+        if value is None: self._userstrings.pop(key, None)
+        else: self._userstrings[key] = value
+        return True
+    def GetUserString(self, key): return self._userstrings.get(key)
+    @property
+    def UserStringCount(self): return len(self._userstrings)
+
+
+class Point(GeometryBase):
+    ObjectType = 1
+    def __init__(self, location):
+        GeometryBase.__init__(self)
+        self.Location = Point3d(location)
+    def _points(self): return [self.Location]
+    def Duplicate(self):
+        rc = Point(self.Location)
+        rc._userstrings = dict(self._userstrings)
+        return rc
+    def Transform(self, xform):
+        self.Location = xform * self.Location
+        return True
+
+
+class PointCloudItem(object):
+    def __init__(self, location, color=None):
+        self.Location = location
+        self.Color = color
+
+
+class PointCloud(GeometryBase):
+    ObjectType = 2
+    def __init__(self, points=None):
+        GeometryBase.__init__(self)
+        self._items = []
+        if points is not None: self.AddRange(points)
+    def Add(self, point, color=None): self._items.append(PointCloudItem(Point3d(point), color))
+    def AddRange(self, points, colors=None):
+        if colors is None:
+            self._items.extend(PointCloudItem(Point3d(pt)) for pt in points)
+        else:
+            for pt, c in zip(points, colors): self.Add(pt, c)
+    @property
+    def Count(self): return len(self._items)
+    def __getitem__(self, index): return self._items[index]
+    def GetPoints(self): return [item.Location for item in self._items]
+    @property
+    def ContainsColors(self): return any(item.Color is not None for item in self._items)
+    @property
+    def HiddenPointCount(self): return 0
+    def _points(self): return self.GetPoints()
+    def ClosestPoint(self, point):
+        best = -1; bestd = None
+        for i, item in enumerate(self._items):
+            d = item.Location.DistanceTo(point)
+            if bestd is None or d < bestd: best, bestd = i, d
+        return best
+    def Transform(self, xform):
+        for item in self._items: item.Location = xform * item.Location
+        return True
+
+
+class _List(object):
+    """Shared behaviour of the mesh component lists"""
+    def __init__(self): self._items = []
+    @property
+    def Count(self): return len(self._items)
+    def __len__(self): return len(self._items)
+    def __getitem__(self, index): return self._items[index]
+    def __setitem__(self, index, value): self._items[index] = value
+    def __iter__(self): return iter(self._items)
+    def Clear(self): del self._items[:]
+
+
+class MeshVertexList(_List):
+    def __init__(self, mesh=None):
+        _List.__init__(self)
+        self._mesh = mesh
+    def Add(self, *args):
+        self._items.append(Point3f(*args) if len(args) == 3 else Point3f(args[0]))
+        return len(self._items) - 1
+    def AddVertices(self, points):
+        self._items.extend(Point3f(p) for p in points)
+        return True
+    def ToPoint3dArray(self): return [Point3d(v) for v in self._items]
+    def ToPoint3fArray(self): return list(self._items)
+    def ToFloatArray(self):
+        rc = []
+        for v in self._items: rc.extend((v.X, v.Y, v.Z))
+        return rc
+    def GetVertexFaces(self, index): return []
+    def CombineIdentical(self, ignore_normals, ignore_additional):
+        """welds vertices at the same location and remaps the faces"""
+        remap, unique, items = {}, {}, []
+        for i, v in enumerate(self._items):
+            key = (v.X, v.Y, v.Z)
+            if key not in unique:
+                unique[key] = len(items)
+                items.append(v)
+            remap[i] = unique[key]
+        if len(items) == len(self._items): return False
+        self._items = items
+        faces = self._mesh.Faces
+        faces._items = [MeshFace(remap[f.A], remap[f.B], remap[f.C], remap[f.D]) for f in faces]
+        return True
+
+
+class MeshFace(object):
+    __slots__ = ("A", "B", "C", "D")
+    def __init__(self, a, b, c, d=None):
+        self.A, self.B, self.C = a, b, c
+        self.D = c if d is None else d
+    @property
+    def IsTriangle(self): return self.C == self.D
+    @property
+    def IsQuad(self): return self.C != self.D
+
+
+class MeshFaceList(_List):
+    def __init__(self, mesh):
+        _List.__init__(self)
+        self._mesh = mesh
+    def AddFace(self, *args):
+        face = args[0] if len(args) == 1 else MeshFace(*args)
+        self._items.append(face)
+        return len(self._items) - 1
+    def AddFaces(self, faces):
+        self._items.extend(faces)
+        return True
+    def GetFace(self, index): return self._items[index]
+    def GetFaceVertices(self, index):
+        f = self._items[index]
+        v = self._mesh.Vertices
+        return True, v[f.A], v[f.B], v[f.C], v[f.D]
+    def GetFaceCenter(self, index):
+        f = self._items[index]
+        v = self._mesh.Vertices
+        idx = [f.A, f.B, f.C] if f.IsTriangle else [f.A, f.B, f.C, f.D]
+        n = float(len(idx))
+        return Point3d(sum(v[i].X for i in idx)/n, sum(v[i].Y for i in idx)/n, sum(v[i].Z for i in idx)/n)
+    def ToIntArray(self, as_triangles=False):
+        rc = []
+        for f in self._items:
+            if as_triangles:
+                rc.extend((f.A, f.B, f.C))
+                if f.IsQuad: rc.extend((f.A, f.C, f.D))
+            else:
+                rc.extend((f.A, f.B, f.C, f.D))
+        return rc
+    @property
+    def QuadCount(self): return sum(1 for f in self._items if f.IsQuad)
+    @property
+    def TriangleCount(self): return sum(1 for f in self._items if f.IsTriangle)
+
+
+class MeshNormalList(_List):
+    def __init__(self, mesh=None):
+        _List.__init__(self)
+        self._mesh = mesh
+    def SetNormals(self, normals):
+        self._items = [Vector3f(n) for n in normals]
+        return True
+    def AddRange(self, normals):
+        self._items.extend(Vector3f(n) for n in normals)
+        return True
+    def ComputeNormals(self):
+        self._items = [Vector3f(0.0, 0.0, 1.0) for v in self._mesh.Vertices]
+        return True
+    def Add(self, *args):
+        self._items.append(Vector3f(*args))
+        return len(self._items) - 1
+    def ToFloatArray(self):
+        rc = []
+        for v in self._items: rc.extend((v.X, v.Y, v.Z))
+        return rc
+
+
+class MeshFaceNormalList(MeshNormalList):
+    def __init__(self, mesh):
+        MeshNormalList.__init__(self)
+        self._mesh = mesh
+    def ComputeFaceNormals(self):
+        rc = []
+        for i in range(self._mesh.Faces.Count):
+            ok, a, b, c, d = self._mesh.Faces.GetFaceVertices(i)
+            n = Vector3d.CrossProduct(Point3d(c)-Point3d(a), Point3d(d)-Point3d(b))
+            n.Unitize()
+            rc.append(Vector3f(n))
+        self._items = rc
+        return True
+
+
+class MeshTextureCoordinateList(_List):
+    def SetTextureCoordinates(self, tcs):
+        self._items = list(tcs)
+        return True
+    def Add(self, s, t):
+        self._items.append(Point2f(s, t))
+        return len(self._items) - 1
+
+
+class MeshVertexColorList(_List):
+    def SetColors(self, colors):
+        self._items = list(colors)
+        return True
+    def Add(self, color):
+        self._items.append(color)
+        return len(self._items) - 1
+    def AppendColors(self, colors):
+        self._items.extend(colors)
+        return True
+
+
+class Mesh(GeometryBase):
+    ObjectType = 32
+    def __init__(self):
+        GeometryBase.__init__(self)
+        self.Vertices = MeshVertexList(self)
+        self.Faces = MeshFaceList(self)
+        self.Normals = MeshNormalList(self)
+        self.FaceNormals = MeshFaceNormalList(self)
+        self.TextureCoordinates = MeshTextureCoordinateList()
+        self.VertexColors = MeshVertexColorList()
+    def _points(self): return [Point3d(v) for v in self.Vertices]
+    def Append(self, other):
+        offset = self.Vertices.Count
+        self.Vertices.AddVertices(other.Vertices)
+        for f in other.Faces:
+            self.Faces.AddFace(f.A+offset, f.B+offset, f.C+offset, f.D+offset)
+    def Compact(self): return True
+    @property
+    def IsValid(self): return True
+    def Transform(self, xform):
+        self.Vertices._items = [Point3f(xform * Point3d(v)) for v in self.Vertices]
+        return True
+    def ClosestPoint(self, point, *args):
+        best = None
+        for v in self.Vertices:
+            p = Point3d(v)
+            if best is None or p.DistanceTo(point) < best.DistanceTo(point): best = p
+        if args: return 0, best
+        return best
+
+
+class Curve(GeometryBase):
+    ObjectType = 4
+
+
+class LineCurve(Curve):
+    def __init__(self, start, end):
+        Curve.__init__(self)
+        self.Line = Line(start, end)
+        self.Domain = Interval(0.0, self.Line.Length)
+    def _points(self): return [self.Line.From, self.Line.To]
+    @property
+    def PointAtStart(self): return Point3d(self.Line.From)
+    @property
+    def PointAtEnd(self): return Point3d(self.Line.To)
+    def IsLinear(self, tolerance=None): return True
+    def PointAt(self, t):
+        length = self.Domain.Length
+        s = t / length if length else 0.0
+        return self.Line.From + (self.Line.To - self.Line.From) * s
+    def TangentAt(self, t):
+        v = self.Line.To - self.Line.From
+        v.Unitize()
+        return v
+    def GetLength(self, *args): return self.Line.Length
+    def ClosestPoint(self, point, *args):
+        d = self.Line.To - self.Line.From
+        length2 = d * d
+        s = 0.0 if not length2 else max(0.0, min(1.0, ((point - self.Line.From) * d) / length2))
+        return True, s * self.Domain.Length
+    def DivideByCount(self, count, include_ends):
+        n = count + 1 if include_ends else count - 1
+        step = self.Domain.Length / count
+        start = 0 if include_ends else 1
+        return [i * step for i in range(start, start + n)]
+    def Transform(self, xform):
+        self.Line = Line(xform * self.Line.From, xform * self.Line.To)
+        return True
+
+
+class Line(object):
+    def __init__(self, start, end):
+        self.From = Point3d(start)
+        self.To = Point3d(end)
+    @property
+    def Length(self): return self.From.DistanceTo(self.To)
+
+
+_autostub.wrap(__name__)
@@ -0,0 +1,60 @@
+"""Minimal stand-in for the RhinoCommon namespace"""
+import math
+
+import _autostub
+_autostub.install()
+
+import Geometry
+import Collections
+import DocObjects
+
+
+class RhinoMath(object):
+    ZeroTolerance = 1.0e-12
+    SqrtEpsilon = 1.490116119385000000e-8
+    UnsetValue = -1.23432101234321e+308
+    @staticmethod
+    def ToRadians(degrees): return math.radians(degrees)
+    @staticmethod
+    def ToDegrees(radians): return math.degrees(radians)
+
+
+class Event(object):
+    """Multicast .NET style event supporting += and -="""
+    def __init__(self): self.handlers = []
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+    def __isub__(self, handler):
+        if handler in self.handlers: self.handlers.remove(handler)
+        return self
+    def Fire(self, sender, args):
+        for handler in list(self.handlers): handler(sender, args)
+
+
+class RhinoDoc(object):
+    AddRhinoObject = Event()
+    DeleteRhinoObject = Event()
+    ReplaceRhinoObject = Event()
+    UndeleteRhinoObject = Event()
+    ModifyObjectAttributes = Event()
+    LayerTableEvent = Event()
+    CloseDocument = Event()
+    NewDocument = Event()
+    BeginOpenDocument = Event()
+    EndOpenDocument = Event()
+    ActiveDoc = None
+
+
+class RhinoApp(object):
+    @staticmethod
+    def Wait(): pass
+    @staticmethod
+    def WriteLine(*args): pass
+
+
+class UnitSystem(object):
+    Millimeters = 2
+setattr(UnitSystem, "None", 0)
+
+_autostub.wrap(__name__)
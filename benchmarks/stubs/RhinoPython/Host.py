@@ -0,0 +1,4 @@
+"""Stand-in for the RhinoPython host used by scriptcontext"""
+
+def EscapePressed(reset=False):
+    return False
@@ -0,0 +1,2 @@
+import _autostub
+_autostub.install()
@@ -0,0 +1,35 @@
+"""Minimal stand-in for System.Drawing"""
+import _autostub
+
+
+class Color(object):
+    __slots__ = ("A", "R", "G", "B")
+
+    def __init__(self, a=0, r=0, g=0, b=0):
+        self.A, self.R, self.G, self.B = a, r, g, b
+
+    @staticmethod
+    def FromArgb(*args):
+        if len(args) == 1:
+            v = args[0]
+            return Color((v >> 24) & 255 or 255, (v >> 16) & 255, (v >> 8) & 255, v & 255)
+        if len(args) == 3: return Color(255, args[0], args[1], args[2])
+        return Color(*args)
+
+    def ToArgb(self):
+        v = (self.A << 24) | (self.R << 16) | (self.G << 8) | self.B
+        return v - (1 << 32) if v >= (1 << 31) else v  # Int32, like .NET
+    def __eq__(self, other):
+        return type(other) is Color and self.ToArgb() == other.ToArgb()
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return self.ToArgb()
+    def __repr__(self): return "Color [A=%d, R=%d, G=%d, B=%d]" % (self.A, self.R, self.G, self.B)
+
+Color.Black = Color(255, 0, 0, 0)
+Color.Empty = Color(0, 0, 0, 0)
+
+
+class Size(object):
+    def __init__(self, width=0, height=0): self.Width, self.Height = width, height
+
+_autostub.wrap(__name__)
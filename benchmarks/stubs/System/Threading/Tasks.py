@@ -0,0 +1,15 @@
+"""Minimal stand-in for System.Threading.Tasks
+
+Parallel loops run sequentially. On CPython the interpreter lock would
+serialize the loop bodies anyway, so benchmarks of parallel code paths
+measure their single thread overhead.
+"""
+import _autostub
+
+
+class Parallel(object):
+    @staticmethod
+    def For(start, stop, body):
+        for i in xrange(start, stop): body(i)
+
+_autostub.wrap(__name__)
@@ -0,0 +1,4 @@
+"""Minimal stand-in for System.Threading"""
+import _autostub
+
+_autostub.wrap(__name__)
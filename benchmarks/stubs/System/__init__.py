@@ -0,0 +1,109 @@
+"""Minimal stand-in for the .NET System namespace"""
+import uuid
+
+import _autostub
+_autostub.install()
+
+
+class Guid(object):
+    __slots__ = ("_value",)
+
+    def __init__(self, value=None):
+        if value is None: self._value = uuid.UUID(int=0)
+        elif isinstance(value, uuid.UUID): self._value = value
+        else:
+            try:
+                self._value = uuid.UUID(str(value))
+            except ValueError:
+                raise SystemError("Unrecognized Guid format: %s" % value)
+
+    @staticmethod
+    def NewGuid(): return Guid(uuid.uuid4())
+
+    def __eq__(self, other):
+        return type(other) is Guid and self._value == other._value
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return hash(self._value)
+    def __str__(self): return str(self._value)
+    def __repr__(self): return "<System.Guid object (%s)>" % self._value
+    def ToString(self): return str(self._value)
+
+Guid.Empty = Guid()
+
+
+class _ArrayMeta(type):
+    _generic = {}
+    def __getitem__(cls, item_type):
+        rc = _ArrayMeta._generic.get(item_type)
+        if rc is None:
+            name = "Array[%s]" % getattr(item_type, "__name__", item_type)
+            rc = _ArrayMeta(name, (Array,), {"ItemType": item_type})
+            _ArrayMeta._generic[item_type] = rc
+        return rc
+
+
+class Array(object):
+    """Fixed length, typed array"""
+    __metaclass__ = _ArrayMeta
+    ItemType = object
+
+    def __init__(self, items=()):
+        self._items = list(items)
+
+    @staticmethod
+    def CreateInstance(item_type, count):
+        default = None
+        try:
+            default = item_type()
+        except Exception:
+            pass
+        return Array[item_type]([default] * count)
+
+    @property
+    def Length(self): return len(self._items)
+    def __len__(self): return len(self._items)
+    def __iter__(self): return iter(self._items)
+    def __getitem__(self, index): return self._items[index]
+    def __setitem__(self, index, value): self._items[index] = value
+    def __repr__(self): return "Array[%s](%r)" % (self.ItemType, self._items)
+
+
+class Enum(object):
+    @staticmethod
+    def ToObject(enum_type, value): return int(value)
+
+    @staticmethod
+    def GetName(enum_type, value):
+        for name, item in vars(enum_type).items():
+            if item == value and not name.startswith("_"): return name
+
+
+class TimeSpan(object):
+    def __init__(self, seconds=0.0): self.TotalSeconds = seconds
+    @staticmethod
+    def FromMinutes(minutes): return TimeSpan(minutes * 60.0)
+
+
+Double = float
+Int32 = int
+String = str
+Object = object
+
+
+class _DelegateMeta(type):
+    def __getitem__(cls, types): return cls
+
+
+class Action(object):
+    """Action and Action[T] delegates, a callable wrapper"""
+    __metaclass__ = _DelegateMeta
+    def __init__(self, function): self.function = function
+    def __call__(self, *args): return self.function(*args)
+
+
+class EventHandler(object):
+    def __init__(self, function): self.function = function
+    def __call__(self, *args): return self.function(*args)
+
+import Drawing
+_autostub.wrap(__name__)
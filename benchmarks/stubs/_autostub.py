@@ -0,0 +1,90 @@
+"""Fallback machinery for the stub runtime.
+
+Anything that the rhinoscript package touches but that the stubs do not
+model explicitly resolves to an inert placeholder class, so the whole
+package can be imported on a plain CPython 2.7 interpreter.
+"""
+import imp
+import sys
+import types
+
+ROOTS = ("Rhino", "System", "RhinoPython", "Microsoft")
+
+
+class _PlaceholderMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"): raise AttributeError(name)
+        child = placeholder(cls.__module__, cls.__name__ + "." + name)
+        setattr(cls, name, child)
+        return child
+    def __or__(cls, other): return cls
+    __ror__ = __and__ = __rand__ = __or__
+    def __nonzero__(cls): return False
+
+
+def placeholder(module, name):
+    return _PlaceholderMeta(str(name), (object,), {"__module__": module})
+
+
+class AutoModule(types.ModuleType):
+    """Module whose missing attributes become placeholders"""
+    def __init__(self, name, real=None):
+        types.ModuleType.__init__(self, name)
+        if real is not None:
+            self.__dict__.update(real.__dict__)
+        self.__dict__.setdefault("__path__", [])
+
+    def __getattr__(self, name):
+        if name.startswith("__"): raise AttributeError(name)
+        child = placeholder(self.__name__, name)
+        setattr(self, name, child)
+        return child
+
+
+def wrap(name):
+    """Replace a concrete stub module with an AutoModule around it"""
+    real = sys.modules[name]
+    auto = AutoModule(name, real)
+    # the functions of the concrete module keep using its globals, which
+    # python 2 clears once the module object is released
+    auto.__dict__["_real_module"] = real
+    sys.modules[name] = auto
+    return auto
+
+
+class _Finder(object):
+    def find_module(self, fullname, path=None):
+        if fullname.split(".")[0] not in ROOTS: return None
+        parent, _, last = fullname.rpartition(".")
+        # .NET namespaces and types are CamelCase, so lower case names are
+        # python modules imported from inside a stub package
+        if not last[:1].isupper(): return None
+        search = None
+        if parent:
+            search = getattr(sys.modules.get(parent), "__path__", None)
+        try:
+            imp.find_module(last, search)
+            return None  # a concrete stub exists on disk
+        except ImportError:
+            return self
+
+    def load_module(self, fullname):
+        if fullname in sys.modules: return sys.modules[fullname]
+        parent, _, last = fullname.rpartition(".")
+        existing = None
+        if parent: existing = vars(sys.modules[parent]).get(last)
+        if existing is not None:
+            # "import System.Array" style imports of types
+            sys.modules[fullname] = existing
+            return existing
+        module = AutoModule(fullname)
+        module.__loader__ = self
+        sys.modules[fullname] = module
+        if parent: setattr(sys.modules[parent], last, module)
+        return module
+
+
+def install():
+    for finder in sys.meta_path:
+        if isinstance(finder, _Finder): return
+    sys.meta_path.append(_Finder())
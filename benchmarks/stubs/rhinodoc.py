@@ -0,0 +1,364 @@
+"""An in-memory Rhino document: object, layer, group and view tables
+
+The tables implement the subset of RhinoCommon that the rhinoscript package
+calls, and fire the same RhinoDoc events the real application does.
+"""
+import System
+import System.Drawing
+import Rhino
+import Rhino.Geometry as rg
+import Rhino.DocObjects as rd
+
+
+class _EventArgs(object):
+    def __init__(self, **kwargs): self.__dict__.update(kwargs)
+
+
+def _object_class(geometry):
+    if isinstance(geometry, rg.Point): return rd.PointObject
+    if isinstance(geometry, rg.Curve): return rd.CurveObject
+    if isinstance(geometry, rg.Mesh): return rd.MeshObject
+    if isinstance(geometry, rg.PointCloud): return rd.PointCloudObject
+    return rd.RhinoObject
+
+
+class ObjectTable(object):
+    def __init__(self, doc):
+        self._doc = doc
+        self._objects = {}     # Guid -> RhinoObject
+        self._order = []       # newest object first, like Rhino's iterator
+        self._by_serial = {}
+
+    # -- adding -----------------------------------------------------------
+    def Add(self, geometry, attributes=None, *args):
+        if attributes is None: attributes = rd.ObjectAttributes()
+        else: attributes = attributes.Duplicate()
+        if attributes.LayerIndex < 0 or attributes.LayerIndex >= self._doc.Layers.Count:
+            attributes.LayerIndex = self._doc.Layers.CurrentLayerIndex
+        id = System.Guid.NewGuid()
+        rhobj = _object_class(geometry)(self._doc, geometry, attributes, id)
+        self._objects[id] = rhobj
+        rhobj._position = len(self._order)
+        self._order.append(rhobj)
+        self._by_serial[rhobj.RuntimeSerialNumber] = rhobj
+        Rhino.RhinoDoc.AddRhinoObject.Fire(self._doc, _EventArgs(TheObject=rhobj, ObjectId=id))
+        return id
+
+    def AddPoint(self, point, attributes=None, *args):
+        return self.Add(rg.Point(point), attributes)
+
+    def AddPointCloud(self, points, attributes=None, *args):
+        if not isinstance(points, rg.PointCloud): points = rg.PointCloud(points)
+        return self.Add(points, attributes)
+
+    def AddMesh(self, mesh, attributes=None, *args): return self.Add(mesh, attributes)
+    def AddCurve(self, curve, attributes=None, *args): return self.Add(curve, attributes)
+    def AddBrep(self, brep, attributes=None, *args): return self.Add(brep, attributes)
+    def AddSurface(self, srf, attributes=None, *args): return self.Add(srf, attributes)
+    def AddLine(self, start, end=None, attributes=None, *args):
+        if end is None: start, end = start.From, start.To
+        return self.Add(rg.LineCurve(start, end), attributes)
+
+    # -- lookup -----------------------------------------------------------
+    def Find(self, key):
+        if isinstance(key, (int, long)): return self._by_serial.get(key)
+        rhobj = self._objects.get(key)
+        if rhobj is not None and not rhobj.IsDeleted: return rhobj
+
+    def __iter__(self):
+        return (o for o in reversed(self._order) if not o.IsDeleted)
+
+    @property
+    def Count(self): return len(self._objects)
+
+    def _passes(self, rhobj, settings):
+        if rhobj.IsDeleted: return settings.DeletedObjects
+        if rhobj.IsHidden:
+            if not settings.HiddenObjects: return False
+        elif rhobj.IsLocked:
+            if not settings.LockedObjects: return False
+        elif not settings.NormalObjects: return False
+        if rhobj.IsReference and not settings.ReferenceObjects: return False
+        if rhobj.ObjectType == rd.ObjectType.Light and not settings.IncludeLights: return False
+        if rhobj.ObjectType == rd.ObjectType.Grip and not settings.IncludeGrips: return False
+        if not (rhobj.ObjectType & settings.ObjectTypeFilter): return False
+        if settings.LayerIndexFilter >= 0 and rhobj.Attributes.LayerIndex != settings.LayerIndexFilter:
+            return False
+        if settings.NameFilter is not None and rhobj.Attributes.Name != settings.NameFilter:
+            return False
+        if settings.SelectedObjectsFilter and not rhobj._selected: return False
+        return True
+
+    def GetObjectList(self, settings):
+        if not isinstance(settings, rd.ObjectEnumeratorSettings):
+            filter = settings
+            settings = rd.ObjectEnumeratorSettings()
+            settings.ObjectTypeFilter = filter
+        return (o for o in reversed(self._order) if self._passes(o, settings))
+
+    def FindByLayer(self, layer):
+        if not isinstance(layer, (int, long)): layer = layer.LayerIndex
+        rc = [o for o in self if o.Attributes.LayerIndex == layer]
+        return System.Array[rd.RhinoObject](rc) if rc else None
+
+    def FindByDrawColor(self, color, include_lights):
+        return [o for o in self if o.Attributes.DrawColor(self._doc) == color]
+
+    def GetSelectedObjects(self, include_lights, include_grips):
+        return [o for o in self if o._selected]
+
+    def UnselectAll(self, *args):
+        rc = 0
+        for o in self:
+            if o._selected:
+                o._selected = False
+                rc += 1
+        return rc
+
+    # -- modification -----------------------------------------------------
+    def _resolve(self, key):
+        if isinstance(key, rd.RhinoObject): return key
+        if isinstance(key, rd.ObjRef): key = key.ObjectId
+        return self.Find(key)
+
+    def Delete(self, key, quiet=True):
+        rhobj = self._resolve(key)
+        if rhobj is None or rhobj.IsDeleted: return False
+        rhobj.IsDeleted = True
+        Rhino.RhinoDoc.DeleteRhinoObject.Fire(self._doc, _EventArgs(TheObject=rhobj, ObjectId=rhobj.Id))
+        return True
+
+    def Undelete(self, key):
+        rhobj = self._objects.get(key.Id if isinstance(key, rd.RhinoObject) else key)
+        if rhobj is None or not rhobj.IsDeleted: return False
+        rhobj.IsDeleted = False
+        Rhino.RhinoDoc.UndeleteRhinoObject.Fire(self._doc, _EventArgs(TheObject=rhobj, ObjectId=rhobj.Id))
+        return True
+
+    def Replace(self, key, geometry, *args):
+        old = self._resolve(key)
+        if old is None: return False
+        if isinstance(geometry, rg.Point3d): geometry = rg.Point(geometry)
+        new = _object_class(geometry)(self._doc, geometry, old.Attributes, old.Id)
+        new.IsHidden, new.IsLocked = old.IsHidden, old.IsLocked
+        old.IsDeleted = True
+        new._position = old._position
+        self._order[old._position] = new
+        self._objects[old.Id] = new
+        self._by_serial[new.RuntimeSerialNumber] = new
+        args = _EventArgs(Document=self._doc, ObjectId=old.Id, OldRhinoObject=old, NewRhinoObject=new)
+        Rhino.RhinoDoc.ReplaceRhinoObject.Fire(self._doc, args)
+        Rhino.RhinoDoc.DeleteRhinoObject.Fire(self._doc, _EventArgs(TheObject=old, ObjectId=old.Id))
+        Rhino.RhinoDoc.AddRhinoObject.Fire(self._doc, _EventArgs(TheObject=new, ObjectId=new.Id))
+        return True
+
+    def Transform(self, key, xform, delete_original):
+        rhobj = self._resolve(key)
+        if rhobj is None: return System.Guid.Empty
+        geometry = rhobj.Geometry.Duplicate()
+        if not geometry.Transform(xform): return System.Guid.Empty
+        if delete_original:
+            self.Replace(rhobj.Id, geometry)
+            return rhobj.Id
+        return self.Add(geometry, rhobj.Attributes)
+
+    def ModifyAttributes(self, key, attributes, quiet):
+        rhobj = self._resolve(key)
+        if rhobj is None: return False
+        old = rhobj._committed
+        rhobj.Attributes = attributes.Duplicate()
+        rhobj._committed = attributes.Duplicate()
+        args = _EventArgs(Document=self._doc, RhinoObject=rhobj, OldAttributes=old, NewAttributes=rhobj._committed)
+        Rhino.RhinoDoc.ModifyObjectAttributes.Fire(self._doc, args)
+        return True
+
+    def _commit(self, rhobj):
+        return self.ModifyAttributes(rhobj, rhobj.Attributes, True)
+
+    def _set_state(self, key, name, value):
+        rhobj = self._resolve(key)
+        if rhobj is None or getattr(rhobj, name) == value: return False
+        setattr(rhobj, name, value)
+        return True
+
+    def Hide(self, key, ignore_layer_mode): return self._set_state(key, "IsHidden", True)
+    def Show(self, key, ignore_layer_mode): return self._set_state(key, "IsHidden", False)
+    def Lock(self, key, ignore_layer_mode): return self._set_state(key, "IsLocked", True)
+    def Unlock(self, key, ignore_layer_mode): return self._set_state(key, "IsLocked", False)
+
+
+class LayerTable(object):
+    def __init__(self, doc):
+        self._doc = doc
+        self._layers = []
+        self.CurrentLayerIndex = 0
+        default = rd.Layer.GetDefaultLayerProperties()
+        default.Name = "Default"
+        self.Add(default)
+
+    def _fire(self, event_type, index, old=None):
+        args = _EventArgs(Document=self._doc, EventType=event_type, LayerIndex=index,
+                          NewState=self._layers[index], OldState=old)
+        Rhino.RhinoDoc.LayerTableEvent.Fire(self._doc, args)
+
+    def _by_id(self, id):
+        if id is None or id == System.Guid.Empty: return None
+        for layer in self._layers:
+            if layer.Id == id: return layer
+
+    def Add(self, layer):
+        layer = _copy_layer(layer)
+        layer.Id = System.Guid.NewGuid()
+        layer.LayerIndex = len(self._layers)
+        layer.SortIndex = layer.LayerIndex
+        layer._table = self
+        self._layers.append(layer)
+        self._fire(rd.Tables.LayerTableEventType.Added, layer.LayerIndex)
+        return layer.LayerIndex
+
+    def Modify(self, layer, index, quiet):
+        old = _copy_layer(self._layers[index])
+        if layer is not self._layers[index]:
+            target = self._layers[index]
+            for name, value in vars(layer).items():
+                if name not in ("Id", "LayerIndex", "_table"): setattr(target, name, value)
+        self._fire(rd.Tables.LayerTableEventType.Modified, index, old)
+        return True
+
+    def Delete(self, index, quiet):
+        if index == self.CurrentLayerIndex: return False
+        layer = self._layers[index]
+        if layer.IsDeleted or self._doc.Objects.FindByLayer(layer): return False
+        layer.IsDeleted = True
+        self._fire(rd.Tables.LayerTableEventType.Deleted, index)
+        return True
+
+    def Purge(self, index, quiet):
+        layer = self._layers[index]
+        for rhobj in list(self._doc.Objects):
+            if rhobj.Attributes.LayerIndex == index: self._doc.Objects.Delete(rhobj, True)
+        layer.IsDeleted = True
+        self._fire(rd.Tables.LayerTableEventType.Deleted, index)
+        return True
+
+    def Find(self, key, flag):
+        if isinstance(key, System.Guid):
+            layer = self._by_id(key)
+            if layer is None or (flag and layer.IsDeleted): return -1
+            return layer.LayerIndex
+        key = key.lower() if flag else key
+        for layer in self._layers:
+            name = layer.Name.lower() if flag else layer.Name
+            if name == key and not layer.IsDeleted: return layer.LayerIndex
+        return -1
+
+    def FindByFullPath(self, path, ignore_deleted):
+        for layer in self._layers:
+            if layer.FullPath == path and not (ignore_deleted and layer.IsDeleted): return layer.LayerIndex
+        return -1
+
+    def SetCurrentLayerIndex(self, index, quiet):
+        self.CurrentLayerIndex = index
+        self._fire(rd.Tables.LayerTableEventType.Current, index)
+        return True
+
+    @property
+    def CurrentLayer(self): return self._layers[self.CurrentLayerIndex]
+    @property
+    def Count(self): return len(self._layers)
+    @property
+    def ActiveCount(self): return sum(1 for l in self._layers if not l.IsDeleted)
+    def __getitem__(self, index): return self._layers[index]
+    def __iter__(self): return iter(self._layers)
+
+
+def _copy_layer(layer):
+    rc = rd.Layer()
+    for name, value in vars(layer).items():
+        if name != "_table": setattr(rc, name, value)
+    return rc
+
+
+class GroupTable(object):
+    def __init__(self, doc):
+        self._doc = doc
+        self._names = []
+    def Add(self, name=None, *args):
+        self._names.append(name or "Group%02d" % (len(self._names) + 1))
+        return len(self._names) - 1
+    def Find(self, name, ignore_deleted):
+        for i, n in enumerate(self._names):
+            if n.lower() == name.lower(): return i
+        return -1
+    def GroupName(self, index): return self._names[index]
+    def AddToGroup(self, index, ids):
+        if isinstance(ids, System.Guid): ids = [ids]
+        for id in ids:
+            rhobj = self._doc.Objects.Find(id)
+            if rhobj is None: return False
+            rhobj.Attributes.AddToGroup(index)
+        return True
+    def GroupMembers(self, index):
+        return [o for o in self._doc.Objects if index in o.Attributes.GetGroupList()]
+    @property
+    def Count(self): return len(self._names)
+
+
+class ViewTable(object):
+    def __init__(self):
+        self.RedrawEnabled = True
+        self.RedrawCount = 0
+    def Redraw(self):
+        if self.RedrawEnabled: self.RedrawCount += 1
+
+
+class StringTable(object):
+    def __init__(self): self._values = {}
+    def SetString(self, key, value, *args):
+        self._values[key] = value
+        return value
+    def GetValue(self, key, *args): return self._values.get(key)
+    def Delete(self, key, *args): return self._values.pop(key, None) is not None
+    @property
+    def Count(self): return len(self._values)
+
+
+class RhinoDoc(object):
+    def __init__(self):
+        self.ModelAbsoluteTolerance = 0.001
+        self.ModelRelativeTolerance = 0.0
+        self.ModelAngleToleranceRadians = 0.0174532925199433
+        self.ModelAngleToleranceDegrees = 1.0
+        self.Modified = False
+        self.Name = "benchmark.3dm"
+        self.Path = None
+        self.RuntimeSerialNumber = id(self)
+        self.Layers = LayerTable(self)
+        self.Objects = ObjectTable(self)
+        self.Groups = GroupTable(self)
+        self.Views = ViewTable()
+        self.Strings = StringTable()
+        self._undo = []
+        self.UndoRecordCount = 0
+
+    @property
+    def UndoRecordingIsActive(self): return bool(self._undo)
+
+    def BeginUndoRecord(self, description):
+        self._undo.append(description)
+        self.UndoRecordCount += 1
+        return len(self._undo)
+
+    def EndUndoRecord(self, serial_number):
+        if not self._undo: return False
+        self._undo.pop()
+        return True
+
+
+def new_document():
+    """Create an empty document and make it scriptcontext.doc"""
+    import scriptcontext
+    doc = RhinoDoc()
+    scriptcontext.doc = doc
+    Rhino.RhinoDoc.ActiveDoc = doc
+    return doc
@@ -1,10 +1,12 @@
 # A collection of RhinoScript-like functions that can be called from Python
 __all__ = ["application", "block", "curve", "dimension", "document", "geometry",
            "grips", "group", "hatch", "layer", "line", "linetype", "light",
-           "mesh", "object", "plane", "pointvector", "selection", "surface",
-           "toolbar", "transformation", "userdata", "userinterface", "utility", "view"]
+           "mesh", "object", "plane", "pointio", "pointvector",
+           "pointvectorarray", "selection", "spatialindex", "surface", "toolbar",
+           "transformation", "userdata", "userinterface", "utility", "view"]
 
 
 import application, block, curve, dimension, document, geometry, grips, group
-import hatch, layer, line, linetype, light, mesh, object, plane, pointvector
-import selection, surface, toolbar, transformation, userdata, userinterface, utility, view
\ No newline at end of file
+import hatch, layer, line, linetype, light, mesh, object, plane, pointio
+import pointvector, pointvectorarray, selection, spatialindex, surface, toolbar
+import transformation, userdata, userinterface, utility, view
\ No newline at end of file
@@ -129,7 +129,7 @@ def AppearanceColor(item, color=None):
         rc = appearance.CommandPromptHypertextColor
         if color: appearance.CommandPromptHypertextColor = color
     if rc is None: raise ValueError("item is out of range")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -44,7 +44,7 @@ def AddBlock(object_ids, base_point, name=None, delete_input=False):
         if rc>=0:
             if delete_input:
                 for obj in objects: scriptcontext.doc.Objects.Delete(obj, True)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
             return name
 
 
@@ -224,7 +224,7 @@ def DeleteBlock(block_name):
     idef = scriptcontext.doc.InstanceDefinitions.Find(block_name, True)
     if not idef: raise ValueError("%s does not exist in InstanceDefinitionsTable"%block_name)
     rc = scriptcontext.doc.InstanceDefinitions.Delete(idef.Index, True, False)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -240,7 +240,7 @@ def ExplodeBlockInstance(object_id):
     rc = scriptcontext.doc.Objects.AddExplodedInstancePieces(instance)
     if rc:
         scriptcontext.doc.Objects.Delete(instance, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -279,7 +279,7 @@ def InsertBlock2(block_name, xform):
     xform = rhutil.coercexform(xform, True)
     id = scriptcontext.doc.Objects.AddInstanceObject(idef.Index, xform )
     if id!=System.Guid.Empty:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return id
 
 
@@ -2,8 +2,15 @@ import scriptcontext
 import utility as rhutil
 import Rhino
 import math
+import array
 import System.Guid, System.Array, System.Enum
 
+
+def __coercecurves(curve_ids):
+    "curve geometry for a list of identifiers, raising if any is not a curve"
+    return [rhutil.coercecurve(id, -1, True) for id in curve_ids]
+
+
 def AddArc(plane, radius, angle_degrees):
     """Adds an arc curve to the document
     Parameters:
@@ -20,7 +27,7 @@ def AddArc(plane, radius, angle_degrees):
     arc = Rhino.Geometry.Arc(plane, radius, radians)
     rc = scriptcontext.doc.Objects.AddArc(arc)
     if rc==System.Guid.Empty: raise Exception("Unable to add arc to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -38,7 +45,7 @@ def AddArc3Pt(start, end, point_on_arc):
     arc = Rhino.Geometry.Arc(start, pton, end)
     rc = scriptcontext.doc.Objects.AddArc(arc)
     if rc==System.Guid.Empty: raise Exception("Unable to add arc to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -54,7 +61,7 @@ def AddArcPtTanPt(start, direction, end):
     arc = Rhino.Geometry.Arc(start, direction, end)
     rc = scriptcontext.doc.Objects.AddArc(arc)
     if rc==System.Guid.Empty: raise Exception("Unable to add arc to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -76,7 +83,7 @@ def AddBlendCurve(curves, parameters, reverses, continuities):
     curve = Rhino.Geometry.Curve.CreateBlendCurve(crv0, parameters[0], reverses[0], c0, crv1, parameters[1], reverses[1], c1)
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -103,7 +110,7 @@ def AddCircle(plane_or_center, radius):
         circle = Rhino.Geometry.Circle(plane, radius)
         rc = scriptcontext.doc.Objects.AddCircle(circle)
     if rc==System.Guid.Empty: raise Exception("Unable to add circle to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -120,7 +127,7 @@ def AddCircle3Pt(first, second, third):
     circle = Rhino.Geometry.Circle(start, end, third)
     rc = scriptcontext.doc.Objects.AddCircle(circle)
     if rc==System.Guid.Empty: raise Exception("Unable to add circle to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -137,7 +144,7 @@ def AddCurve(points, degree=3):
     if not curve: raise Exception("unable to create control point curve from given points")
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -154,7 +161,7 @@ def AddEllipse(plane, radiusX, radiusY):
     ellipse = Rhino.Geometry.Ellipse(plane, radiusX, radiusY)
     rc = scriptcontext.doc.Objects.AddEllipse(ellipse)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -173,7 +180,7 @@ def AddEllipse3Pt(center, second, third):
     ellipse = Rhino.Geometry.Ellipse(center, second, third)
     rc = scriptcontext.doc.Objects.AddEllipse(ellipse)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -213,7 +220,7 @@ def AddFilletCurve(curve0id, curve1id, radius=1.0, base_point0=None, base_point1
     arc = Rhino.Geometry.Curve.CreateFillet(curve0, curve1, radius, crv0_t, crv1_t)
     rc = scriptcontext.doc.Objects.AddArc(arc)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -235,7 +242,7 @@ def AddInterpCrvOnSrf(surface_id, points):
     if not curve: raise Exception("unable to create InterpolatedCurveOnSurface")
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -257,7 +264,7 @@ def AddInterpCrvOnSrfUV(surface_id, points):
     if not curve: raise Exception("unable to create InterpolatedCurveOnSurfaceUV")
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -296,7 +303,7 @@ def AddInterpCurve(points, degree=3, knotstyle=0, start_tangent=None, end_tangen
     if not curve: raise Exception("unable to CreateInterpolatedCurve")
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -311,7 +318,7 @@ def AddLine(start, end):
     end = rhutil.coerce3dpoint(end, True)
     rc = scriptcontext.doc.Objects.AddLine(start, end)
     if rc==System.Guid.Empty: raise Exception("Unable to add line to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -343,7 +350,7 @@ def AddNurbsCurve(points, knots, degree, weights=None):
     for i in xrange(knotcount): nc.Knots[i] = knots[i]
     rc = scriptcontext.doc.Objects.AddCurve(nc)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -369,7 +376,7 @@ def AddPolyline(points, replace_id=None):
     else:
         rc = scriptcontext.doc.Objects.AddPolyline(points)
     if rc==System.Guid.Empty: raise Exception("Unable to add polyline to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -387,7 +394,7 @@ def AddRectangle(plane, width, height):
     poly = rect.ToPolyline()
     rc = scriptcontext.doc.Objects.AddPolyline(poly)
     if rc==System.Guid.Empty: raise Exception("Unable to add polyline to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -405,7 +412,7 @@ def AddSubCrv(curve_id, param0, param1):
     if not trimcurve: raise Exception("unable to trim curve")
     rc = scriptcontext.doc.Objects.AddCurve(trimcurve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -531,7 +538,7 @@ def CloseCurve(curve_id, tolerance=-1.0):
     if not curve.MakeClosed(tolerance): return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddCurve(curve)
     if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 def ClosedCurveOrientation(curve_id, direction=(0,0,1)):
@@ -673,7 +680,7 @@ def CurveArrows(curve_id, arrow_style=None):
             attr.ObjectDecoration = Rhino.DocObjects.ObjectDecoration.BothArrowhead
         id = rhutil.coerceguid(curve_id, True)
         scriptcontext.doc.Objects.ModifyAttributes(id, attr, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     if rc==Rhino.DocObjects.ObjectDecoration.None: return 0
     if rc==Rhino.DocObjects.ObjectDecoration.StartArrowhead: return 1
     if rc==Rhino.DocObjects.ObjectDecoration.EndArrowhead: return 2
@@ -700,7 +707,7 @@ def CurveBooleanDifference(curve_id_0, curve_id_1):
                 curve.Dispose()
                 if rc==System.Guid.Empty: raise Exception("unable to add curve to document")
                 curves.append(rc)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return curves
 
 
@@ -724,7 +731,7 @@ def CurveBooleanIntersection(curve_id_0, curve_id_1):
                 curve.Dispose()
                 if rc==System.Guid.Empty: raise Exception("unable to add curve to document")
                 curves.append(rc)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return curves
 
 
@@ -747,7 +754,7 @@ def CurveBooleanUnion(curve_id):
                 curve.Dispose()
                 if rc==System.Guid.Empty: raise Exception("unable to add curve to document")
                 curves.append(rc)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return curves
 
 
@@ -783,7 +790,7 @@ def CurveBrepIntersect(curve_id, brep_id, tolerance=None):
             rc = scriptcontext.doc.Objects.AddPoint(point)
             points.append(rc)
     if not curves and not points: return None
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return curves, points
 
 
@@ -830,6 +837,30 @@ def CurveClosestPoint(curve_id, test_point, segment_index=-1 ):
     return t
 
 
+def CurveClosestPoints(curve_ids, test_points):
+    """Returns the parameters of the points on many curves that are closest to
+    test points. The curves are looked up once and the closest points are
+    computed on multiple threads
+    Parameters:
+      curve_ids = identifiers of the curve objects
+      test_points = a test point used for every curve, or a list with one test
+        point for each curve
+    Returns:
+      list of parameters in the order of curve_ids, None for curves where the
+      closest point could not be found
+    """
+    curves = __coercecurves(curve_ids)
+    point = rhutil.coerce3dpoint(test_points)
+    if point: points = [point]*len(curves)
+    else:
+        points = rhutil.coerce3dpointlist(test_points, True)
+        if len(points)!=len(curves): raise ValueError("test_points must have one point for each curve")
+    def closestpoint(item):
+        rc, t = item[0].ClosestPoint(item[1], 0.0)
+        if rc: return t
+    return rhutil.__parallelmap(closestpoint, zip(curves, points))
+
+
 def CurveContourPoints(curve_id, start_point, end_point, interval=None):
     """Returns the 3D point locations calculated by contouring a curve object.
     Parameters:
@@ -1219,6 +1250,17 @@ def CurveLength(curve_id, segment_index=-1, sub_domain=None):
     return curve.GetLength()
 
 
+def CurveLengths(curve_ids):
+    """Returns the lengths of many curve objects. The curves are looked up
+    once and measured on multiple threads
+    Parameters:
+      curve_ids = identifiers of the curve objects
+    Returns:
+      list of lengths in the order of curve_ids
+    """
+    return rhutil.__parallelmap(lambda curve: curve.GetLength(), __coercecurves(curve_ids))
+
+
 def CurveMidPoint(curve_id, segment_index=-1):
     """Returns the mid point of a curve object.
     Parameters:
@@ -1394,7 +1436,7 @@ def CurveStartPoint(curve_id, segment_index=-1, point=None):
         if point and curve.SetStartPoint(point):
             curve_id = rhutil.coerceguid(curve_id, True)
             scriptcontext.doc.Objects.Replace(curve_id, curve)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     return rc
 
 
@@ -1526,10 +1568,34 @@ def DivideCurve(curve_id, segments, create_points=False, return_points=True):
         if create_points:
             for point in outputpoints:
                 if point.IsValid: scriptcontext.doc.Objects.AddPoint(point)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     return rc
 
 
+def DivideCurves(curve_ids, segments, return_points=True):
+    """Divides many curve objects into a number of segments. The curves are
+    looked up once and divided on multiple threads
+    Parameters:
+      curve_ids = identifiers of the curve objects
+      segments = the number of segments, or a list with one number for each curve
+      return_points [opt] = If omitted or True, points are returned.
+          If False, curve parameters are returned.
+    Returns:
+      list with a list of points or parameters for each curve, in the order
+      of curve_ids. None for curves that could not be divided
+    """
+    curves = __coercecurves(curve_ids)
+    if type(segments) is int: segments = [segments]*len(curves)
+    elif len(segments)!=len(curves): raise ValueError("segments must have one number for each curve")
+    def divide(item):
+        curve, count = item
+        rc = curve.DivideByCount(count, True)
+        if not rc: return None
+        if return_points: return [curve.PointAt(t) for t in rc]
+        return list(rc)
+    return rhutil.__parallelmap(divide, zip(curves, segments))
+
+
 def DivideCurveEquidistant(curve_id, distance, create_points=False, return_points=True):
     """Divides a curve such that the linear distance between the points is equal.
     Parameters:
@@ -1547,7 +1613,7 @@ def DivideCurveEquidistant(curve_id, distance, create_points=False, return_point
     if not points: return scriptcontext.errorhandler()
     if create_points:
         for point in points: scriptcontext.doc.Objects.AddPoint(point)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     if return_points: return points
     tvals = []
     for point in points:
@@ -1613,15 +1679,87 @@ def EllipseQuadPoints(curve_id):
     return (origin-xaxis, origin+xaxis, origin-yaxis, origin+yaxis)
 
 
-def EvaluateCurve(curve_id, t, segment_index=-1):
-    """Evaluates a curve at a parameter and returns a 3D point
+def EvaluateCurve(curve_id, t, segment_index=-1, fields=None):
+    """Evaluates a curve at a parameter and returns a 3D point, or samples a
+    curve at many parameters and returns packed arrays of values
     Parameters:
       curve_id = identifier of the curve object
-      t = the parameter to evaluate
+      t = the parameter to evaluate, or a sequence of parameters
       segment_index [opt] = the curve segment if curve_id identifies a polycurve
+      fields [opt] = when t is a sequence, the values to compute at every
+        parameter. If omitted, only points are computed
+          point = 3D point, 3 values
+          tangent = unit tangent vector, 3 values
+          curvature = curvature vector, 3 values
+          frame = origin, x, y and z axis of the curve's frame, 12 values.
+            NaN at parameters where the frame could not be evaluated
+    Returns:
+      3D point if t is a single parameter
+      if t is a sequence and fields is omitted, array.array('d') of point
+      coordinates, 3 values per parameter
+      if t is a sequence and fields is specified, dictionary of field name to
+      array.array('d') with the values of all parameters one after the other
+    Example:
+      import rhinoscriptsyntax as rs
+      domain = rs.CurveDomain(id)
+      params = [domain[0] + (domain[1]-domain[0])*i/9999.0 for i in range(10000)]
+      samples = rs.EvaluateCurve(id, params, fields=["point", "tangent"])
     """
     curve = rhutil.coercecurve(curve_id, segment_index, True)
-    return curve.PointAt(t)
+    if not hasattr(t, "__len__") and not hasattr(t, "__iter__"): return curve.PointAt(t)
+    parameters = rhutil.__packedvalues(t)
+    if parameters is None: parameters = [float(s) for s in t]
+    columns = []
+    for field in (fields or ["point"]):
+        if field=="point": columns.append((field, curve.PointAt, 3))
+        elif field=="tangent": columns.append((field, curve.TangentAt, 3))
+        elif field=="curvature": columns.append((field, curve.CurvatureAt, 3))
+        elif field=="frame": columns.append((field, curve.FrameAt, 12))
+        else: raise ValueError("%s is not a supported field"%field)
+    rc = {}
+    for field, evaluate, size in columns:
+        values = array.array("d", [0.0]) * (len(parameters)*size)
+        i = 0
+        if size==3:
+            for s in parameters:
+                v = evaluate(s)
+                values[i], values[i+1], values[i+2] = v.X, v.Y, v.Z
+                i += 3
+        else:
+            nan = array.array("d", [float("nan")]*12)
+            for s in parameters:
+                found, plane = evaluate(s)
+                if not found:
+                    values[i:i+12] = nan
+                    i += 12
+                    continue
+                o, x, y, z = plane.Origin, plane.XAxis, plane.YAxis, plane.ZAxis
+                values[i:i+12] = array.array("d", (o.X, o.Y, o.Z, x.X, x.Y, x.Z, y.X, y.Y, y.Z, z.X, z.Y, z.Z))
+                i += 12
+        rc[field] = values
+    if fields is None: return rc["point"]
+    return rc
+
+
+def EvaluateCurves(curve_ids, parameters):
+    """Evaluates many curves at parameters. The curves are looked up once and
+    evaluated on multiple threads
+    Parameters:
+      curve_ids = identifiers of the curve objects
+      parameters = list with one entry for each curve. An entry is either a
+        parameter or a list of parameters to evaluate the curve at
+    Returns:
+      list with a 3D point, or a list of 3D points, for each curve in the
+      order of curve_ids
+    """
+    curves = __coercecurves(curve_ids)
+    parameters = list(parameters)
+    if len(parameters)!=len(curves): raise ValueError("parameters must have one entry for each curve")
+    def evaluate(item):
+        curve, t = item
+        if type(t) in (list, tuple): return [curve.PointAt(s) for s in t]
+        return curve.PointAt(t)
+    return rhutil.__parallelmap(evaluate, zip(curves, parameters))
 
 
 def ExplodeCurves(curve_ids, delete_input=False):
@@ -1646,7 +1784,7 @@ def ExplodeCurves(curve_ids, delete_input=False):
             if delete_input:
                 id = rhutil.coerceguid(id, True)
                 scriptcontext.doc.Objects.Delete(id, True)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -1680,7 +1818,7 @@ def ExtendCurve(curve_id, extension_type, side, boundary_object_ids):
     if newcurve and newcurve.IsValid:
         curve_id = rhutil.coerceguid(curve_id, True)
         if scriptcontext.doc.Objects.Replace(curve_id, newcurve):
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
             return curve_id
     return scriptcontext.errorhandler()
 
@@ -1713,7 +1851,7 @@ def ExtendCurveLength(curve_id, extension_type, side, length):
     if newcurve and newcurve.IsValid:
         curve_id = rhutil.coerceguid(curve_id, True)
         if scriptcontext.doc.Objects.Replace(curve_id, newcurve):
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
             return curve_id
     return scriptcontext.errorhandler()
 
@@ -1741,7 +1879,7 @@ def ExtendCurvePoint(curve_id, side, point):
     if newcurve and newcurve.IsValid:
         curve_id = rhutil.coerceguid(curve_id, True)
         if scriptcontext.doc.Objects.Replace( curve_id, newcurve ):
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
             return curve_id
     return scriptcontext.errorhandler()
 
@@ -1767,7 +1905,7 @@ def FairCurve(curve_id, tolerance=1.0):
     if not newcurve: return False
     curve_id = rhutil.coerceguid(curve_id, True)
     if scriptcontext.doc.Objects.Replace(curve_id, newcurve):
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return True
     return False
 
@@ -1805,7 +1943,7 @@ def FitCurve(curve_id, degree=3, distance_tolerance=-1, angle_tolerance=-1):
         else:
             rc = scriptcontext.doc.Objects.AddCurve(curve)
         if rc==System.Guid.Empty: raise Exception("Unable to add curve to document")
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
     return scriptcontext.errorhandler()
 
@@ -1835,7 +1973,7 @@ def InsertCurveKnot(curve_id, parameter, symmetrical=False ):
         if rc:
             curve_id = rhutil.coerceguid(curve_id)
             rc = scriptcontext.doc.Objects.Replace(curve_id, nc)
-            if rc: scriptcontext.doc.Views.Redraw()
+            if rc: rhutil.__redraw()
     return rc
 
 
@@ -2044,7 +2182,7 @@ def JoinCurves(object_ids, delete_input=False, tolerance=None):
         for id in object_ids:
             id = rhutil.coerceguid(id, True)
             scriptcontext.doc.Objects.Delete(id, False)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2091,7 +2229,7 @@ def MakeCurveNonPeriodic(curve_id, delete_input=False):
             if rhobj: attrs = rhobj.Attributes
         rc = scriptcontext.doc.Objects.AddCurve(nc, attrs)
         if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2110,7 +2248,7 @@ def MeanCurve(curve0, curve1, tolerance=None):
     crv = Rhino.Geometry.Curve.CreateMeanCurve(curve0,curve1,tolerance)
     if crv:
         rc = scriptcontext.doc.Objects.AddCurve(crv)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -2129,7 +2267,7 @@ def MeshPolyline(polyline_id):
     mesh = Rhino.Geometry.Mesh.CreateFromClosedPolyline(polyline)
     if not mesh: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddMesh(mesh)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2158,7 +2296,7 @@ def OffsetCurve(object_id, direction, distance, normal=None, style=1):
     curves = curve.Offset(direction, normal, distance, tolerance, style)
     if curves is None: return scriptcontext.errorhandler()
     rc = [scriptcontext.doc.Objects.AddCurve(curve) for curve in curves]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2187,7 +2325,7 @@ def OffsetCurveOnSurface(curve_id, surface_id, distance_or_parameter):
     curves = curve.OffsetOnSurface(surface, x, tol)
     if curves is None: return scriptcontext.errorhandler()
     rc = [scriptcontext.doc.Objects.AddCurve(curve) for curve in curves]
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -2302,7 +2440,7 @@ def ProjectCurveToMesh(curve_ids, mesh_ids, direction):
     tolerance = scriptcontext.doc.ModelAbsoluteTolerance
     newcurves = Rhino.Geometry.Curve.ProjectToMesh(curves, meshes, direction, tolerance)
     ids = [scriptcontext.doc.Objects.AddCurve(curve) for curve in newcurves]
-    if ids: scriptcontext.doc.Views.Redraw()
+    if ids: rhutil.__redraw()
     return ids
 
 
@@ -2323,7 +2461,7 @@ def ProjectCurveToSurface(curve_ids, surface_ids, direction):
     tolerance = scriptcontext.doc.ModelAbsoluteTolerance
     newcurves = Rhino.Geometry.Curve.ProjectToBrep(curves, breps, direction, tolerance)
     ids = [scriptcontext.doc.Objects.AddCurve(curve) for curve in newcurves]
-    if ids: scriptcontext.doc.Views.Redraw()
+    if ids: rhutil.__redraw()
     return ids
 
 
@@ -2342,7 +2480,7 @@ def RebuildCurve(curve_id, degree=3, point_count=10):
     newcurve = curve.Rebuild(point_count, degree, False)
     if not newcurve: return False
     scriptcontext.doc.Objects.Replace(curve_id, newcurve)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return True
 
 
@@ -2377,7 +2515,7 @@ def SimplifyCurve(curve_id, flags=0):
     if newcurve:
         curve_id = rhutil.coerceguid(curve_id, True)
         scriptcontext.doc.Objects.Replace(curve_id, newcurve)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return True
     return False
 
@@ -2403,7 +2541,7 @@ def SplitCurve(curve_id, parameter, delete_input=True):
     if rc and delete_input:
         id = rhutil.coerceguid(curve_id, True)
         scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2432,5 +2570,5 @@ def TrimCurve(curve_id, interval, delete_input=True):
     if delete_input:
         id = rhutil.coerceguid(curve_id, True)
         scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
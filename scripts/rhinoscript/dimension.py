@@ -32,7 +32,7 @@ def AddAlignedDimension(start_point, end_point, point_on_dimension_line, style=N
     ldim.Aligned = True
     rc = scriptcontext.doc.Objects.AddLinearDimension(ldim)
     if rc==System.Guid.Empty: raise Exception("unable to add dimension to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -90,7 +90,7 @@ def AddLeader(points, view_or_plane=None, text=None):
             if not isinstance(text, str): text = str(text)
             rc = scriptcontext.doc.Objects.AddLeader(text, plane, points2d)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -107,7 +107,7 @@ def AddLinearDimension(start_point, end_point, point_on_dimension_line):
     if not ldim: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddLinearDimension(ldim)
     if rc==System.Guid.Empty: raise Exception("unable to add dimension to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -197,7 +197,7 @@ def DimensionUserText(object_id, usertext=None):
     if usertext is not None:
         annotation_object.Geometry.Text = usertext
         annotation_object.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
 
 
 def DimensionValue(object_id):
@@ -227,7 +227,7 @@ def DimStyleAnglePrecision(dimstyle, precision=None):
     if precision is not None:
         ds.AngleResolution = precision
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -247,7 +247,7 @@ def DimStyleArrowSize(dimstyle, size=None):
     if size is not None:
         ds.ArrowLength = size
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -272,7 +272,7 @@ def DimStyleExtension(dimstyle, extension=None):
     if extension is not None:
         ds.ExtensionLineExtension = extension
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -294,7 +294,7 @@ def DimStyleFont(dimstyle, font=None):
         newindex = scriptcontext.doc.Fonts.FindOrCreate(font, False, False)
         ds.FontIndex = newindex
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -314,7 +314,7 @@ def DimStyleLeaderArrowSize(dimstyle, size=None):
     if size is not None:
         ds.LeaderArrowLength = size
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -335,7 +335,7 @@ def DimStyleLengthFactor(dimstyle, factor=None):
     if factor is not None:
         ds.LengthFactor = factor
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -355,7 +355,7 @@ def DimStyleLinearPrecision(dimstyle, precision=None):
     if precision is not None:
         ds.LengthResolution = precision
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -387,7 +387,7 @@ def DimStyleNumberFormat(dimstyle, format=None):
         if format==1: ds.LengthFormat = Rhino.DocObjects.DistanceDisplayMode.Feet
         if format==2: ds.LengthFormat = Rhino.DocObjects.DistanceDisplayMode.FeetAndInches
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -407,7 +407,7 @@ def DimStyleOffset(dimstyle, offset=None):
     if offset is not None:
         ds.ExtensionLineOffset = offset
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -428,7 +428,7 @@ def DimStylePrefix(dimstyle, prefix=None):
     if prefix is not None:
         ds.Prefix = prefix
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -449,7 +449,7 @@ def DimStyleSuffix(dimstyle, suffix=None):
     if suffix is not None:
         ds.Suffix = suffix
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -476,7 +476,7 @@ def DimStyleTextAlignment(dimstyle, alignment=None):
         if alignment==2: ds.TextAlignment = Rhino.DocObjects.TextDisplayAlignment.AboveLine
         if alignment==3: ds.TextAlignment = Rhino.DocObjects.TextDisplayAlignment.InLine
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -496,7 +496,7 @@ def DimStyleTextGap(dimstyle, gap=None):
     if gap is not None:
         ds.TextGap = gap
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -516,7 +516,7 @@ def DimStyleTextHeight(dimstyle, height=None):
     if height:
         ds.TextHeight = height
         ds.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -626,7 +626,7 @@ def LeaderText(object_id, text=None):
     if text is not None:
         geom.TextFormula = text
         annotation_object.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -2,6 +2,44 @@ import scriptcontext
 import Rhino
 import System.Enum, System.Drawing.Size
 import utility as rhutil
+import contextlib
+
+@contextlib.contextmanager
+def batch():
+    """Defers screen redrawing for a block of code used in a with statement.
+    Redraws requested by rhinoscript functions inside the block are skipped and
+    all views are redrawn once when the block ends, even if an exception is
+    raised. Batches can be nested, only the outermost batch redraws
+    Returns:
+      dictionary with the number of skipped redraws in "redraws_avoided"
+    Example:
+      import rhinoscriptsyntax as rs
+      with rs.batch() as stats:
+          for i in range(100): rs.AddPoint((i,0,0))
+      print stats["redraws_avoided"]
+    """
+    doc = scriptcontext.doc
+    stats = {"redraws_avoided": 0}
+    redraw = False
+    if not rhutil.__batches:
+        redraw = doc.Views.RedrawEnabled
+        if redraw: doc.Views.RedrawEnabled = False
+    rhutil.__batches.append(stats)
+    try:
+        yield stats
+    finally:
+        try:
+            # remove by identity, the stats of nested batches compare equal
+            batches = rhutil.__batches
+            for i in xrange(len(batches)-1, -1, -1):
+                if batches[i] is stats:
+                    del batches[i]
+                    break
+        finally:
+            if redraw:
+                doc.Views.RedrawEnabled = True
+                doc.Views.Redraw()
+
 
 def CreatePreviewImage(filename, view=None, size=None, flags=0, wireframe=False):
     """Creates a bitmap preview image of the current model
@@ -112,7 +150,7 @@ def ReadFileVersion():
 
 def Redraw():
     "Redraws all views"
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
 
 
 def RenderAntialias(style=None):
@@ -149,7 +187,7 @@ def RenderColor(item, color=None):
         if item==0: settings.AmbientLight = color
         else: settings.BackgroundColorTop = color
         scriptcontext.doc.RenderSettings = settings
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
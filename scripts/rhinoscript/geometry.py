@@ -1,5 +1,6 @@
 import scriptcontext
 import utility as rhutil
+import document
 import Rhino
 import System.Guid, System.Array
 
@@ -44,7 +45,35 @@ def AddClippingPlane(plane, u_magnitude, v_magnitude, views=None):
     if not viewlist: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddClippingPlane(plane, u_magnitude, v_magnitude, viewlist)
     if rc==System.Guid.Empty: raise Exception("unable to add clipping plane to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
+    return rc
+
+
+def AddObjectsBatch(geometry):
+    """Adds many geometry objects to the document in one call. Screen redrawing
+    is suppressed until every object has been added and the whole batch is
+    recorded as a single undo step
+    Parameters:
+      geometry = list of geometry (Rhino.Geometry.GeometryBase) and 3D points
+    Returns:
+      list of Guid identifiers of the new objects on success. Items that could
+      not be added to the document have a System.Guid.Empty identifier
+    """
+    doc = scriptcontext.doc
+    objects = doc.Objects
+    with document.batch():
+        undo_record = 0
+        if not doc.UndoRecordingIsActive: undo_record = doc.BeginUndoRecord("AddObjectsBatch")
+        try:
+            rc = []
+            for item in geometry:
+                if isinstance(item, Rhino.Geometry.GeometryBase):
+                    rc.append(objects.Add(item))
+                else:
+                    rc.append(objects.AddPoint(rhutil.coerce3dpoint(item, True)))
+        finally:
+            if undo_record: doc.EndUndoRecord(undo_record)
+        rhutil.__redraw()
     return rc
 
 
@@ -59,7 +88,7 @@ def AddPoint(point, y=None, z=None):
     point = rhutil.coerce3dpoint(point, True)
     rc = scriptcontext.doc.Objects.AddPoint(point)
     if rc==System.Guid.Empty: raise Exception("unable to add point to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -80,7 +109,7 @@ def AddPointCloud(points, colors=None):
         points = pc
     rc = scriptcontext.doc.Objects.AddPointCloud(points)
     if rc==System.Guid.Empty: raise Exception("unable to add point cloud to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -92,9 +121,7 @@ def AddPoints(points):
       list of Guid identifiers of the new objects on success
     """
     points = rhutil.coerce3dpointlist(points, True)
-    rc = [scriptcontext.doc.Objects.AddPoint(point) for point in points]
-    scriptcontext.doc.Views.Redraw()
-    return rc
+    return AddObjectsBatch(points)
 
 
 def AddText(text, point_or_plane, height=1.0, font="Arial", font_style=0, justification=None):
@@ -132,7 +159,7 @@ def AddText(text, point_or_plane, height=1.0, font="Arial", font_style=0, justif
         just = System.Enum.ToObject(Rhino.Geometry.TextJustification, justification)
         id = scriptcontext.doc.Objects.AddText(text, plane, height, font, bold, italic, just)
     if id==System.Guid.Empty: raise ValueError("unable to add text to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -149,7 +176,7 @@ def AddTextDot(text, point):
     if not isinstance(text, str): text = str(text)
     rc = scriptcontext.doc.Objects.AddTextDot(text, point)
     if id==System.Guid.Empty: raise ValueError("unable to add text dot to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -232,7 +259,7 @@ def ExplodeText(text_id, delete=False):
     attr = rhobj.Attributes
     rc = [scriptcontext.doc.Objects.AddCurve(curve,attr) for curve in curves]
     if delete: scriptcontext.doc.Objects.Delete(rhobj,True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -344,7 +371,7 @@ def PointCloudHidePoints(object_id, hidden=[]):
             for i in range(pc.Count): pc[i].Hidden = hidden[i]
         if rhobj:
             rhobj.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -368,7 +395,7 @@ def PointCloudPointColors(object_id, colors=[]):
             for i in range(pc.Count): pc[i].Color = rhutil.coercecolor(colors[i])
         if rhobj:
             rhobj.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -399,7 +426,7 @@ def PointCoordinates(object_id, point=None):
             point = rhutil.coerce3dpoint(point, True)
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, point)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -420,7 +447,7 @@ def TextDotFont(object_id, fontface=None):
             textdot.FontFace = fontface
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, textdot)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -441,7 +468,7 @@ def TextDotHeight(object_id, height=None):
             textdot.FontHeight = height
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, textdot)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -462,7 +489,7 @@ def TextDotPoint(object_id, point=None):
             textdot.Point = rhutil.coerce3dpoint(point, True)
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, textdot)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -484,7 +511,7 @@ def TextDotText(object_id, text=None):
             textdot.Text = text
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, textdot)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
 
 
@@ -509,7 +536,7 @@ def TextObjectFont(object_id, font=None):
         annotation.FontIndex = index
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, annotation)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -531,7 +558,7 @@ def TextObjectHeight(object_id, height=None):
         annotation.TextHeight = height
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, annotation)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -553,7 +580,7 @@ def TextObjectPlane(object_id, plane=None):
         annotation.Plane = rhutil.coerceplane(plane, True)
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, annotation)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -577,7 +604,7 @@ def TextObjectPoint(object_id, point=None):
         text.Plane = plane
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, text)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -607,7 +634,7 @@ def TextObjectStyle(object_id, style=None):
         annotation.FontIndex = index
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, annotation)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -630,5 +657,5 @@ def TextObjectText(object_id, text=None):
         annotation.Text = text
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, annotation)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
@@ -14,7 +14,7 @@ def EnableObjectGrips(object_id, enable=True):
     rhobj = rhutil.coercerhinoobject(object_id, True, True)
     if enable!=rhobj.GripsOn:
         rhobj.GripsOn = enable
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
 
 
 def GetObjectGrip(message=None, preselect=False, select=False):
@@ -32,12 +32,12 @@ def GetObjectGrip(message=None, preselect=False, select=False):
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     rc, grip = Rhino.Input.RhinoGet.GetGrip(message)
     if rc!=Rhino.Commands.Result.Success: return scriptcontext.errorhandler()
     if select:
         grip.Select(True, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return grip.OwnerId, grip.Index, grip.CurrentLocation
 
 
@@ -56,7 +56,7 @@ def GetObjectGrips(message=None, preselect=False, select=False):
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     getrc, grips = Rhino.Input.RhinoGet.GetGrips(message)
     if getrc!=Rhino.Commands.Result.Success or not grips:
         return scriptcontext.errorhandler()
@@ -67,7 +67,7 @@ def GetObjectGrips(message=None, preselect=False, select=False):
         location = grip.CurrentLocation
         rc.append((id, index, location))
         if select: grip.Select(True, True)
-    if select: scriptcontext.doc.Views.Redraw()
+    if select: rhutil.__redraw()
     return rc
 
 
@@ -83,7 +83,7 @@ def __neighborgrip(i, object_id, index, direction, enable):
         next_grip = grip.NeighborGrip(0,i,0,False)
     if next_grip and enable:
         next_grip.Select(True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return next_grip
 
 
@@ -135,7 +135,7 @@ def ObjectGripLocation(object_id, index, point=None):
     if point:
         grip.CurrentLocation = rhutil.coerce3dpoint(point, True)
         scriptcontext.doc.Objects.GripUpdate(rhobj, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -164,7 +164,7 @@ def ObjectGripLocations(object_id, points=None):
             point = points[i]
             grip.CurrentLocation = point
         scriptcontext.doc.Objects.GripUpdate(rhobj, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -244,7 +244,7 @@ def SelectObjectGrip(object_id, index):
     if index<0 or index>=grips.Length: return False
     grip = grips[index]
     if grip.Select(True,True)>0:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return True
     return False
 
@@ -266,7 +266,7 @@ def SelectObjectGrips(object_id):
     for grip in grips:
         if grip.Select(True,True)>0: count+=1
     if count>0:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return count
     return scriptcontext.errorhandler()
 
@@ -287,7 +287,7 @@ def UnselectObjectGrip(object_id, index):
     if index<0 or index>=grips.Length: return False
     grip = grips[index]
     if grip.Select(False)==0:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return True
     return False
 
@@ -308,6 +308,6 @@ def UnselectObjectGrips(object_id):
     for grip in grips:
         if grip.Select(False)==0: count += 1
     if count>0:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return count
     return scriptcontext.errorhandler()
@@ -1,12 +1,113 @@
 import Rhino.DocObjects.Layer
+import Rhino
 import scriptcontext
 import utility as rhutil
 import System.Guid
 
 
+__layer_index = None # (doc, full paths, names, ids, child counts), see __layerindex
+__layer_counts = None # (doc, layer index -> object count), see __layerobjectcount
+
+
+def __layerindex():
+    """Returns lookup tables for the layers of the active document as a tuple of
+    (doc, full path -> index, name -> index, id -> index, id -> child count),
+    keyed on lower case full paths and names. The tables are built once and
+    kept up to date by layer table events
+    """
+    global __layer_index
+    doc = scriptcontext.doc
+    if not rhutil.__samedocument(__layer_index, doc):
+        rhutil.__subscribe(("RhinoDoc.LayerTableEvent", __layertableevent))
+        __layer_index = doc, {}, {}, {}, {}
+        for layer in doc.Layers: __indexlayer(layer)
+    return __layer_index
+
+
+def __indexlayer(layer):
+    "add a layer to the lookup tables"
+    if layer.IsDeleted: return
+    doc, paths, names, ids, children = __layer_index
+    index = layer.LayerIndex
+    # layer names are case insensitive, the tables are keyed on lower case
+    paths.setdefault(layer.FullPath.lower(), index)
+    names.setdefault(layer.Name.lower(), index)
+    ids[layer.Id] = index
+    children[layer.ParentLayerId] = children.get(layer.ParentLayerId, 0) + 1
+
+
+def __layertableevent(sender, e):
+    "update the layer lookup tables when the layer table changes"
+    global __layer_index
+    if not rhutil.__samedocument(__layer_index, e.Document): return
+    eventtype = Rhino.DocObjects.Tables.LayerTableEventType
+    if e.EventType==eventtype.Current or e.EventType==eventtype.Sorted: return
+    if e.EventType==eventtype.Added:
+        __indexlayer(e.Document.Layers[e.LayerIndex])
+        return
+    if e.EventType==eventtype.Modified and e.OldState is not None:
+        old, new = e.OldState, e.Document.Layers[e.LayerIndex]
+        if old.Name==new.Name and old.ParentLayerId==new.ParentLayerId: return
+    __layer_index = None
+
+
+def __layerobjectcount(layer):
+    """Returns the number of objects on a layer. Counts for all layers are
+    computed with one pass over the document and then kept up to date by
+    object table events. Hidden and locked objects and lights are counted
+    """
+    global __layer_counts
+    doc = scriptcontext.doc
+    if not rhutil.__samedocument(__layer_counts, doc):
+        rhutil.__subscribe(("RhinoDoc.AddRhinoObject", __addobjectevent),
+                           ("RhinoDoc.UndeleteRhinoObject", __addobjectevent),
+                           ("RhinoDoc.DeleteRhinoObject", __deleteobjectevent),
+                           ("RhinoDoc.ModifyObjectAttributes", __modifyattributesevent))
+        counts = {}
+        settings = Rhino.DocObjects.ObjectEnumeratorSettings()
+        settings.HiddenObjects = True
+        settings.LockedObjects = True
+        settings.IncludeLights = True
+        for rhobj in doc.Objects.GetObjectList(settings):
+            index = rhobj.Attributes.LayerIndex
+            counts[index] = counts.get(index, 0) + 1
+        __layer_counts = doc, counts
+    return __layer_counts[1].get(layer.LayerIndex, 0)
+
+
+def __countobject(doc, layer_index, count):
+    "add count objects to the object count of a layer"
+    if not rhutil.__samedocument(__layer_counts, doc): return
+    counts = __layer_counts[1]
+    counts[layer_index] = counts.get(layer_index, 0) + count
+
+
+def __addobjectevent(sender, e):
+    __countobject(e.TheObject.Document, e.TheObject.Attributes.LayerIndex, 1)
+
+
+def __deleteobjectevent(sender, e):
+    __countobject(e.TheObject.Document, e.TheObject.Attributes.LayerIndex, -1)
+
+
+def __modifyattributesevent(sender, e):
+    old, new = e.OldAttributes.LayerIndex, e.NewAttributes.LayerIndex
+    if old!=new:
+        __countobject(e.Document, old, -1)
+        __countobject(e.Document, new, 1)
+
+
 def __getlayer(name_or_id, raise_if_missing):
     if not name_or_id: raise TypeError("Parameter must be a string or Guid")
+    doc, paths, names, ids, children = __layerindex()
     id = rhutil.coerceguid(name_or_id)
+    if id: index = ids.get(id)
+    else:
+        key = name_or_id.lower()
+        index = paths.get(key, names.get(key))
+    if index is not None:
+        layer = doc.Layers[index]
+        if not layer.IsDeleted: return layer
     if id: name_or_id = id
     else:
         layer = scriptcontext.doc.Layers.FindByFullPath(name_or_id, True)
@@ -123,11 +224,11 @@ def IsLayerCurrent(layer):
 
 
 def IsLayerEmpty(layer):
-    "Verifies that an existing layer is empty, or contains no objects"
+    """Verifies that an existing layer is empty, or contains no objects.
+    Hidden and locked objects and lights on the layer are counted as objects
+    """
     layer = __getlayer(layer, True)
-    rhobjs = scriptcontext.doc.Objects.FindByLayer(layer)
-    if not rhobjs: return True
-    return False
+    return __layerobjectcount(layer)==0
 
 
 def IsLayerExpanded(layer):
@@ -182,9 +283,7 @@ def IsLayerVisible(layer):
 def LayerChildCount(layer):
     "Returns the number of immediate child layers of a layer"
     layer = __getlayer(layer, True)
-    children = layer.GetChildren()
-    if children: return len(children)
-    return 0
+    return __layerindex()[4].get(layer.Id, 0)
 
 
 def LayerChildren(layer):
@@ -215,7 +314,7 @@ def LayerColor(layer, color=None):
         color = rhutil.coercecolor(color)
         layer.Color = color
         if scriptcontext.doc.Layers.Modify(layer, layer.LayerIndex, False):
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     return rc
 
 
@@ -242,7 +341,7 @@ def LayerLinetype(layer, linetype=None):
         if index==-1: return scriptcontext.errorhandler()
         layer.LinetypeIndex = index
         layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -260,7 +359,7 @@ def LayerLocked(layer, locked=None):
     if locked!=None and locked!=rc:
         layer.IsLocked = locked
         layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -276,7 +375,7 @@ def LayerMaterialIndex(layer,index=None):
     if index is not None and index>=-1:
         layer.RenderMaterialIndex = index
         layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -324,7 +423,7 @@ def LayerPrintColor(layer, color=None):
         color = rhutil.coercecolor(color)
         layer.PlotColor = color
         layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -343,7 +442,7 @@ def LayerPrintWidth(layer, width=None):
     if width is not None and width!=rc:
         layer.PlotWeight = width
         layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -364,7 +463,7 @@ def LayerVisible(layer, visible=None, force_visible=False):
         else:
             layer.IsVisible = visible
             layer.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -409,7 +508,7 @@ def PurgeLayer(layer):
     """
     layer = __getlayer(layer, True)
     rc = scriptcontext.doc.Layers.Purge( layer.LayerIndex, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 def RenameLayer(oldname, newname):
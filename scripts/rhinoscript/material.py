@@ -19,7 +19,7 @@ def AddMaterialToLayer(layer):
     material_index = scriptcontext.doc.Materials.Add()
     layer.RenderMaterialIndex = material_index
     if scriptcontext.doc.Layers.Modify( layer, layer.LayerIndex, True):
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return material_index
     return scriptcontext.errorhandler()
 
@@ -58,7 +58,7 @@ def CopyMaterial(source_index, destination_index):
     source = scriptcontext.doc.Materials[source_index]
     if source is None: return False
     rc = scriptcontext.doc.Materials.Modify(source, destination_index, True)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -114,7 +114,7 @@ def MatchMaterial(source, destination):
             rhobj.Attributes.MaterialSource = Rhino.DocObjects.ObjectMaterialSource.MaterialFromObject
             rhobj.CommitChanges()
             rc += 1
-    if rc>0: scriptcontext.doc.Views.Redraw()
+    if rc>0: rhutil.__redraw()
     return rc
 
 
@@ -135,7 +135,7 @@ def MaterialBump(material_index, filename=None):
     if filename:
         mat.SetBumpTexture(filename)
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -156,7 +156,7 @@ def MaterialColor(material_index, color=None):
     if color:
         mat.DiffuseColor = color
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -177,7 +177,7 @@ def MaterialEnvironmentMap(material_index, filename=None):
     if filename:
         mat.SetEnvironmentTexture(filename)
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -217,7 +217,7 @@ def MaterialReflectiveColor(material_index, color=None):
     if color:
         mat.ReflectionColor = color
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -238,7 +238,7 @@ def MaterialShine(material_index, shine=None):
     if shine:
         mat.Shine = shine
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -259,7 +259,7 @@ def MaterialTexture(material_index, filename=None):
     if filename:
         mat.SetBitmapTexture(filename)
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -280,7 +280,7 @@ def MaterialTransparency(material_index, transparency=None):
     if transparency:
         mat.Transparency = transparency
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -301,7 +301,7 @@ def MaterialTransparencyMap(material_index, filename=None):
     if filename:
         mat.SetTransparencyTexture(filename)
         mat.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -315,5 +315,5 @@ def ResetMaterial(material_index):
     mat = scriptcontext.doc.Materials[material_index]
     if mat is None: return False
     rc = scriptcontext.doc.Materials.ResetMaterial(material_index)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
@@ -2,9 +2,350 @@ import scriptcontext
 import utility as rhutil
 import Rhino
 import System.Guid, System.Array, System.Drawing.Color
+import array
+import itertools
+import os
+import struct
+import sys
+from pointio import __plyelement, __plyheader
 from view import __viewhelper
 
-def AddMesh(vertices, face_vertices, vertex_normals=None, texture_coordinates=None, vertex_colors=None):
+def __flatbuffer(values, typecode):
+    """flat sequence of numbers for array.array, memoryview, numpy or flat list
+    input. None for lists of points, vectors or faces
+    """
+    rc = rhutil.__packedvalues(values, typecode)
+    if rc is None and (type(values) is list or type(values) is tuple):
+        if values and type(values[0]) in (int, long, float): rc = values
+    return rc
+
+
+def __chunks(typecode, count, chunk_size, values):
+    """generator of array.array chunks. values(i) returns the numbers of item i.
+    chunk_size is checked before the generator is returned, not at the first
+    next() call
+    """
+    if chunk_size<1: raise ValueError("chunk_size must be greater than 0")
+    def chunks():
+        for start in xrange(0, count, chunk_size):
+            rc = array.array(typecode)
+            for i in xrange(start, min(start+chunk_size, count)): rc.extend(values(i))
+            yield rc
+    return chunks()
+
+
+def __facevalues(faces, triangles):
+    "function returning the vertex indices of a face as 4 numbers or triangles"
+    def values(i):
+        face = faces.GetFace(i)
+        if not triangles: return face.A, face.B, face.C, face.D
+        if face.C==face.D: return face.A, face.B, face.C
+        return face.A, face.B, face.C, face.A, face.C, face.D
+    return values
+
+
+def __vectorvalues(items):
+    "function returning the x,y,z values of an item in a mesh component list"
+    def values(i):
+        item = items[i]
+        return item.X, item.Y, item.Z
+    return values
+
+
+def __floatbuffer(items, double_precision):
+    "x,y,z values of a mesh vertex or normal list as a flat array.array"
+    typecode = "d" if double_precision else "f"
+    if hasattr(items, "ToFloatArray"): return array.array(typecode, items.ToFloatArray())
+    rc = array.array(typecode, [0.0]) * (items.Count*3)
+    for i in xrange(items.Count):
+        item = items[i]
+        rc[i*3], rc[i*3+1], rc[i*3+2] = item.X, item.Y, item.Z
+    return rc
+
+
+def __colorvalues(colors):
+    "function returning the r,g,b values of a mesh vertex color"
+    def values(i):
+        color = colors[i]
+        return color.R, color.G, color.B
+    return values
+
+
+def __meshfiletype(filename, file_type):
+    "mesh file type from the file_type argument or the file name extension"
+    if not file_type: file_type = os.path.splitext(filename)[1][1:]
+    file_type = file_type.lower()
+    if file_type not in ("stl", "ply", "obj"):
+        raise ValueError("unsupported mesh file type %s"%file_type)
+    return file_type
+
+
+def __polygonfaces(indices, faces):
+    "appends a face for a triangle or quad, or a fan of triangles for a polygon"
+    count = len(indices)
+    if count==3: faces.append(Rhino.Geometry.MeshFace(indices[0], indices[1], indices[2]))
+    elif count==4: faces.append(Rhino.Geometry.MeshFace(indices[0], indices[1], indices[2], indices[3]))
+    else:
+        for i in xrange(1, count-1):
+            faces.append(Rhino.Geometry.MeshFace(indices[0], indices[i], indices[i+1]))
+
+
+def __addmeshchunk(mesh, points, normals=None, colors=None, faces=None):
+    "appends vertices, vertex normals, vertex colors and faces to a mesh"
+    if points: mesh.Vertices.AddVertices(System.Array[Rhino.Geometry.Point3f](points))
+    if normals: mesh.Normals.AddRange(System.Array[Rhino.Geometry.Vector3f](normals))
+    if colors: mesh.VertexColors.AppendColors(System.Array[System.Drawing.Color](colors))
+    if faces: mesh.Faces.AddFaces(faces)
+
+
+def __writestl(file, mesh, binary, chunk_size):
+    "writes the triangles of a mesh to a STL file, quads are split in two"
+    vertices = __floatbuffer(mesh.Vertices, False)
+    if binary:
+        file.write("binary STL written by rhinoscript".ljust(80))
+        file.write(struct.pack("<I", mesh.Faces.TriangleCount + 2*mesh.Faces.QuadCount))
+        record = struct.Struct("<12fH")
+    else:
+        file.write("solid mesh\n")
+        facet = " facet normal %.9g %.9g %.9g\n  outer loop\n" + \
+                "   vertex %.9g %.9g %.9g\n"*3 + "  endloop\n endfacet\n"
+    for faces in IterMeshFaces(mesh, True, chunk_size):
+        facets = []
+        for i in xrange(0, len(faces), 3):
+            a, b, c = faces[i]*3, faces[i+1]*3, faces[i+2]*3
+            ax, ay, az = vertices[a], vertices[a+1], vertices[a+2]
+            bx, by, bz = vertices[b], vertices[b+1], vertices[b+2]
+            cx, cy, cz = vertices[c], vertices[c+1], vertices[c+2]
+            ux, uy, uz = bx-ax, by-ay, bz-az
+            vx, vy, vz = cx-ax, cy-ay, cz-az
+            nx, ny, nz = uy*vz-uz*vy, uz*vx-ux*vz, ux*vy-uy*vx
+            length = (nx*nx + ny*ny + nz*nz)**0.5
+            if length>0: nx, ny, nz = nx/length, ny/length, nz/length
+            if binary: facets.append(record.pack(nx, ny, nz, ax, ay, az, bx, by, bz, cx, cy, cz, 0))
+            else: facets.append(facet%(nx, ny, nz, ax, ay, az, bx, by, bz, cx, cy, cz))
+        file.write("".join(facets))
+    if not binary: file.write("endsolid mesh\n")
+
+
+def __writeply(file, mesh, binary, chunk_size):
+    "writes the vertices, vertex normals, vertex colors and faces of a mesh to a PLY file"
+    count = mesh.Vertices.Count
+    normals = count>0 and mesh.Normals.Count==count
+    colors = count>0 and mesh.VertexColors.Count==count
+    names = ["x", "y", "z"]
+    if normals: names += ["nx", "ny", "nz"]
+    header = ["ply", "format %s 1.0"%("binary_little_endian" if binary else "ascii"),
+              "element vertex %d"%count]
+    header += ["property float %s"%name for name in names]
+    if colors: header += ["property uchar %s"%name for name in ("red", "green", "blue")]
+    header += ["element face %d"%mesh.Faces.Count, "property list uchar int vertex_indices", "end_header", ""]
+    file.write("\n".join(header))
+    stride = len(names)
+    if binary: record = struct.Struct("<" + "f"*stride + "BBB"*colors)
+    else: line = " ".join(["%.9g"]*stride + ["%d"]*(3*colors))
+    vertex_chunks = IterMeshVertices(mesh, chunk_size)
+    normal_chunks = itertools.repeat(None)
+    if normals: normal_chunks = IterMeshVertexNormals(mesh, chunk_size)
+    color_chunks = itertools.repeat(None)
+    if colors: color_chunks = __chunks("B", count, chunk_size, __colorvalues(mesh.VertexColors))
+    for points, vectors, rgbs in itertools.izip(vertex_chunks, normal_chunks, color_chunks):
+        size = len(points)/3
+        values = array.array("f", [0.0]) * (size*stride)
+        for k in xrange(3):
+            values[k::stride] = array.array("f", points[k::3])
+            if vectors is not None: values[3+k::stride] = vectors[k::3]
+        if binary and not colors:
+            # records of floats only are written as one array
+            if sys.byteorder!="little": values.byteswap()
+            values.tofile(file)
+            continue
+        rows = []
+        for i in xrange(size):
+            row = tuple(values[i*stride:(i+1)*stride])
+            if colors: row += tuple(rgbs[i*3:i*3+3])
+            if binary: rows.append(record.pack(*row))
+            else: rows.append(line%row + "\n")
+        file.write("".join(rows))
+    triangle, quad = struct.Struct("<B3i"), struct.Struct("<B4i")
+    for faces in IterMeshFaces(mesh, False, chunk_size):
+        rows = []
+        for i in xrange(0, len(faces), 4):
+            a, b, c, d = faces[i], faces[i+1], faces[i+2], faces[i+3]
+            if binary:
+                if c==d: rows.append(triangle.pack(3, a, b, c))
+                else: rows.append(quad.pack(4, a, b, c, d))
+            elif c==d: rows.append("3 %d %d %d\n"%(a, b, c))
+            else: rows.append("4 %d %d %d %d\n"%(a, b, c, d))
+        file.write("".join(rows))
+
+
+def __writeobj(file, mesh, chunk_size):
+    "writes the vertices, vertex normals, vertex colors and faces of a mesh to an OBJ file"
+    count = mesh.Vertices.Count
+    normals = count>0 and mesh.Normals.Count==count
+    colors = count>0 and mesh.VertexColors.Count==count
+    color_chunks = itertools.repeat(None)
+    if colors: color_chunks = __chunks("B", count, chunk_size, __colorvalues(mesh.VertexColors))
+    for points, rgbs in itertools.izip(IterMeshVertices(mesh, chunk_size), color_chunks):
+        if colors:
+            rows = ["v %.9g %.9g %.9g %.4g %.4g %.4g\n"%(points[i], points[i+1], points[i+2],
+                    rgbs[i]/255.0, rgbs[i+1]/255.0, rgbs[i+2]/255.0) for i in xrange(0, len(points), 3)]
+        else:
+            rows = ["v %.9g %.9g %.9g\n"%(points[i], points[i+1], points[i+2]) for i in xrange(0, len(points), 3)]
+        file.write("".join(rows))
+    if normals:
+        for vectors in IterMeshVertexNormals(mesh, chunk_size):
+            rows = ["vn %.9g %.9g %.9g\n"%(vectors[i], vectors[i+1], vectors[i+2]) for i in xrange(0, len(vectors), 3)]
+            file.write("".join(rows))
+    if normals:
+        triangle, quad = "f %d//%d %d//%d %d//%d\n", "f %d//%d %d//%d %d//%d %d//%d\n"
+    else:
+        triangle, quad = "f %d %d %d\n", "f %d %d %d %d\n"
+    for faces in IterMeshFaces(mesh, False, chunk_size):
+        rows = []
+        for i in xrange(0, len(faces), 4):
+            a, b, c, d = faces[i]+1, faces[i+1]+1, faces[i+2]+1, faces[i+3]+1
+            if normals:
+                if c==d: rows.append(triangle%(a, a, b, b, c, c))
+                else: rows.append(quad%(a, a, b, b, c, c, d, d))
+            elif c==d: rows.append(triangle%(a, b, c))
+            else: rows.append(quad%(a, b, c, d))
+        file.write("".join(rows))
+
+
+def __readstl(file, mesh, chunk_size):
+    "reads the triangles of a binary or ASCII STL file into a mesh"
+    header = file.read(84)
+    binary = len(header)==84 and \
+        84 + 50*struct.unpack_from("<I", header, 80)[0]==os.path.getsize(file.name)
+    Point3f = Rhino.Geometry.Point3f
+    if binary:
+        count = struct.unpack_from("<I", header, 80)[0]
+        record = struct.Struct("<12x9f2x")
+        while count>0:
+            n = min(count, chunk_size)
+            data = file.read(n*50)
+            if len(data)<n*50: raise ValueError("STL file is truncated")
+            points = []
+            for i in xrange(n):
+                ax, ay, az, bx, by, bz, cx, cy, cz = record.unpack_from(data, i*50)
+                points += [Point3f(ax, ay, az), Point3f(bx, by, bz), Point3f(cx, cy, cz)]
+            start = mesh.Vertices.Count
+            faces = [Rhino.Geometry.MeshFace(i, i+1, i+2) for i in xrange(start, start+n*3, 3)]
+            __addmeshchunk(mesh, points, faces=faces)
+            count -= n
+    else:
+        file.seek(0)
+        pending = []
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines: break
+            for line in lines:
+                items = line.split()
+                if len(items)==4 and items[0]=="vertex":
+                    pending.append(Point3f(float(items[1]), float(items[2]), float(items[3])))
+            n = len(pending) - len(pending)%3
+            start = mesh.Vertices.Count
+            faces = [Rhino.Geometry.MeshFace(i, i+1, i+2) for i in xrange(start, start+n, 3)]
+            __addmeshchunk(mesh, pending[:n], faces=faces)
+            pending = pending[n:]
+    mesh.Vertices.CombineIdentical(True, True)
+
+
+def __readply(file, mesh, chunk_size):
+    "reads the vertices, vertex normals, vertex colors and faces of a PLY file into a mesh"
+    format, elements = __plyheader(file)
+    Point3f, Vector3f = Rhino.Geometry.Point3f, Rhino.Geometry.Vector3f
+    FromArgb = System.Drawing.Color.FromArgb
+    for name, count, properties in elements:
+        names = [property[0] for property in properties]
+        chunks = __plyelement(file, format, count, properties, chunk_size)
+        if name=="vertex":
+            try:
+                ix, iy, iz = names.index("x"), names.index("y"), names.index("z")
+            except ValueError:
+                raise ValueError("PLY vertex element has no x, y and z properties")
+            normals = colors = None
+            if "nx" in names and "ny" in names and "nz" in names:
+                normals = names.index("nx"), names.index("ny"), names.index("nz")
+            if "red" in names and "green" in names and "blue" in names:
+                colors = names.index("red"), names.index("green"), names.index("blue")
+                scale = 255.0 if properties[colors[0]][1] in "fd" else 1
+            for columns in chunks:
+                points = [Point3f(x, y, z) for x, y, z in itertools.izip(columns[ix], columns[iy], columns[iz])]
+                vectors = rgbs = None
+                if normals:
+                    nx, ny, nz = [columns[i] for i in normals]
+                    vectors = [Vector3f(x, y, z) for x, y, z in itertools.izip(nx, ny, nz)]
+                if colors:
+                    r, g, b = [columns[i] for i in colors]
+                    rgbs = [FromArgb(int(r*scale), int(g*scale), int(b*scale)) for r, g, b in itertools.izip(r, g, b)]
+                __addmeshchunk(mesh, points, vectors, rgbs)
+        elif name=="face":
+            if "vertex_indices" in names: index = names.index("vertex_indices")
+            elif "vertex_index" in names: index = names.index("vertex_index")
+            else: raise ValueError("PLY face element has no vertex_indices property")
+            for columns in chunks:
+                faces = []
+                for indices in columns[index]: __polygonfaces(indices, faces)
+                __addmeshchunk(mesh, None, faces=faces)
+        else:
+            for columns in chunks: pass
+
+
+def __readobj(file, mesh, chunk_size):
+    """reads the vertices, vertex colors, vertex normals and faces of an OBJ
+    file into a mesh. Texture coordinates, groups and materials are ignored.
+    Normals are assigned to vertices through the v//vn indices of the faces
+    and are dropped if a vertex has no normal or more than one. Colors are
+    dropped unless every v line has one
+    """
+    Point3f, Vector3f = Rhino.Geometry.Point3f, Rhino.Geometry.Vector3f
+    FromArgb = System.Drawing.Color.FromArgb
+    normals = [] # all vn lines
+    vertexnormals = {} # vertex index -> normal
+    use_normals, use_colors = True, True
+    while True:
+        lines = list(itertools.islice(file, chunk_size))
+        if not lines: break
+        points, colors, faces = [], [], []
+        for line in lines:
+            items = line.split()
+            if not items: continue
+            key = items[0]
+            if key=="v":
+                points.append(Point3f(float(items[1]), float(items[2]), float(items[3])))
+                if len(items)<7: use_colors = False
+                elif use_colors:
+                    r, g, b = [min(max(float(item), 0.0), 1.0) for item in items[4:7]]
+                    colors.append(FromArgb(int(r*255+0.5), int(g*255+0.5), int(b*255+0.5)))
+            elif key=="vn":
+                normals.append((float(items[1]), float(items[2]), float(items[3])))
+            elif key=="f":
+                count = mesh.Vertices.Count + len(points)
+                indices = []
+                for item in items[1:]:
+                    parts = item.split("/")
+                    i = int(parts[0])
+                    i = i-1 if i>0 else count+i
+                    indices.append(i)
+                    if not use_normals: continue
+                    if len(parts)<3 or not parts[2]:
+                        use_normals = False
+                        continue
+                    n = int(parts[2])
+                    normal = normals[n-1 if n>0 else len(normals)+n]
+                    if vertexnormals.setdefault(i, normal)!=normal: use_normals = False
+                __polygonfaces(indices, faces)
+        __addmeshchunk(mesh, points, None, colors if use_colors else None, faces)
+    count = mesh.Vertices.Count
+    if not use_colors: mesh.VertexColors.Clear()
+    if use_normals and len(vertexnormals)==count:
+        normals = [Vector3f(*vertexnormals[i]) for i in xrange(count)]
+        mesh.Normals.AddRange(System.Array[Vector3f](normals))
+
+
+def AddMesh(vertices, face_vertices, vertex_normals=None, texture_coordinates=None, vertex_colors=None, triangles=False):
     """Add a mesh object to the document
     Parameters:
       vertices = list of 3D points defining the vertices of the mesh
@@ -18,38 +359,84 @@ def AddMesh(vertices, face_vertices, vertex_normals=None, texture_coordinates=No
         vertex, there must be a corresponding texture coordinate
       vertex_colors[opt] = a list of color values. For every vertex,
         there must be a corresponding vertex color
+      All of the above can also be flat buffers (array.array, memoryview,
+      numpy arrays or flat lists of numbers) that are added in bulk:
+        vertices, vertex_normals = x,y,z values
+        face_vertices = 4 vertex indices per face, C==D for triangles, or 3
+          vertex indices per face if triangles is True
+        texture_coordinates = s,t values
+        vertex_colors = r,g,b values, or one ARGB integer per vertex
+      triangles[opt] = flat face_vertices buffers have 3 vertex indices per
+        face, like the buffers returned by MeshFaceBuffer(triangles=True)
     Returns:
       Identifier of the new object if successful
       None on error
     """
     mesh = Rhino.Geometry.Mesh()
-    for a, b, c in vertices: mesh.Vertices.Add(a, b, c)
-    for face in face_vertices:
-        if len(face)<4:
-            mesh.Faces.AddFace(face[0], face[1], face[2])
+    mesh.Vertices.AddVertices(rhutil.coerce3dpointlist(vertices, True))
+    indices = __flatbuffer(face_vertices, "i")
+    if indices is not None:
+        width = 3 if triangles else 4
+        if len(indices)%width:
+            raise ValueError("face_vertices buffer length must be a multiple of %d"%width)
+        it = iter(indices)
+        if triangles:
+            faces = [Rhino.Geometry.MeshFace(a, b, c) for a, b, c in itertools.izip(it, it, it)]
         else:
-            mesh.Faces.AddFace(face[0], face[1], face[2], face[3])
+            faces = [Rhino.Geometry.MeshFace(a, b, c, d) for a, b, c, d in itertools.izip(it, it, it, it)]
+        mesh.Faces.AddFaces(faces)
+    else:
+        for face in face_vertices:
+            if len(face)<4:
+                mesh.Faces.AddFace(face[0], face[1], face[2])
+            else:
+                mesh.Faces.AddFace(face[0], face[1], face[2], face[3])
     if vertex_normals:
-        count = len(vertex_normals)
-        normals = System.Array.CreateInstance(Rhino.Geometry.Vector3f, count)
-        for i, normal in enumerate(vertex_normals):
-            normals[i] = Rhino.Geometry.Vector3f(normal[0], normal[1], normal[2])
+        values = __flatbuffer(vertex_normals, "f")
+        if values is not None:
+            it = iter(values)
+            normals = [Rhino.Geometry.Vector3f(x, y, z) for x, y, z in itertools.izip(it, it, it)]
+            normals = System.Array[Rhino.Geometry.Vector3f](normals)
+        else:
+            count = len(vertex_normals)
+            normals = System.Array.CreateInstance(Rhino.Geometry.Vector3f, count)
+            for i, normal in enumerate(vertex_normals):
+                normals[i] = Rhino.Geometry.Vector3f(normal[0], normal[1], normal[2])
         mesh.Normals.SetNormals(normals)
     if texture_coordinates:
-        count = len(texture_coordinates)
-        tcs = System.Array.CreateInstance(Rhino.Geometry.Point2f, count)
-        for i, tc in enumerate(texture_coordinates):
-            tcs[i] = Rhino.Geometry.Point2f(tc[0], tc[1])
+        values = __flatbuffer(texture_coordinates, "f")
+        if values is not None:
+            it = iter(values)
+            tcs = [Rhino.Geometry.Point2f(s, t) for s, t in itertools.izip(it, it)]
+            tcs = System.Array[Rhino.Geometry.Point2f](tcs)
+        else:
+            count = len(texture_coordinates)
+            tcs = System.Array.CreateInstance(Rhino.Geometry.Point2f, count)
+            for i, tc in enumerate(texture_coordinates):
+                tcs[i] = Rhino.Geometry.Point2f(tc[0], tc[1])
         mesh.TextureCoordinates.SetTextureCoordinates(tcs)
     if vertex_colors:
-        count = len(vertex_colors)
-        colors = System.Array.CreateInstance(System.Drawing.Color, count)
-        for i, color in enumerate(vertex_colors):
-            colors[i] = rhutil.coercecolor(color)
+        values = __flatbuffer(vertex_colors, "B")
+        if values is not None:
+            count = mesh.Vertices.Count
+            if len(values)==count*3:
+                it = iter(values)
+                colors = [System.Drawing.Color.FromArgb(r, g, b) for r, g, b in itertools.izip(it, it, it)]
+            elif len(values)==count:
+                # unsigned ARGB values, like those of 'I' arrays, as Int32
+                colors = [System.Drawing.Color.FromArgb(((int(argb)+0x80000000)&0xFFFFFFFF)-0x80000000) for argb in values]
+            else:
+                raise ValueError("vertex_colors must have one ARGB value or r,g,b values per vertex")
+            colors = System.Array[System.Drawing.Color](colors)
+        else:
+            count = len(vertex_colors)
+            colors = System.Array.CreateInstance(System.Drawing.Color, count)
+            for i, color in enumerate(vertex_colors):
+                colors[i] = rhutil.coercecolor(color)
         mesh.VertexColors.SetColors(colors)
     rc = scriptcontext.doc.Objects.AddMesh(mesh)
     if rc==System.Guid.Empty: raise Exception("unable to add mesh to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -67,7 +454,7 @@ def AddPlanarMesh(object_id, delete_input=False):
     if not mesh: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddMesh(mesh)
     if rc==System.Guid.Empty: raise Exception("unable to add mesh to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -124,7 +511,7 @@ def DuplicateMeshBorder(mesh_id):
         for polyline in polylines:
             id = scriptcontext.doc.Objects.AddPolyline(polyline)
             if id!=System.Guid.Empty: rc.append(id)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -151,7 +538,7 @@ def ExplodeMeshes(mesh_ids, delete=False):
                 for submesh in submeshes:
                     id = scriptcontext.doc.Objects.AddMesh(submesh)
                     if id!=System.Guid.Empty: rc.append(id)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -195,6 +582,65 @@ def IsPointOnMesh(object_id, point):
     return face>=0
 
 
+def IterMeshFaceNormals(mesh_id, chunk_size=65536):
+    """Returns the face unit normals of a mesh object in chunks, so large meshes
+    can be processed without creating a vector for every face
+    Parameters:
+      mesh_id = identifier of a mesh object
+      chunk_size[opt] = maximum number of normals in each chunk
+    Returns:
+      generator of array.array('f') with the x,y,z values of the normals
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    if mesh.FaceNormals.Count != mesh.Faces.Count:
+        mesh.FaceNormals.ComputeFaceNormals()
+    normals = mesh.FaceNormals
+    return __chunks("f", normals.Count, chunk_size, __vectorvalues(normals))
+
+
+def IterMeshFaces(object_id, triangles=False, chunk_size=65536):
+    """Returns the vertex indices of the faces of a mesh object in chunks
+    Parameters:
+      object_id = identifier of a mesh object
+      triangles[opt] = If False, every face has 4 indices. If the third and
+        fourth indices are identical, the face is a triangle. If True, every
+        face has 3 indices and quads are split into two triangles
+      chunk_size[opt] = maximum number of faces in each chunk
+    Returns:
+      generator of array.array('i') with the vertex indices of the faces
+    """
+    mesh = rhutil.coercemesh(object_id, True)
+    faces = mesh.Faces
+    return __chunks("i", faces.Count, chunk_size, __facevalues(faces, triangles))
+
+
+def IterMeshVertexNormals(mesh_id, chunk_size=65536):
+    """Returns the vertex unit normals of a mesh object in chunks
+    Parameters:
+      mesh_id = identifier of a mesh object
+      chunk_size[opt] = maximum number of normals in each chunk
+    Returns:
+      generator of array.array('f') with the x,y,z values of the normals
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    normals = mesh.Normals
+    return __chunks("f", normals.Count, chunk_size, __vectorvalues(normals))
+
+
+def IterMeshVertices(object_id, chunk_size=65536):
+    """Returns the vertices of a mesh object in chunks, so large meshes can be
+    processed without creating a point for every vertex
+    Parameters:
+      object_id = identifier of a mesh object
+      chunk_size[opt] = maximum number of vertices in each chunk
+    Returns:
+      generator of array.array('d') with the x,y,z values of the vertices
+    """
+    mesh = rhutil.coercemesh(object_id, True)
+    vertices = mesh.Vertices
+    return __chunks("d", vertices.Count, chunk_size, __vectorvalues(vertices))
+
+
 def JoinMeshes(object_ids, delete_input=False):
     """Joins two or or more mesh objects together
     Parameters:
@@ -211,7 +657,7 @@ def JoinMeshes(object_ids, delete_input=False):
         for id in object_ids:
             guid = rhutil.coerceguid(id)
             scriptcontext.doc.Objects.Delete(guid,True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -282,7 +728,7 @@ def MeshBooleanDifference(input0, input1, delete_input=True):
         for id in input:
             id = rhutil.coerceguid(id, True)
             scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -311,7 +757,7 @@ def MeshBooleanIntersection(input0, input1, delete_input=True):
         for id in input:
             id = rhutil.coerceguid(id, True)
             scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -341,21 +787,37 @@ def MeshBooleanSplit(input0, input1, delete_input=True):
         for id in input:
             id = rhutil.coerceguid(id, True)
             scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
-def MeshBooleanUnion(mesh_ids, delete_input=True):
+def MeshBooleanUnion(mesh_ids, delete_input=True, parallel=False):
     """Performs boolean union operation on a set of input meshes
     Parameters:
       mesh_ids = identifiers of meshes
       delete_input[opt] = delete the input meshes
+      parallel[opt] = group the meshes into clusters of overlapping bounding
+        boxes and union the clusters, and chunks of large clusters, on
+        multiple threads before merging the partial results. Meshes that do
+        not intersect any other mesh are not part of the result and are not
+        deleted
     Returns:
       list of identifiers of new meshes
+      None on error
     """
     if len(mesh_ids)<2: raise ValueError("mesh_ids must contain at least 2 meshes")
     meshes = [rhutil.coercemesh(id, True) for id in mesh_ids]
-    newmeshes = Rhino.Geometry.Mesh.CreateBooleanUnion(meshes)
+    if parallel:
+        boxes = [rhutil.__boxtuple(mesh) for mesh in meshes]
+        def union(items):
+            rc = Rhino.Geometry.Mesh.CreateBooleanUnion(items)
+            if rc: return rc
+        newmeshes, used = rhutil.__parallelunion(meshes, boxes, union)
+        if not newmeshes: newmeshes = None
+        mesh_ids = [mesh_ids[i] for i in used]
+    else:
+        newmeshes = Rhino.Geometry.Mesh.CreateBooleanUnion(meshes)
+    if newmeshes is None: return scriptcontext.errorhandler()
     rc = []
     for mesh in newmeshes:
         id = scriptcontext.doc.Objects.AddMesh(mesh)
@@ -364,7 +826,7 @@ def MeshBooleanUnion(mesh_ids, delete_input=True):
         for id in mesh_ids:
             id = rhutil.coerceguid(id, True)
             scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -391,6 +853,75 @@ def MeshClosestPoint(object_id, point, maximum_distance=None):
     return closest_point, face
 
 
+def MeshExport(mesh_id, filename, file_type=None, binary=True, chunk_size=65536):
+    """Writes a mesh object to a STL, PLY or OBJ file without going through
+    Rhino's file exporters. Vertices, faces, vertex normals and vertex colors
+    are read from the mesh and written to the file in chunks
+    Parameters:
+      mesh_id = identifier of a mesh object
+      filename = name of the file to create
+      file_type[opt] = "stl", "ply" or "obj". If omitted, the type is taken
+        from the file name extension
+      binary[opt] = write STL and PLY files in binary instead of ASCII format.
+        OBJ files are always ASCII
+      chunk_size[opt] = number of vertices or faces written at a time
+    Returns:
+      True or False indicating success or failure
+    Example:
+      import rhinoscriptsyntax as rs
+      mesh = rs.GetObject("Select mesh", rs.filter.mesh)
+      if mesh: rs.MeshExport(mesh, "mesh.ply")
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    file_type = __meshfiletype(filename, file_type)
+    try:
+        file = open(filename, "wb")
+        try:
+            if file_type=="stl": __writestl(file, mesh, binary, chunk_size)
+            elif file_type=="ply": __writeply(file, mesh, binary, chunk_size)
+            else: __writeobj(file, mesh, chunk_size)
+        finally:
+            file.close()
+    except IOError:
+        return False
+    return True
+
+
+def MeshFaceBuffer(object_id, triangles=False):
+    """Returns the vertex indices of all faces of a mesh object as one flat array
+    Parameters:
+      object_id = identifier of a mesh object
+      triangles[opt] = If False, every face has 4 indices. If the third and
+        fourth indices are identical, the face is a triangle. If True, every
+        face has 3 indices and quads are split into two triangles
+    Returns:
+      array.array('i') of vertex indices
+    """
+    mesh = rhutil.coercemesh(object_id, True)
+    faces = mesh.Faces
+    if hasattr(faces, "ToIntArray"): return array.array("i", faces.ToIntArray(triangles))
+    values = __facevalues(faces, triangles)
+    rc = array.array("i")
+    for i in xrange(faces.Count): rc.extend(values(i))
+    return rc
+
+
+def MeshFaceCenterBuffer(mesh_id):
+    """Returns the center of each face of a mesh object as one flat array
+    Parameters:
+      mesh_id = identifier of a mesh object
+    Returns:
+      array.array('d') with the x,y,z values of the face centers
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    faces = mesh.Faces
+    rc = array.array("d", [0.0]) * (faces.Count*3)
+    for i in xrange(faces.Count):
+        center = faces.GetFaceCenter(i)
+        rc[i*3], rc[i*3+1], rc[i*3+2] = center.X, center.Y, center.Z
+    return rc
+
+
 def MeshFaceCenters(mesh_id):
     """Returns the center of each face of the mesh object
     Parameters:
@@ -411,6 +942,21 @@ def MeshFaceCount(object_id):
     return mesh.Faces.Count
 
 
+def MeshFaceNormalBuffer(mesh_id, double_precision=False):
+    """Returns the face unit normal for each face of a mesh object as one flat
+    array
+    Parameters:
+      mesh_id = identifier of a mesh object
+      double_precision[opt] = return 64 bit instead of 32 bit floating point values
+    Returns:
+      array.array('f') or array.array('d') with the x,y,z values of the normals
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    if mesh.FaceNormals.Count != mesh.Faces.Count:
+        mesh.FaceNormals.ComputeFaceNormals()
+    return __floatbuffer(mesh.FaceNormals, double_precision)
+
+
 def MeshFaceNormals(mesh_id):
     """Returns the face unit normal for each face of a mesh object
     Paramters:
@@ -516,6 +1062,43 @@ def MeshHasVertexNormals(object_id):
     return mesh.Normals.Count>0
 
 
+def MeshImport(filename, file_type=None, chunk_size=65536):
+    """Reads a mesh from a STL, PLY or OBJ file and adds it to the document
+    without going through Rhino's file importers. The file is read in chunks
+    that are appended to the mesh one at a time. STL and PLY files may be
+    binary or ASCII. Vertex normals and vertex colors are read from PLY and
+    OBJ files, the vertices of STL triangles are welded
+    Parameters:
+      filename = name of the file to read
+      file_type[opt] = "stl", "ply" or "obj". If omitted, the type is taken
+        from the file name extension
+      chunk_size[opt] = number of vertices or faces read at a time
+    Returns:
+      identifier of the new mesh object if successful
+      None if the file has no vertices
+    """
+    file_type = __meshfiletype(filename, file_type)
+    mesh = Rhino.Geometry.Mesh()
+    file = open(filename, "rb")
+    try:
+        if file_type=="stl": __readstl(file, mesh, chunk_size)
+        elif file_type=="ply": __readply(file, mesh, chunk_size)
+        else: __readobj(file, mesh, chunk_size)
+    finally:
+        file.close()
+    count = mesh.Vertices.Count
+    if not count: return None
+    if mesh.VertexColors.Count!=count: mesh.VertexColors.Clear()
+    if mesh.Normals.Count!=count:
+        mesh.Normals.Clear()
+        mesh.Normals.ComputeNormals()
+    mesh.Compact()
+    rc = scriptcontext.doc.Objects.AddMesh(mesh)
+    if rc==System.Guid.Empty: raise Exception("unable to add mesh to document")
+    rhutil.__redraw()
+    return rc
+
+
 def MeshMeshIntersection(mesh1, mesh2, tolerance=None):
     """Calculates the intersections of a mesh object with another mesh object
     Parameters:
@@ -566,7 +1149,7 @@ def MeshOffset(mesh_id, distance):
     if offsetmesh is None: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddMesh(offsetmesh)
     if rc==System.Guid.Empty: raise Exception("unable to add mesh to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -590,7 +1173,7 @@ def MeshOutline(object_ids, view=None):
         for polyline in polylines:
             id = scriptcontext.doc.Objects.AddPolyline(polyline)
             rc.append(id)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -617,7 +1200,7 @@ def MeshQuadsToTriangles(object_id):
         if rc:
             id = rhutil.coerceguid(object_id, True)
             scriptcontext.doc.Objects.Replace(id, mesh)
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     return rc
 
 
@@ -639,7 +1222,7 @@ def MeshToNurb(object_id, trimmed_triangles=True, delete_input=False):
     attr = rhobj.Attributes
     ids = [scriptcontext.doc.Objects.AddBrep(brep, attr) for brep in breps]
     if delete_input: scriptcontext.doc.Objects.Delete(rhobj, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return ids
 
 
@@ -652,6 +1235,18 @@ def MeshTriangleCount(object_id):
     return mesh.Faces.TriangleCount
 
 
+def MeshVertexBuffer(object_id, double_precision=False):
+    """Returns the vertices of a mesh object as one flat array
+    Parameters:
+      object_id = identifier of a mesh object
+      double_precision[opt] = return 64 bit instead of 32 bit floating point values
+    Returns:
+      array.array('f') or array.array('d') with the x,y,z values of the vertices
+    """
+    mesh = rhutil.coercemesh(object_id, True)
+    return __floatbuffer(mesh.Vertices, double_precision)
+
+
 def MeshVertexColors(mesh_id, colors=0):
     """Returns of modifies vertex colors of a mesh
     Parameters:
@@ -677,7 +1272,7 @@ def MeshVertexColors(mesh_id, colors=0):
         for c in colors: mesh.VertexColors.Add(c)
         id = rhutil.coerceguid(mesh_id, True)
         scriptcontext.doc.Objects.Replace(id, mesh)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -703,6 +1298,20 @@ def MeshVertexFaces(mesh_id, vertex_index):
     return mesh.Vertices.GetVertexFaces(vertex_index)
 
 
+def MeshVertexNormalBuffer(mesh_id, double_precision=False):
+    """Returns the vertex unit normal for each vertex of a mesh object as one
+    flat array
+    Parameters:
+      mesh_id = identifier of a mesh object
+      double_precision[opt] = return 64 bit instead of 32 bit floating point values
+    Returns:
+      array.array('f') or array.array('d') with the x,y,z values of the normals,
+      (empty array if no normals exist)
+    """
+    mesh = rhutil.coercemesh(mesh_id, True)
+    return __floatbuffer(mesh.Normals, double_precision)
+
+
 def MeshVertexNormals(mesh_id):
     """Returns the vertex unit normal for each vertex of a mesh
     Parameters:
@@ -792,7 +1401,7 @@ def PullCurveToMesh(mesh_id, curve_id):
     if not polyline: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddCurve(polyline)
     if rc==System.Guid.Empty: raise Exception("unable to add polyline to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -810,7 +1419,7 @@ def SplitDisjointMesh(object_id, delete_input=False):
     if rc and delete_input:
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -826,5 +1435,5 @@ def UnifyMeshNormals(object_id):
     if rc>0:
         id = rhutil.coerceguid(object_id, True)
         scriptcontext.doc.Objects.Replace(id, mesh)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
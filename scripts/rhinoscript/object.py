@@ -3,6 +3,11 @@ import Rhino
 import utility as rhutil
 import System.Guid, System.Enum
 from layer import __getlayer
+import array
+import csv
+import itertools
+import json
+import sys
 
 
 def CopyObject(object_id, translation=None):
@@ -44,7 +49,7 @@ def DeleteObject(object_id):
     """
     object_id = rhutil.coerceguid(object_id, True)
     rc = scriptcontext.doc.Objects.Delete(object_id, True)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -61,7 +66,7 @@ def DeleteObjects(object_ids):
     for id in object_ids:
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.Delete(id, True): rc+=1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -79,6 +84,93 @@ def FlashObject(object_ids, style=True):
     if rhobjs: scriptcontext.doc.Views.FlashObjects(rhobjs, style)
 
 
+def __attributecolumn(name):
+    """Returns (getter(rhino object, doc), converter(value, doc),
+    setter(attributes, converted value)) for an attribute name accepted by
+    GetObjectAttributes and SetObjectAttributes
+    """
+    sources = Rhino.DocObjects
+    def sourcecolumn(attribute, enum):
+        convert = lambda value, doc: System.Enum.ToObject(enum, value)
+        return (lambda rhobj, doc: int(getattr(rhobj.Attributes, attribute)), convert,
+                lambda attr, value: setattr(attr, attribute, value))
+    if name=="name":
+        return (lambda rhobj, doc: rhobj.Attributes.Name, lambda value, doc: value,
+                lambda attr, value: setattr(attr, "Name", value))
+    if name=="layer":
+        def setlayer(attr, value): attr.LayerIndex = value
+        return (lambda rhobj, doc: doc.Layers[rhobj.Attributes.LayerIndex].Name,
+                lambda value, doc: __getlayer(value, True).LayerIndex, setlayer)
+    if name=="color":
+        def setcolor(attr, value):
+            attr.ObjectColor = value
+            attr.ColorSource = sources.ObjectColorSource.ColorFromObject
+        return (lambda rhobj, doc: rhobj.Attributes.DrawColor(doc),
+                lambda value, doc: rhutil.coercecolor(value, True), setcolor)
+    if name=="colorsource": return sourcecolumn("ColorSource", sources.ObjectColorSource)
+    if name=="linetype":
+        def findlinetype(value, doc):
+            index = doc.Linetypes.Find(value, True)
+            if index<0: raise ValueError("%s does not exist in LineTypes table"%value)
+            return index
+        def setlinetype(attr, value):
+            attr.LinetypeIndex = value
+            attr.LinetypeSource = sources.ObjectLinetypeSource.LinetypeFromObject
+        return (lambda rhobj, doc: doc.Linetypes[doc.Linetypes.LinetypeIndexForObject(rhobj)].Name,
+                findlinetype, setlinetype)
+    if name=="linetypesource": return sourcecolumn("LinetypeSource", sources.ObjectLinetypeSource)
+    if name=="materialsource": return sourcecolumn("MaterialSource", sources.ObjectMaterialSource)
+    if name=="printcolor":
+        def setprintcolor(attr, value):
+            attr.PlotColor = value
+            attr.PlotColorSource = sources.ObjectPlotColorSource.PlotColorFromObject
+        return (lambda rhobj, doc: rhobj.Attributes.PlotColor,
+                lambda value, doc: rhutil.coercecolor(value, True), setprintcolor)
+    if name=="printcolorsource": return sourcecolumn("PlotColorSource", sources.ObjectPlotColorSource)
+    if name=="printwidth":
+        def setprintwidth(attr, value):
+            attr.PlotWeight = value
+            attr.PlotWeightSource = sources.ObjectPlotWeightSource.PlotWeightFromObject
+        return (lambda rhobj, doc: rhobj.Attributes.PlotWeight,
+                lambda value, doc: float(value), setprintwidth)
+    if name=="printwidthsource": return sourcecolumn("PlotWeightSource", sources.ObjectPlotWeightSource)
+    raise ValueError("%s is not a supported object attribute"%name)
+
+
+def __findobjects(object_ids):
+    "rhino objects for a list of identifiers, raising if any of them is missing"
+    rc = []
+    for id in object_ids:
+        rhobj = rhutil.__findobject(rhutil.coerceguid(id, True))[0]
+        if rhobj is None: raise ValueError("%s does not exist in ObjectTable"%id)
+        rc.append(rhobj)
+    return rc
+
+
+def GetObjectAttributes(object_ids, attributes=("name", "layer", "color")):
+    """Returns attributes of many objects as columns, one list per attribute
+    Parameters:
+      object_ids = identifiers of the objects
+      attributes[opt] = names of the attributes to return. Supported names are
+        name, layer, color, colorsource, linetype, linetypesource,
+        materialsource, printcolor, printcolorsource, printwidth and
+        printwidthsource. The values are the ones returned by ObjectName,
+        ObjectLayer, ObjectColor and so on
+    Returns:
+      dictionary of attribute name to list of values, in the order of object_ids
+    Example:
+      import rhinoscriptsyntax as rs
+      columns = rs.GetObjectAttributes(rs.AllObjects(), ["name", "printwidth"])
+    """
+    doc = scriptcontext.doc
+    rhobjs = __findobjects(object_ids)
+    rc = {}
+    for name in attributes:
+        getter = __attributecolumn(name)[0]
+        rc[name] = [getter(rhobj, doc) for rhobj in rhobjs]
+    return rc
+
+
 def HideObject(object_id):
     """Hides a single object
     Parameters:
@@ -102,7 +194,7 @@ def HideObjects(object_ids):
     for id in object_ids:
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.Hide(id, False): rc += 1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -301,7 +393,7 @@ def LockObjects(object_ids):
     for id in object_ids:
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.Lock(id, False): rc += 1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -325,7 +417,7 @@ def MatchObjectAttributes(target_ids, source_id=None):
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.ModifyAttributes(id, source_attr, True):
             rc += 1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -433,7 +525,7 @@ def ObjectColor(object_ids, color=None):
     attr.ObjectColor = color
     attr.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
     scriptcontext.doc.Objects.ModifyAttributes( rhino_object, attr, True )
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -458,7 +550,7 @@ def ObjectColorSource(object_ids, source=None):
         if source is not None:
             rhobj.Attributes.ColorSource = System.Enum.ToObject(Rhino.DocObjects.ObjectColorSource, source)
             rhobj.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
     else:
         rc = 0
@@ -468,7 +560,7 @@ def ObjectColorSource(object_ids, source=None):
             rhobj.Attributes.ColorSource = source
             rhobj.CommitChanges()
             rc += 1
-        if rc: scriptcontext.doc.Views.Redraw()
+        if rc: rhutil.__redraw()
         return rc
 
 
@@ -512,7 +604,7 @@ def ObjectLayer(object_id, layer=None):
             obj = rhutil.coercerhinoobject(id, True, True)
             obj.Attributes.LayerIndex = index
             obj.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return len(object_id)
     obj = rhutil.coercerhinoobject(object_id, True, True)
     if obj is None: return scriptcontext.errorhandler()
@@ -523,7 +615,7 @@ def ObjectLayer(object_id, layer=None):
         index = layer.LayerIndex
         obj.Attributes.LayerIndex = index
         obj.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -553,7 +645,7 @@ def ObjectLayout(object_id, layout=None, return_name=True):
             rhobj.Attributes.Space = Rhino.DocObjects.ActiveSpace.ModelSpace
             rhobj.Attributes.ViewportId = System.Guid.Empty
             rhobj.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     else:
         if layout:
             layout = scriptcontext.doc.Views.Find(layout, False)
@@ -561,7 +653,7 @@ def ObjectLayout(object_id, layout=None, return_name=True):
                 rhobj.Attributes.ViewportId = layout.MainViewport.Id
                 rhobj.Attributes.Space = Rhino.DocObjects.ActiveSpace.PageSpace
                 rhobj.CommitChanges()
-                scriptcontext.doc.Views.Redraw()
+                rhutil.__redraw()
     return rc
 
 
@@ -586,7 +678,7 @@ def ObjectLinetype(object_ids, linetype=None):
             rhino_object.Attributes.LinetypeSource = Rhino.DocObjects.ObjectLinetypeSource.LinetypeFromObject
             rhino_object.Attributes.LinetypeIndex = newindex
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return scriptcontext.doc.Linetypes[oldindex].Name
 
     newindex = scriptcontext.doc.Linetypes.Find(linetype, True)
@@ -596,7 +688,7 @@ def ObjectLinetype(object_ids, linetype=None):
         rhino_object.Attributes.LinetypeSource = Rhino.DocObjects.ObjectLinetypeSource.LinetypeFromObject
         rhino_object.Attributes.LinetypeIndex = newindex
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
@@ -622,14 +714,14 @@ def ObjectLinetypeSource(object_ids, source=None):
             source = System.Enum.ToObject(Rhino.DocObjects.ObjectLinetypeSource, source)
             rhino_object.Attributes.LinetypeSource = source
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return int(oldsource)
     source = System.Enum.ToObject(Rhino.DocObjects.ObjectLinetypeSource, source)
     for id in object_ids:
         rhino_object = rhutil.coercerhinoobject(id, True, True)
         rhino_object.Attributes.LinetypeSource = source
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
@@ -739,7 +831,7 @@ def ObjectPrintColor(object_ids, color=None):
             rhino_object.Attributes.PlotColorSource = Rhino.DocObjects.ObjectPlotColorSource.PlotColorFromObject
             rhino_object.Attributes.PlotColor = rhutil.coercecolor(color, True)
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
     for id in object_ids:
         color = rhutil.coercecolor(color, True)
@@ -747,7 +839,7 @@ def ObjectPrintColor(object_ids, color=None):
         rhino_object.Attributes.PlotColorSource = Rhino.DocObjects.ObjectPlotColorSource.PlotColorFromObject
         rhino_object.Attributes.PlotColor = color
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
@@ -771,13 +863,13 @@ def ObjectPrintColorSource(object_ids, source=None):
         if source is not None:
             rhino_object.Attributes.PlotColorSource = System.Enum.ToObject(Rhino.DocObjects.ObjectPlotColorSource, source)
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
     for id in object_ids:
         rhino_object = rhutil.coercerhinoobject(id, True, True)
         rhino_object.Attributes.PlotColorSource = System.Enum.ToObject(Rhino.DocObjects.ObjectPlotColorSource, source)
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
@@ -801,14 +893,14 @@ def ObjectPrintWidth(object_ids, width=None):
             rhino_object.Attributes.PlotWeightSource = Rhino.DocObjects.ObjectPlotWeightSource.PlotWeightFromObject
             rhino_object.Attributes.PlotWeight = width
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
     for id in object_ids:
         rhino_object = rhutil.coercerhinoobject(id, True, True)
         rhino_object.Attributes.PlotWeightSource = Rhino.DocObjects.ObjectPlotWeightSource.PlotWeightFromObject
         rhino_object.Attributes.PlotWeight = width
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
@@ -832,16 +924,144 @@ def ObjectPrintWidthSource(object_ids, source=None):
         if source is not None:
             rhino_object.Attributes.PlotWeightSource = System.Enum.ToObject(Rhino.DocObjects.ObjectPlotWeightSource, source)
             rhino_object.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
         return rc
     for id in object_ids:
         rhino_object = rhutil.coercerhinoobject(id, True, True)
         rhino_object.Attributes.PlotWeightSource = System.Enum.ToObject(Rhino.DocObjects.ObjectPlotWeightSource, source)
         rhino_object.CommitChanges()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return len(object_ids)
 
 
+def __snapshotcolumns(rhobjs, fields):
+    """Walks a sequence of rhino objects once and returns a list of
+    (column name, values) for the snapshot fields. Numeric columns are arrays
+    """
+    doc = scriptcontext.doc
+    collectors = [] # (field, function(rhobj) -> value or tuple of values)
+    for field in fields:
+        if field=="id": collectors.append((field, lambda rhobj: str(rhobj.Id)))
+        elif field=="type":
+            def objecttype(rhobj):
+                geom = rhobj.Geometry
+                if isinstance(geom, Rhino.Geometry.Brep) and geom.Faces.Count==1: return 8
+                return int(geom.ObjectType)
+            collectors.append((field, objecttype))
+        elif field=="bbox":
+            def boundingbox(rhobj):
+                box = rhobj.Geometry.GetBoundingBox(True)
+                return box.Min.X, box.Min.Y, box.Min.Z, box.Max.X, box.Max.Y, box.Max.Z
+            collectors.append((field, boundingbox))
+        elif field=="usertext":
+            def usertext(rhobj):
+                attr = rhobj.Attributes
+                if not attr.UserStringCount: return {}
+                strings = attr.GetUserStrings()
+                return dict((strings.GetKey(i), strings.Get(strings.GetKey(i))) for i in xrange(strings.Count))
+            collectors.append((field, usertext))
+        elif field.startswith("usertext:"):
+            key = field[len("usertext:"):]
+            collectors.append((field, lambda rhobj, key=key: rhobj.Attributes.GetUserString(key)))
+        else:
+            getter = __attributecolumn(field)[0]
+            if field in ("color", "printcolor"):
+                collectors.append((field, lambda rhobj, getter=getter: getter(rhobj, doc).ToArgb()))
+            else:
+                collectors.append((field, lambda rhobj, getter=getter: getter(rhobj, doc)))
+    values = [[] for field in fields]
+    for rhobj in rhobjs:
+        for column, (field, collect) in itertools.izip(values, collectors):
+            column.append(collect(rhobj))
+    rc = []
+    for field, column in zip(fields, values):
+        if field=="bbox":
+            for i, suffix in enumerate(("minx", "miny", "minz", "maxx", "maxy", "maxz")):
+                rc.append(("bbox."+suffix, array.array("d", (box[i] for box in column))))
+        elif field=="usertext":
+            keys = sorted(set(key for strings in column for key in strings))
+            for key in keys: rc.append(("usertext:"+key, [strings.get(key) for strings in column]))
+        elif field=="printwidth":
+            rc.append((field, array.array("d", column)))
+        elif field=="type" or field in ("color", "printcolor") or field.endswith("source"):
+            rc.append((field, array.array("i", column)))
+        else:
+            rc.append((field, column))
+    return rc
+
+
+__snapshot_magic = "RHSNAP1\n"
+
+
+def __writesnapshot(filename, columns, count):
+    "writes snapshot columns to a csv file or to the binary snapshot format"
+    if filename.lower().endswith(".csv"):
+        with open(filename, "wb") as f:
+            writer = csv.writer(f)
+            writer.writerow([name for name, values in columns])
+            for row in itertools.izip(*[values for name, values in columns]):
+                writer.writerow(["" if value is None else value for value in row])
+        return
+    header = {"count": count, "byteorder": sys.byteorder, "columns": []}
+    for name, values in columns:
+        typecode = values.typecode if isinstance(values, array.array) else "s"
+        header["columns"].append([name, typecode])
+    with open(filename, "wb") as f:
+        f.write(__snapshot_magic)
+        f.write(json.dumps(header) + "\n")
+        for name, values in columns:
+            if isinstance(values, array.array):
+                f.write(values.tostring())
+                continue
+            # strings: utf-8 byte lengths (-1 for None) followed by the bytes
+            encoded = [None if value is None else unicode(value).encode("utf-8") for value in values]
+            lengths = array.array("i", (-1 if value is None else len(value) for value in encoded))
+            f.write(lengths.tostring())
+            f.write("".join(value for value in encoded if value))
+
+
+def ObjectTableSnapshot(object_ids=None, fields=None, filename=None):
+    """Returns attributes of many objects as columns, walking the objects once.
+    Intended for reports and analytics over large documents
+    Parameters:
+      object_ids[opt] = identifiers of the objects. If omitted, all normal,
+        locked and hidden objects in the document are included
+      fields[opt] = list of fields to include. If omitted, id, type, name,
+        layer, color, bbox and usertext are included. Supported fields:
+          id = object identifier as a string
+          type = object type, see ObjectType
+          bbox = world bounding box as the six columns bbox.minx, bbox.miny,
+            bbox.minz, bbox.maxx, bbox.maxy and bbox.maxz
+          usertext = one usertext:<key> column for every user text key found
+          usertext:<key> = the value of one user text key
+          name, layer, color, colorsource, linetype, linetypesource,
+          materialsource, printcolor, printcolorsource, printwidth and
+            printwidthsource, see GetObjectAttributes. Colors are ARGB integers
+      filename[opt] = also write the snapshot to this file. Files ending in
+        .csv are written as CSV, other files in a compact binary format that
+        ReadObjectTableSnapshot reads back
+    Returns:
+      dictionary of column name to list of values, in object order. Numeric
+      columns are array.array objects
+    Example:
+      import rhinoscriptsyntax as rs
+      snapshot = rs.ObjectTableSnapshot(fields=["id", "layer", "bbox"], filename="objects.csv")
+    """
+    if fields is None: fields = ["id", "type", "name", "layer", "color", "bbox", "usertext"]
+    if object_ids is None:
+        settings = Rhino.DocObjects.ObjectEnumeratorSettings()
+        settings.NormalObjects = True
+        settings.LockedObjects = True
+        settings.HiddenObjects = True
+        rhobjs = scriptcontext.doc.Objects.GetObjectList(settings)
+    else:
+        rhobjs = __findobjects(object_ids)
+    columns = __snapshotcolumns(rhobjs, list(fields))
+    count = len(columns[0][1]) if columns else 0
+    if filename: __writesnapshot(filename, columns, count)
+    return dict(columns)
+
+
 def ObjectType(object_id):
     """Returns the object type
     Parameters:
@@ -904,7 +1124,36 @@ def OrientObject(object_id, reference, target, flags=0):
         xform_final = xform_move * xform_scale * xform_rotate
     rc = scriptcontext.doc.Objects.Transform(object_id, xform_final, not copy)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
+    return rc
+
+
+def ReadObjectTableSnapshot(filename):
+    """Reads a snapshot written by ObjectTableSnapshot in the binary format
+    Parameters:
+      filename = name of the file
+    Returns:
+      dictionary of column name to list of values
+    """
+    with open(filename, "rb") as f:
+        if f.read(len(__snapshot_magic))!=__snapshot_magic:
+            raise ValueError("%s is not an object table snapshot"%filename)
+        header = json.loads(f.readline())
+        count = header["count"]
+        swap = header["byteorder"]!=sys.byteorder
+        rc = {}
+        for name, typecode in header["columns"]:
+            values = array.array("i" if typecode=="s" else str(typecode))
+            values.fromstring(f.read(values.itemsize*count))
+            if swap: values.byteswap()
+            if typecode!="s":
+                rc[name] = values
+                continue
+            strings = []
+            for length in values:
+                if length<0: strings.append(None)
+                else: strings.append(f.read(length).decode("utf-8"))
+            rc[name] = strings
     return rc
 
 
@@ -995,7 +1244,7 @@ def SelectObject(object_id):
     """
     rhobj = rhutil.coercerhinoobject(object_id, True, True)
     rhobj.Select(True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return True
 
 
@@ -1014,6 +1263,56 @@ def SelectObjects( object_ids):
     return rc
 
 
+def SetObjectAttributes(object_ids, **attributes):
+    """Modifies attributes of many objects, each object getting its own value.
+    All identifiers and values are validated before any object is modified,
+    each object's attributes are changed with a single ModifyAttributes call,
+    the whole set is recorded as a single undo step and views are redrawn once
+    Parameters:
+      object_ids = identifiers of the objects
+      attributes = keyword arguments of attribute name and a list of values,
+        one for each object. See GetObjectAttributes for the supported names.
+        Colors and print colors are set by object, layers and linetypes are
+        given by name
+    Returns:
+      number of objects modified
+    Example:
+      import rhinoscriptsyntax as rs
+      ids = rs.AllObjects()
+      colors = [(i%256, 0, 0) for i in range(len(ids))]
+      rs.SetObjectAttributes(ids, color=colors, name=["part%d"%i for i in range(len(ids))])
+    """
+    doc = scriptcontext.doc
+    rhobjs = __findobjects(object_ids)
+    columns = []
+    for name, values in attributes.items():
+        values = list(values)
+        if len(values)!=len(rhobjs):
+            raise ValueError("%s must have one value for each object"%name)
+        getter, convert, setter = __attributecolumn(name)
+        converted = {}
+        def convertvalue(value):
+            # values repeat a lot (layer names, colors), convert each only once
+            try: hash(value)
+            except TypeError: return convert(value, doc)
+            if value not in converted: converted[value] = convert(value, doc)
+            return converted[value]
+        columns.append((setter, [convertvalue(value) for value in values]))
+    if not columns or not rhobjs: return 0
+    rc = 0
+    undo_record = 0
+    if not doc.UndoRecordingIsActive: undo_record = doc.BeginUndoRecord("SetObjectAttributes")
+    try:
+        for i, rhobj in enumerate(rhobjs):
+            attr = rhobj.Attributes.Duplicate()
+            for setter, values in columns: setter(attr, values[i])
+            if doc.Objects.ModifyAttributes(rhobj, attr, True): rc += 1
+    finally:
+        if undo_record: doc.EndUndoRecord(undo_record)
+    if rc: rhutil.__redraw()
+    return rc
+
+
 def ShowObject(object_id):
     """Shows a previously hidden object. Hidden objects are not visible, cannot
     be snapped to and cannot be selected
@@ -1039,7 +1338,7 @@ def ShowObjects(object_ids):
     for id in object_ids:
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.Show(id, False): rc += 1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -1069,16 +1368,58 @@ def TransformObjects(object_ids, matrix, copy=False):
     Returns:
       List of ids identifying the newly transformed objects
     """
-    xform = rhutil.coercexform(matrix, True)
     id = rhutil.coerceguid(object_ids, False)
     if id: object_ids = [id]
+    object_ids = [rhutil.coerceguid(id, True) for id in object_ids]
+    return TransformObjectsEx(object_ids, matrix, copy)[0]
+
+
+def TransformObjectsEx(object_ids, matrices, copy=False):
+    """Moves, scales, or rotates a list of objects in bulk. All identifiers are
+    validated before any object is transformed, the whole set is recorded as a
+    single undo step and views are redrawn once.
+    Parameters:
+      object_ids = List of object identifiers.
+      matrices = A transformation matrix applied to every object, or a list
+        with one transformation matrix for each object.
+      copy[opt] = Copy the objects
+    Returns:
+      Tuple of two lists
+        element 0 = ids identifying the newly transformed objects
+        element 1 = ids of the objects that could not be transformed
+    """
+    id = rhutil.coerceguid(object_ids, False)
+    if id: object_ids = [id]
+    per_object = False
+    if type(matrices) in (list, tuple) and matrices:
+        first = matrices[0]
+        per_object = type(first) is Rhino.Geometry.Transform or \
+            (type(first) in (list, tuple) and first and type(first[0]) in (list, tuple))
+    if per_object:
+        if len(matrices)!=len(object_ids):
+            raise ValueError("number of matrices must match the number of objects")
+        xforms = [rhutil.coercexform(matrix, True) for matrix in matrices]
+    else:
+        xforms = [rhutil.coercexform(matrices, True)] * len(object_ids)
+    objects, failed = [], []
+    for object_id, xform in zip(object_ids, xforms):
+        rhobj = rhutil.coercerhinoobject(object_id)
+        if rhobj: objects.append((rhobj, xform))
+        else: failed.append(object_id)
     rc = []
-    for object_id in object_ids:
-        object_id = rhutil.coerceguid(object_id, True)
-        id = scriptcontext.doc.Objects.Transform(object_id, xform, not copy)
-        if id!=System.Guid.Empty: rc.append(id)
-    if rc: scriptcontext.doc.Views.Redraw()
-    return rc
+    if objects:
+        doc = scriptcontext.doc
+        undo_record = 0
+        if not doc.UndoRecordingIsActive: undo_record = doc.BeginUndoRecord("TransformObjects")
+        try:
+            for rhobj, xform in objects:
+                id = doc.Objects.Transform(rhobj, xform, not copy)
+                if id!=System.Guid.Empty: rc.append(id)
+                else: failed.append(rhobj.Id)
+        finally:
+            if undo_record: doc.EndUndoRecord(undo_record)
+        if rc: rhutil.__redraw()
+    return rc, failed
 
 
 def UnlockObject(object_id):
@@ -1106,7 +1447,7 @@ def UnlockObjects(object_ids):
     for id in object_ids:
         id = rhutil.coerceguid(id, True)
         if scriptcontext.doc.Objects.Unlock(id, False): rc += 1
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -1133,5 +1474,5 @@ def UnselectObjects(object_ids):
     for id in object_ids:
         obj = rhutil.coercerhinoobject(id, True, True)
         obj.Select(False)
-    if count: scriptcontext.doc.Views.Redraw()
+    if count: rhutil.__redraw()
     return count
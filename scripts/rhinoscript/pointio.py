@@ -0,0 +1,368 @@
+import scriptcontext
+import utility as rhutil
+import Rhino
+import System.Guid
+import array
+import itertools
+import os
+import struct
+import sys
+
+
+__file_types = {".xyz":"xyz", ".txt":"xyz", ".asc":"xyz", ".csv":"csv",
+                ".pts":"pts", ".ply":"ply"}
+__ply_types = {"char":"b", "int8":"b", "uchar":"B", "uint8":"B",
+               "short":"h", "int16":"h", "ushort":"H", "uint16":"H",
+               "int":"i", "int32":"i", "uint":"I", "uint32":"I",
+               "float":"f", "float32":"f", "double":"d", "float64":"d"}
+
+
+def __filetype(filename, file_type):
+    "file type from the file_type argument or the file name extension"
+    if file_type: file_type = file_type.lower()
+    else: file_type = __file_types.get(os.path.splitext(filename)[1].lower(), "xyz")
+    if file_type not in ("xyz", "csv", "pts", "ply"):
+        raise ValueError("unsupported point file type %s"%file_type)
+    return file_type
+
+
+def __readtext(file, chunk_size):
+    """Yields coordinate arrays of the x,y,z values at the start of each line
+    of a text file. Values may be separated by white space or commas and be
+    enclosed in parentheses. Lines that do not start with three numbers, like
+    headers, comments or the point count of a PTS file, are skipped
+    """
+    while True:
+        lines = list(itertools.islice(file, chunk_size))
+        if not lines: return
+        coords = array.array("d")
+        for line in lines:
+            line = line.strip().strip("()")
+            if "," in line: line = line.replace(",", " ")
+            items = line.split(None, 3)
+            if len(items)<3: continue
+            try:
+                x, y, z = float(items[0]), float(items[1]), float(items[2])
+            except ValueError:
+                continue
+            coords.append(x)
+            coords.append(y)
+            coords.append(z)
+        if coords: yield coords
+
+
+def __plyheader(file):
+    """Reads the header of a PLY file. Returns a tuple of (format, list of
+    elements). Elements are tuples of (name, count, list of properties) and
+    properties are tuples of (name, typecode, typecode of the length of a
+    list property or None)
+    """
+    if file.readline().strip()!="ply": raise ValueError("not a PLY file")
+    format = None
+    elements = []
+    while True:
+        line = file.readline()
+        if not line: raise ValueError("PLY header is not terminated")
+        items = line.split()
+        if not items or items[0] in ("comment", "obj_info"): continue
+        if items[0]=="end_header": break
+        if items[0]=="format": format = items[1]
+        elif items[0]=="element": elements.append((items[1], int(items[2]), []))
+        elif items[0]=="property" and elements:
+            if items[1]=="list":
+                property = items[4], __ply_types[items[3]], __ply_types[items[2]]
+            else:
+                property = items[2], __ply_types[items[1]], None
+            elements[-1][2].append(property)
+    if format not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError("unsupported PLY format %s"%format)
+    return format, elements
+
+
+def __plyelement(file, format, count, properties, chunk_size):
+    """Reads the records of a PLY element in chunks. Yields a list with a
+    column of values for each property. The values of list properties are
+    tuples
+    """
+    if format=="ascii":
+        converters = [float if typecode in "fd" else int for name, typecode, length in properties]
+        while count>0:
+            n = min(count, chunk_size)
+            records = []
+            for i in xrange(n):
+                items = file.readline().split()
+                record = []
+                k = 0
+                try:
+                    for (name, typecode, length), convert in zip(properties, converters):
+                        if length:
+                            end = k+1+int(items[k])
+                            record.append(tuple([convert(item) for item in items[k+1:end]]))
+                            k = end
+                        else:
+                            record.append(convert(items[k]))
+                            k += 1
+                except IndexError:
+                    k = len(items)+1
+                if k>len(items): raise ValueError("PLY file is truncated")
+                records.append(record)
+            count -= n
+            yield zip(*records)
+        return
+    endian = "<" if format=="binary_little_endian" else ">"
+    typecodes = set(typecode for name, typecode, length in properties)
+    if len(typecodes)==1 and not any(length for name, typecode, length in properties):
+        # every property is a number of the same type, so whole records are
+        # read straight into an array without unpacking single values
+        typecode = typecodes.pop()
+        stride = len(properties)
+        while count>0:
+            n = min(count, chunk_size)
+            values = array.array(typecode)
+            try:
+                values.fromfile(file, n*stride)
+            except EOFError:
+                raise ValueError("PLY file is truncated")
+            if (endian=="<")!=(sys.byteorder=="little"): values.byteswap()
+            count -= n
+            yield [values[k::stride] for k in xrange(stride)]
+        return
+    readers = []
+    for name, typecode, length in properties:
+        if length: readers.append((struct.Struct(endian+length), typecode))
+        else: readers.append((struct.Struct(endian+typecode), None))
+    lists = {}
+    data = ""
+    offset = 0
+    while count>0:
+        n = min(count, chunk_size)
+        records = []
+        for i in xrange(n):
+            record = []
+            for reader, typecode in readers:
+                if len(data)-offset<reader.size:
+                    data = data[offset:] + file.read(65536)
+                    offset = 0
+                    if len(data)<reader.size: raise ValueError("PLY file is truncated")
+                value = reader.unpack_from(data, offset)[0]
+                offset += reader.size
+                if typecode:
+                    items = lists.get((value, typecode))
+                    if items is None:
+                        items = lists[value, typecode] = struct.Struct("%s%d%s"%(endian, value, typecode))
+                    if len(data)-offset<items.size:
+                        data = data[offset:] + file.read(max(65536, items.size))
+                        offset = 0
+                        if len(data)<items.size: raise ValueError("PLY file is truncated")
+                    value = items.unpack_from(data, offset)
+                    offset += items.size
+                record.append(value)
+            records.append(record)
+        count -= n
+        if not count and offset<len(data):
+            # give back what was read past the element to the next element
+            file.seek(offset-len(data), 1)
+        yield zip(*records)
+
+
+def __readply(file, chunk_size):
+    "Yields coordinate arrays of the vertices of a PLY file"
+    format, elements = __plyheader(file)
+    if not elements or elements[0][0]!="vertex":
+        raise ValueError("PLY vertex element must be the first element")
+    name, count, properties = elements[0]
+    names = [name for name, typecode, length in properties]
+    try:
+        ix, iy, iz = names.index("x"), names.index("y"), names.index("z")
+    except ValueError:
+        raise ValueError("PLY vertex element has no x, y and z properties")
+    if format!="ascii" and properties==[("x", "d", None), ("y", "d", None), ("z", "d", None)]:
+        # x,y,z doubles are already in the layout of a coordinate array, so
+        # they are read into it without copying
+        swap = (format=="binary_little_endian")!=(sys.byteorder=="little")
+        while count>0:
+            n = min(count, chunk_size)
+            coords = array.array("d")
+            try:
+                coords.fromfile(file, n*3)
+            except EOFError:
+                raise ValueError("PLY file is truncated")
+            if swap: coords.byteswap()
+            count -= n
+            yield coords
+        return
+    for columns in __plyelement(file, format, count, properties, chunk_size):
+        x, y, z = columns[ix], columns[iy], columns[iz]
+        coords = array.array("d", [0.0])*(len(x)*3)
+        coords[0::3] = array.array("d", x)
+        coords[1::3] = array.array("d", y)
+        coords[2::3] = array.array("d", z)
+        yield coords
+
+
+def ExportPoints(object_ids, filename, file_type=None, binary=True, precision=None):
+    """Writes the locations of point and point cloud objects to a point file.
+    Point clouds are written in chunks, see WritePoints
+    Parameters:
+      object_ids = identifiers of point and point cloud objects
+      filename = name of the file to create
+      file_type[opt] = "xyz", "csv", "pts" or "ply". If omitted, the type is
+        taken from the file name extension
+      binary[opt] = write PLY files in binary instead of ASCII format
+      precision[opt] = number of decimals of coordinates in text files. If
+        omitted, coordinates are written with full precision
+    Returns:
+      number of points written
+    """
+    if type(object_ids) is not list: object_ids = rhutil.coerceguidlist(object_ids)
+    def chunks():
+        chunk_size = 65536
+        for id in object_ids:
+            geometry = rhutil.coercegeometry(id, True)
+            if isinstance(geometry, Rhino.Geometry.Point):
+                location = geometry.Location
+                yield array.array("d", (location.X, location.Y, location.Z))
+            elif isinstance(geometry, Rhino.Geometry.PointCloud):
+                # read the cloud one slice at a time instead of copying all
+                # of its points with GetPoints
+                count = geometry.Count
+                for start in xrange(0, count, chunk_size):
+                    end = min(start+chunk_size, count)
+                    coords = array.array("d", [0.0])*((end-start)*3)
+                    for i in xrange(start, end):
+                        location = geometry[i].Location
+                        j = (i-start)*3
+                        coords[j], coords[j+1], coords[j+2] = location.X, location.Y, location.Z
+                    yield coords
+            else: raise ValueError("%s is not a point or point cloud object"%id)
+    return WritePoints(filename, chunks(), file_type, binary, precision)
+
+
+def ImportPoints(filename, file_type=None, point_cloud=True, chunk_size=65536):
+    """Reads a point file into the document. The file is read in chunks, see
+    ReadPoints, so only one chunk of coordinates is held in memory besides the
+    points that are added to the document
+    Parameters:
+      filename = name of the file to read
+      file_type[opt] = "xyz", "csv", "pts" or "ply". If omitted, the type is
+        taken from the file name extension
+      point_cloud[opt] = add the points as a single point cloud object. If
+        False, a point object is added for every point
+      chunk_size[opt] = number of points read at a time
+    Returns:
+      if point_cloud is True, identifier of the new point cloud object
+      if point_cloud is False, list of identifiers of the new point objects
+      None if the file has no points
+    """
+    doc = scriptcontext.doc
+    if point_cloud:
+        cloud = Rhino.Geometry.PointCloud()
+        for coords in ReadPoints(filename, file_type, chunk_size):
+            cloud.AddRange(rhutil.coerce3dpointlist(coords, True))
+        if not cloud.Count: return None
+        rc = doc.Objects.AddPointCloud(cloud)
+        if rc==System.Guid.Empty: raise Exception("unable to add point cloud to document")
+        rhutil.__redraw()
+        return rc
+    rc = []
+    undo_record = 0
+    if not doc.UndoRecordingIsActive: undo_record = doc.BeginUndoRecord("ImportPoints")
+    try:
+        for coords in ReadPoints(filename, file_type, chunk_size):
+            for point in rhutil.coerce3dpointlist(coords, True):
+                rc.append(doc.Objects.AddPoint(point))
+    finally:
+        if undo_record: doc.EndUndoRecord(undo_record)
+    if not rc: return None
+    rhutil.__redraw()
+    return rc
+
+
+def ReadPoints(filename, file_type=None, chunk_size=65536):
+    """Reads a point file one chunk at a time. Text files (xyz, csv and pts)
+    hold one point per line. Values after the x,y,z coordinates, like the
+    intensity and colors of PTS files, are ignored. PLY files may be ASCII or
+    binary, binary files whose vertex properties all have the same type are
+    read without unpacking single values
+    Parameters:
+      filename = name of the file to read
+      file_type[opt] = "xyz", "csv", "pts" or "ply". If omitted, the type is
+        taken from the file name extension
+      chunk_size[opt] = maximum number of points in each chunk
+    Returns:
+      a generator that yields array.array('d') of x,y,z coordinates
+    Example:
+      import rhinoscriptsyntax as rs
+      count = 0
+      for coords in rs.ReadPoints("scan.ply"): count += len(coords)/3
+    """
+    file_type = __filetype(filename, file_type)
+    if file_type=="ply": file = open(filename, "rb")
+    else: file = open(filename, "r")
+    try:
+        if file_type=="ply": chunks = __readply(file, chunk_size)
+        else: chunks = __readtext(file, chunk_size)
+        for coords in chunks: yield coords
+    finally:
+        file.close()
+
+
+def WritePoints(filename, points, file_type=None, binary=True, precision=None):
+    """Writes points to a point file. The points are written one chunk at a
+    time, so a generator of points or coordinate chunks, like the one that is
+    returned by ReadPoints, is never held in memory as a whole
+    Parameters:
+      filename = name of the file to create
+      points = list of 3D points, N x 3 buffer of coordinates, or an iterable
+        that yields points or chunks of points
+      file_type[opt] = "xyz", "csv", "pts" or "ply". If omitted, the type is
+        taken from the file name extension
+      binary[opt] = write PLY files in binary instead of ASCII format. Binary
+        files store the coordinates as doubles
+      precision[opt] = number of decimals of coordinates in text files. If
+        omitted, coordinates are written with full precision
+    Returns:
+      number of points written
+    Example:
+      import rhinoscriptsyntax as rs
+      rs.WritePoints("scan.ply", rs.ReadPoints("scan.xyz"))
+    """
+    file_type = __filetype(filename, file_type)
+    binary = binary and file_type=="ply"
+    if precision is None: format = "%r"
+    else: format = "%%.%df"%precision
+    if file_type=="csv": format = ",".join([format]*3)
+    else: format = " ".join([format]*3)
+    file = open(filename, "wb")
+    try:
+        # the point count goes in front of the points, so a field wide enough
+        # for any count is written first and filled in at the end
+        count_offset = None
+        if file_type=="pts":
+            count_offset = 0
+            file.write(" "*20 + "\n")
+        elif file_type=="ply":
+            file.write("ply\n")
+            file.write("format %s 1.0\n"%("binary_little_endian" if binary else "ascii"))
+            file.write("element vertex ")
+            count_offset = file.tell()
+            file.write(" "*20 + "\n")
+            for name in "xyz": file.write("property double %s\n"%name)
+            file.write("end_header\n")
+        count = 0
+        for coords in rhutil.__pointchunks(points):
+            if binary:
+                if sys.byteorder!="little":
+                    coords = array.array("d", coords)
+                    coords.byteswap()
+                coords.tofile(file)
+            else:
+                lines = [format%(coords[i], coords[i+1], coords[i+2]) for i in xrange(0, len(coords), 3)]
+                if lines: file.write("\n".join(lines) + "\n")
+            count += len(coords)/3
+        if count_offset is not None:
+            file.seek(count_offset)
+            file.write(str(count))
+    finally:
+        file.close()
+    return count
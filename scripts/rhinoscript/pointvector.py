@@ -1,4 +1,5 @@
 import utility as rhutil
+import spatialindex
 import Rhino
 import scriptcontext
 import math
@@ -67,13 +68,20 @@ def PointArrayClosestPoint(points, test_point):
     """Finds the point in a list of 3D points that is closest to a test point
     Parameters:
       points = list of points
-      test_point = the point to compare against
+      test_point = the point to compare against, or a list of points to compare
     Returns:
       index of the element in the point list that is closest to the test point
+      list of indices if test_point is a list of points
     """
+    point = rhutil.coerce3dpoint(test_point)
+    if point is None:
+        # many test points, build a spatial index once and query it in batch
+        test_points = rhutil.coerce3dpointlist(test_point, True)
+        if len(test_points)>1:
+            return spatialindex.PointIndex(points).Nearest(test_points)
+        return [PointArrayClosestPoint(points, pt) for pt in test_points]
     points = rhutil.coerce3dpointlist(points, True)
-    test_point = rhutil.coerce3dpoint(test_point, True)
-    index = Rhino.Collections.Point3dList.ClosestIndexInList(points, test_point)
+    index = Rhino.Collections.Point3dList.ClosestIndexInList(points, point)
     if index>=0: return index
 
 
@@ -93,14 +101,27 @@ def PointArrayTransform(points, xform):
 def PointClosestObject(point, object_ids):
     """Finds the object that is closest to a test point
     Parameters:
-      point = point to test
+      point = point to test, or a list of points to test
       object_id = identifiers of one or more objects
     Returns:
       (closest object_id, point on object) on success
+      list of (closest object_id, point on object) if point is a list of points
       None on failure
     """
     object_ids = rhutil.coerceguidlist(object_ids)
-    point = rhutil.coerce3dpoint(point, True)
+    test_point = rhutil.coerce3dpoint(point)
+    if test_point is None:
+        test_points = rhutil.coerce3dpointlist(point, True)
+        if len(test_points)>1:
+            # many test points, build a bounding box tree once so most of the
+            # exact closest point calculations are skipped
+            return spatialindex.ObjectIndex(object_ids).Nearest(test_points)
+        return [PointClosestObject(pt, object_ids) for pt in test_points]
+    if len(object_ids)>64:
+        # many objects, a bounding box tree skips most of the exact closest
+        # point calculations even for a single test point
+        return spatialindex.ObjectIndex(object_ids).Nearest(test_point)
+    point = test_point
     closest = None
     for id in object_ids:
         geom = rhutil.coercegeometry(id, True)
@@ -0,0 +1,248 @@
+import utility as rhutil
+import Rhino
+import array
+import itertools
+import math
+import operator
+
+# Array-at-a-time versions of the pointvector functions. Points and vectors are
+# passed as N x 3 buffers: a flat array.array('d') of x,y,z values, a numpy
+# style array of shape (N,3) or (3N,), or anything coerce3dpointarray accepts.
+# numpy style input returns numpy style output of the same shape, everything
+# else returns a flat array.array('d') that can be passed straight to AddPoints
+# or AddPointCloud
+
+
+def __isbuffer(values):
+    "numpy style arrays are used directly, without importing numpy"
+    return hasattr(values, "__array_interface__") and hasattr(values, "reshape")
+
+
+def __singlevector(vector):
+    "Returns vector as a Vector3d if it is a single point or vector, else None"
+    t = type(vector)
+    if t is Rhino.Geometry.Vector3d: return vector
+    if t is Rhino.Geometry.Point3d or t is Rhino.Geometry.Vector3f or t is Rhino.Geometry.Point3f:
+        return Rhino.Geometry.Vector3d(vector.X, vector.Y, vector.Z)
+    if (t is list or t is tuple) and len(vector)==3:
+        if type(vector[0]) in (float, int, long):
+            return Rhino.Geometry.Vector3d(vector[0], vector[1], vector[2])
+
+
+def __packed(values, count=None):
+    "values as a flat array.array('d'), optionally checking the point count"
+    values = rhutil.coerce3dpointarray(values, True)
+    if count is not None and len(values)!=count:
+        raise ValueError("point and vector arrays must have the same length")
+    return values
+
+
+def __rows(template, vectors):
+    "vectors as a float N x 3 numpy style array with the shape of template"
+    if __isbuffer(vectors): return vectors.reshape(-1, 3)
+    rc = template.astype(float)
+    single = __singlevector(vectors)
+    if single: rc[:] = [single.X, single.Y, single.Z]
+    else:
+        values = __packed(vectors, rc.size)
+        it = iter(values)
+        rc[:] = list(itertools.izip(it, it, it))
+    return rc
+
+
+def __operand(vectors, count):
+    "flat iterable of x,y,z values matching count, repeating a single vector"
+    single = __singlevector(vectors)
+    if single: return itertools.cycle((single.X, single.Y, single.Z))
+    return __packed(vectors, count)
+
+
+def PointsTransform(points, xform):
+    """Transforms an array of 3D points
+    Parameters:
+      points = N x 3 buffer of points
+      xform = transformation to apply
+    Returns:
+      array of transformed points on success
+    """
+    xform = rhutil.coercexform(xform, True)
+    m = [[xform[i,j] for j in range(4)] for i in range(4)]
+    affine = m[3][0]==0 and m[3][1]==0 and m[3][2]==0 and m[3][3]==1
+    if __isbuffer(points):
+        rows = points.reshape(-1, 3)
+        rc = rows.dot([[m[j][i] for j in range(3)] for i in range(3)])
+        rc += [m[0][3], m[1][3], m[2][3]]
+        if not affine:
+            w = rows.dot(m[3][:3]) + m[3][3]
+            w[w==0] = 1.0
+            rc /= w.reshape(-1, 1)
+        return rc.reshape(points.shape)
+    points = __packed(points)
+    (m00, m01, m02, m03), (m10, m11, m12, m13), (m20, m21, m22, m23), (m30, m31, m32, m33) = m
+    rc = array.array("d", points)
+    for i in xrange(0, len(rc), 3):
+        x, y, z = rc[i], rc[i+1], rc[i+2]
+        rc[i] = m00*x + m01*y + m02*z + m03
+        rc[i+1] = m10*x + m11*y + m12*z + m13
+        rc[i+2] = m20*x + m21*y + m22*z + m23
+        if not affine:
+            w = m30*x + m31*y + m32*z + m33
+            if w!=0:
+                rc[i] /= w
+                rc[i+1] /= w
+                rc[i+2] /= w
+    return rc
+
+
+def VectorsAdd(vectors1, vectors2):
+    """Adds two arrays of 3D vectors, or a single vector to every vector in
+    an array. Also used to translate an array of points by vectors
+    Parameters:
+      vectors1 = N x 3 buffer of vectors
+      vectors2 = N x 3 buffer of vectors, or a single vector
+    Returns:
+      array of resulting vectors on success
+    """
+    if __isbuffer(vectors1):
+        return vectors1 + __rows(vectors1.reshape(-1, 3), vectors2).reshape(vectors1.shape)
+    vectors1 = __packed(vectors1)
+    vectors2 = __operand(vectors2, len(vectors1))
+    return array.array("d", itertools.imap(operator.add, vectors1, vectors2))
+
+
+def VectorsCrossProduct(vectors1, vectors2):
+    """Calculates the cross products of two arrays of 3D vectors
+    Parameters:
+      vectors1 = N x 3 buffer of vectors
+      vectors2 = N x 3 buffer of vectors, or a single vector
+    Returns:
+      array of cross product vectors on success
+    """
+    if __isbuffer(vectors1):
+        a = vectors1.reshape(-1, 3)
+        b = __rows(a, vectors2)
+        rc = a.astype(float)
+        rc[:,0] = a[:,1]*b[:,2] - a[:,2]*b[:,1]
+        rc[:,1] = a[:,2]*b[:,0] - a[:,0]*b[:,2]
+        rc[:,2] = a[:,0]*b[:,1] - a[:,1]*b[:,0]
+        return rc.reshape(vectors1.shape)
+    vectors1 = __packed(vectors1)
+    vectors2 = __operand(vectors2, len(vectors1))
+    rc = array.array("d", vectors1)
+    it = iter(vectors2)
+    for i in xrange(0, len(rc), 3):
+        ax, ay, az = rc[i], rc[i+1], rc[i+2]
+        bx, by, bz = it.next(), it.next(), it.next()
+        rc[i] = ay*bz - az*by
+        rc[i+1] = az*bx - ax*bz
+        rc[i+2] = ax*by - ay*bx
+    return rc
+
+
+def VectorsDotProduct(vectors1, vectors2):
+    """Calculates the dot products of two arrays of 3D vectors
+    Parameters:
+      vectors1 = N x 3 buffer of vectors
+      vectors2 = N x 3 buffer of vectors, or a single vector
+    Returns:
+      array of N dot products on success
+    """
+    if __isbuffer(vectors1):
+        a = vectors1.reshape(-1, 3)
+        return (a * __rows(a, vectors2)).sum(axis=1)
+    vectors1 = __packed(vectors1)
+    products = itertools.imap(operator.mul, vectors1, __operand(vectors2, len(vectors1)))
+    return array.array("d", itertools.imap(lambda x, y, z: x+y+z, products, products, products))
+
+
+def VectorsLength(vectors):
+    """Returns the lengths of an array of 3D vectors
+    Parameters:
+      vectors = N x 3 buffer of vectors
+    Returns:
+      array of N vector lengths on success
+    """
+    if __isbuffer(vectors):
+        a = vectors.reshape(-1, 3)
+        return (a * a).sum(axis=1) ** 0.5
+    it = iter(__packed(vectors))
+    sqrt = math.sqrt
+    return array.array("d", [sqrt(x*x + y*y + z*z) for x, y, z in itertools.izip(it, it, it)])
+
+
+def VectorsScale(vectors, scale):
+    """Scales an array of 3D vectors
+    Parameters:
+      vectors = N x 3 buffer of vectors
+      scale = scale factor to apply
+    Returns:
+      array of scaled vectors on success
+    """
+    if __isbuffer(vectors): return vectors * float(scale)
+    scale = float(scale)
+    return array.array("d", [c*scale for c in __packed(vectors)])
+
+
+def VectorsSubtract(vectors1, vectors2):
+    """Subtracts two arrays of 3D vectors, or a single vector from every vector
+    in an array
+    Parameters:
+      vectors1 = N x 3 buffer of vectors to subtract from
+      vectors2 = N x 3 buffer of vectors, or a single vector, to subtract
+    Returns:
+      array of resulting vectors on success
+    """
+    if __isbuffer(vectors1):
+        return vectors1 - __rows(vectors1.reshape(-1, 3), vectors2).reshape(vectors1.shape)
+    vectors1 = __packed(vectors1)
+    vectors2 = __operand(vectors2, len(vectors1))
+    return array.array("d", itertools.imap(operator.sub, vectors1, vectors2))
+
+
+def VectorsTransform(vectors, xform):
+    """Transforms an array of 3D vectors. The translation part of the
+    transformation is ignored
+    Parameters:
+      vectors = N x 3 buffer of vectors
+      xform = transformation to apply
+    Returns:
+      array of transformed vectors on success
+    """
+    xform = rhutil.coercexform(xform, True)
+    m = [[xform[i,j] for j in range(3)] for i in range(3)]
+    if __isbuffer(vectors):
+        rc = vectors.reshape(-1, 3).dot([[m[j][i] for j in range(3)] for i in range(3)])
+        return rc.reshape(vectors.shape)
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m
+    rc = array.array("d", __packed(vectors))
+    for i in xrange(0, len(rc), 3):
+        x, y, z = rc[i], rc[i+1], rc[i+2]
+        rc[i] = m00*x + m01*y + m02*z
+        rc[i+1] = m10*x + m11*y + m12*z
+        rc[i+2] = m20*x + m21*y + m22*z
+    return rc
+
+
+def VectorsUnitize(vectors):
+    """Unitizes, or normalizes, an array of 3D vectors. Zero vectors cannot be
+    unitized and are left unchanged
+    Parameters:
+      vectors = N x 3 buffer of vectors
+    Returns:
+      array of unitized vectors on success
+    """
+    if __isbuffer(vectors):
+        a = vectors.reshape(-1, 3)
+        length = (a * a).sum(axis=1) ** 0.5
+        length[length==0] = 1.0
+        return (a / length.reshape(-1, 1)).reshape(vectors.shape)
+    rc = array.array("d", __packed(vectors))
+    sqrt = math.sqrt
+    for i in xrange(0, len(rc), 3):
+        x, y, z = rc[i], rc[i+1], rc[i+2]
+        length = sqrt(x*x + y*y + z*z)
+        if length>0:
+            rc[i] = x/length
+            rc[i+1] = y/length
+            rc[i+2] = z/length
+    return rc
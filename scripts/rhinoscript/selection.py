@@ -1,8 +1,11 @@
 import scriptcontext
 import Rhino
+import fnmatch
+import re
 import utility as rhutil
 import application as rhapp
-from layer import __getlayer
+from layer import __getlayer, __layerobjectcount
+from userdata import __usertextobjects
 
 
 class filter:
@@ -48,7 +51,7 @@ def AllObjects(select=False, include_lights=False, include_grips=False, include_
     for object in e:
         if select: object.Select(True)
         object_ids.append(object.Id)
-    if object_ids and select: scriptcontext.doc.Views.Redraw()
+    if object_ids and select: rhutil.__redraw()
     return object_ids
 
 
@@ -129,7 +132,7 @@ def GetCurveObject(message=None, preselect=False, select=False):
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     go = Rhino.Input.Custom.GetObject()
     if message: go.SetCommandPrompt(message)
     go.GeometryFilter = Rhino.DocObjects.ObjectType.Curve
@@ -153,7 +156,7 @@ def GetCurveObject(message=None, preselect=False, select=False):
     go.Dispose()
     if not select:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     obj.Select(select)
     return id, presel, selmethod, point, curve_parameter, viewname
 
@@ -177,7 +180,7 @@ def GetObject(message=None, filter=0, preselect=False, select=False, custom_filt
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     
     class CustomGetObject(Rhino.Input.Custom.GetObject):
         def __init__(self, filter_function):
@@ -203,7 +206,7 @@ def GetObject(message=None, filter=0, preselect=False, select=False, custom_filt
     go.Dispose()
     if not select:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     if subobjects: return objref
     obj.Select(select)
     return obj.Id
@@ -240,7 +243,7 @@ def GetObjectEx(message=None, filter=0, preselect=False, select=False, objects=N
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     go = None
     if objects:
         ids = [rhutil.coerceguid(id, True) for id in objects]
@@ -267,7 +270,7 @@ def GetObjectEx(message=None, filter=0, preselect=False, select=False, objects=N
     go.Dispose()
     if not select:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     obj.Select(select)
     return id, presel, selmethod, point, viewname
 
@@ -292,7 +295,7 @@ def GetObjects(message=None, filter=0, group=True, preselect=False, select=False
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
 
     objects = rhutil.coerceguidlist(objects)
     class CustomGetObject(Rhino.Input.Custom.GetObject):
@@ -317,7 +320,7 @@ def GetObjects(message=None, filter=0, group=True, preselect=False, select=False
     if go.GetMultiple(minimum_count,maximum_count)!=Rhino.Input.GetResult.Object: return None
     if not select:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     rc = []
     count = go.ObjectCount
     for i in xrange(count):
@@ -354,7 +357,7 @@ def GetObjectsEx(message=None, filter=0, group=True, preselect=False, select=Fal
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     go = None
     if objects:
         ids = [rhutil.coerceguid(id) for id in objects]
@@ -369,7 +372,7 @@ def GetObjectsEx(message=None, filter=0, group=True, preselect=False, select=Fal
     if go.GetMultiple(1,0)!=Rhino.Input.GetResult.Object: return []
     if not select:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     rc = []
     count = go.ObjectCount
     for i in xrange(count):
@@ -421,7 +424,7 @@ def GetSurfaceObject(message="select surface", preselect=False, select=False):
     """
     if not preselect:
         scriptcontext.doc.Objects.UnselectAll()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     go = Rhino.Input.Custom.GetObject()
     go.SetCommandPrompt(message)
     go.GeometryFilter = Rhino.DocObjects.ObjectType.Surface
@@ -433,7 +436,7 @@ def GetSurfaceObject(message="select surface", preselect=False, select=False):
     objref = go.Object(0)
     rhobj = objref.Object()
     rhobj.Select(select)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
 
     id = rhobj.Id
     prepicked = go.ObjectsWerePreselected
@@ -485,10 +488,156 @@ def InvertSelectedObjects(include_lights=False, include_grips=False, include_ref
             obj.Select(True)
         else:
             obj.Select(False)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
+def __iterobjects(settings, geometry_filter=None, tests=()):
+    """Yields (id, rhino object) for the objects of a document enumerator that
+    also match a geometry type filter and pass every test function. Surface
+    and polysurface are told apart by the face count of brep objects
+    """
+    objecttype = Rhino.DocObjects.ObjectType
+    surface = polysurface = True
+    if geometry_filter is not None:
+        surface = bool(geometry_filter & objecttype.Surface)
+        polysurface = bool(geometry_filter & objecttype.Brep)
+        if surface or polysurface:
+            geometry_filter |= objecttype.Surface | objecttype.Brep
+        settings.ObjectTypeFilter = geometry_filter
+    for rhobj in scriptcontext.doc.Objects.GetObjectList(settings):
+        if surface!=polysurface and rhobj.ObjectType==objecttype.Brep:
+            if (rhobj.Geometry.Faces.Count==1)!=surface: continue
+        elif geometry_filter is not None and not (rhobj.ObjectType & geometry_filter):
+            continue
+        for test in tests:
+            if not test(rhobj): break
+        else:
+            yield rhobj.Id, rhobj
+
+
+def __objectstate(settings, state):
+    """Sets the object states an enumerator includes. 0 leaves the defaults,
+    normal and locked objects, else 1, 2 and 4 add normal, locked and hidden
+    objects
+    """
+    if state:
+        settings.NormalObjects = False
+        settings.LockedObjects = False
+    if state & 1: settings.NormalObjects = True
+    if state & 2: settings.LockedObjects = True
+    if state & 4: settings.HiddenObjects = True
+
+
+def __layerindices(layers, include_children):
+    "indices of layers given by name or id, and optionally all of their sublayers"
+    if isinstance(layers, str) or rhutil.coerceguid(layers): layers = [layers]
+    layers = [__getlayer(layer, True) for layer in layers]
+    indices = set(layer.LayerIndex for layer in layers)
+    if include_children:
+        prefixes = tuple(layer.FullPath + "::" for layer in layers)
+        for layer in scriptcontext.doc.Layers:
+            if not layer.IsDeleted and layer.FullPath.startswith(prefixes):
+                indices.add(layer.LayerIndex)
+    return indices
+
+
+def __querytests(settings, layer, include_children, name, color, group, user_text, bounding_box, inside):
+    """Applies the criteria RhinoCommon can evaluate to an enumerator settings
+    object and returns test functions for the rest, cheapest first
+    """
+    doc = scriptcontext.doc
+    tests = []
+    if layer is not None:
+        indices = __layerindices(layer, include_children)
+        if len(indices)==1: settings.LayerIndexFilter = indices.pop()
+        else: tests.append(lambda rhobj: rhobj.Attributes.LayerIndex in indices)
+    if name is not None:
+        if "*" in name or "?" in name or "[" in name:
+            match = re.compile(fnmatch.translate(name), re.IGNORECASE).match
+            tests.append(lambda rhobj: rhobj.Attributes.Name is not None and match(rhobj.Attributes.Name))
+        else:
+            settings.NameFilter = name
+    if group is not None:
+        group_index = doc.Groups.Find(group, True)
+        if group_index<0: raise ValueError("%s does not exist in GroupTable"%group)
+        tests.append(lambda rhobj: group_index in (rhobj.Attributes.GetGroupList() or ()))
+    if user_text is not None:
+        if isinstance(user_text, str): user_text = {user_text: None}
+        candidates = None
+        for key, value in user_text.items():
+            ids = __usertextobjects(key, value)
+            candidates = ids if candidates is None else candidates & ids
+        tests.insert(0, lambda rhobj: rhobj.Id in candidates)
+    if color is not None:
+        argb = rhutil.coercecolor(color, True).ToArgb()
+        tests.append(lambda rhobj: rhobj.Attributes.DrawColor(doc).ToArgb()==argb)
+    if bounding_box is not None:
+        bbox = rhutil.coerceboundingbox(bounding_box, True)
+        xmin, ymin, zmin = bbox.Min.X, bbox.Min.Y, bbox.Min.Z
+        xmax, ymax, zmax = bbox.Max.X, bbox.Max.Y, bbox.Max.Z
+        def boxtest(rhobj):
+            box = rhobj.Geometry.GetBoundingBox(True)
+            if not box.IsValid: return False
+            a, b = box.Min, box.Max
+            if inside:
+                return xmin<=a.X and b.X<=xmax and ymin<=a.Y and b.Y<=ymax and zmin<=a.Z and b.Z<=zmax
+            return a.X<=xmax and xmin<=b.X and a.Y<=ymax and ymin<=b.Y and a.Z<=zmax and zmin<=b.Z
+        tests.append(boxtest)
+    return tests
+
+
+def IterObjects(geometry_type=0, layer=None, name=None, color=None, state=0, include_lights=False, include_grips=False, include_references=False,
+                include_children=False, group=None, user_text=None, bounding_box=None, inside=False):
+    """Iterates over the objects in the document that match all of the given
+    criteria. The document is enumerated once, lazily, so the loop can stop
+    early without visiting the remaining objects. Type, layer and plain name
+    criteria are evaluated by Rhino's object enumerator
+    Parameters:
+      geometry_type[opt] = the type(s) of geometry objects to include. See
+        ObjectsByType for values. 0 includes all objects
+      layer[opt] = name or identifier of the layer the objects are on, or a
+        list of layers
+      name[opt] = user-assigned name of the objects. May contain the * ? and
+        [] wildcards of fnmatch, matched without regard to case
+      color[opt] = display color of the objects
+      state[opt] = object state, as in ObjectsByType. 0 includes normal and
+        locked objects, add 1 for normal, 2 for locked and 4 for hidden
+        objects to choose others
+      include_lights[opt] = include light objects
+      include_grips[opt] = include grip objects
+      include_references[opt] = include reference objects
+      include_children[opt] = also include objects on the sublayers of layer
+      group[opt] = name of a group the objects belong to
+      user_text[opt] = user text key the objects must have, or a dictionary
+        of key/value pairs the objects must have. A value of None matches
+        any value
+      bounding_box[opt] = BoundingBox or list of corner points. Objects whose
+        bounding box intersects this box are included
+      inside[opt] = if True, only objects whose bounding box is completely
+        inside bounding_box are included
+    Returns:
+      generator of (Guid, RhinoObject) tuples
+    Example:
+      import rhinoscriptsyntax as rs
+      for id, rhobj in rs.IterObjects(rs.filter.curve, layer="Default"):
+        if rhobj.IsSelected(False): break
+    """
+    settings = Rhino.DocObjects.ObjectEnumeratorSettings()
+    __objectstate(settings, state)
+    settings.IncludeLights = include_lights
+    settings.IncludeGrips = include_grips
+    settings.ReferenceObjects = include_references
+    geometry_filter = None
+    if geometry_type:
+        geometry_filter = __FilterHelper(geometry_type)
+        if geometry_filter & Rhino.DocObjects.ObjectType.Light: settings.IncludeLights = True
+        if geometry_filter & Rhino.DocObjects.ObjectType.Grip: settings.IncludeGrips = True
+        if geometry_filter & Rhino.DocObjects.ObjectType.Phantom: settings.IncludePhantoms = True
+    tests = __querytests(settings, layer, include_children, name, color, group, user_text, bounding_box, inside)
+    return __iterobjects(settings, geometry_filter, tests)
+
+
 def LastCreatedObjects(select=False):
     """Returns identifiers of the objects that were most recently created or changed
     by scripting a Rhino command using the Command function. It is important to
@@ -506,7 +655,7 @@ def LastCreatedObjects(select=False):
             rc.append(obj.Id)
             if select: obj.Select(True)
         serial_number += 1
-    if select==True and rc: scriptcontext.doc.Views.Redraw()
+    if select==True and rc: rhutil.__redraw()
     return rc
 
 
@@ -531,7 +680,7 @@ def LastObject(select=False, include_lights=False, include_grips=False):
     rc = firstobj.Id
     if select:
         firstobj.Select(True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -581,7 +730,7 @@ def ObjectsByColor(color, select=False, include_lights=False):
     rhino_objects = scriptcontext.doc.Objects.FindByDrawColor(color, include_lights)
     if select:
         for obj in rhino_objects: obj.Select(True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return [obj.Id for obj in rhino_objects]
 
 
@@ -599,24 +748,29 @@ def ObjectsByGroup(group_name, select=False):
     if not rhino_objects: return []
     if select:
         for obj in rhino_objects: obj.Select(True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return [obj.Id for obj in rhino_objects]
 
 
-def ObjectsByLayer(layer_name, select=False):
+def ObjectsByLayer(layer_name, select=False, count_only=False):
     """Returns identifiers of all objects based on the objects' layer name
     Parameters:
       layer_name = name of the layer
       select [opt] = select the objects
+      count_only [opt] = return the number of objects on the layer instead
+        of their identifiers. The objects are not enumerated or selected.
+        The count includes hidden and locked objects and lights
     Returns:
       list of identifiers
+      number of objects if count_only is True
     """
     layer = __getlayer(layer_name, True)
+    if count_only: return __layerobjectcount(layer)
     rhino_objects = scriptcontext.doc.Objects.FindByLayer(layer)
     if not rhino_objects: return []
     if select:
         for rhobj in rhino_objects: rhobj.Select(True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return [rhobj.Id for rhobj in rhino_objects]
 
 
@@ -637,15 +791,50 @@ def ObjectsByName(name, select=False, include_lights=False, include_references=F
     settings.IncludeLights = include_lights
     settings.NameFilter = name
     settings.ReferenceObjects = include_references
-    objects = scriptcontext.doc.Objects.GetObjectList(settings)
-    ids = [rhobj.Id for rhobj in objects]
-    if ids and select:
-        objects = scriptcontext.doc.Objects.GetObjectList(settings)
-        for rhobj in objects: rhobj.Select(True)
-        scriptcontext.doc.Views.Redraw()
+    ids = []
+    for rhobj in scriptcontext.doc.Objects.GetObjectList(settings):
+        if select: rhobj.Select(True)
+        ids.append(rhobj.Id)
+    if ids and select: rhutil.__redraw()
     return ids
    
 
+def ObjectsByQuery(geometry_type=0, layer=None, name=None, color=None, state=0, include_children=False, group=None, user_text=None,
+                   bounding_box=None, inside=False, select=False, include_lights=False, include_references=False):
+    """Returns identifiers of all objects that match a combination of criteria.
+    The document is enumerated once, instead of once per ObjectsByType,
+    ObjectsByLayer, ObjectsByName and ObjectsByColor call. See IterObjects for
+    a description of the criteria and for a lazy alternative
+    Parameters:
+      geometry_type[opt] = the type(s) of geometry objects. See ObjectsByType
+      layer[opt] = name or identifier of a layer, or a list of layers
+      name[opt] = user-assigned name. May contain wildcards
+      color[opt] = display color
+      state[opt] = object state. See IterObjects
+      include_children[opt] = also include objects on the sublayers of layer
+      group[opt] = name of a group
+      user_text[opt] = user text key, or dictionary of key/value pairs
+      bounding_box[opt] = BoundingBox or list of corner points
+      inside[opt] = require objects to be completely inside bounding_box
+      select[opt] = select the objects
+      include_lights[opt] = include light objects
+      include_references[opt] = include reference objects
+    Returns:
+      list of identifiers
+    Example:
+      import rhinoscriptsyntax as rs
+      ids = rs.ObjectsByQuery(rs.filter.curve, layer="Structure", include_children=True, name="beam*", color=(255,0,0))
+    """
+    objects = IterObjects(geometry_type, layer, name, color, state, include_lights, False, include_references,
+                          include_children, group, user_text, bounding_box, inside)
+    ids = []
+    for id, rhobj in objects:
+        if select: rhobj.Select(True)
+        ids.append(id)
+    if ids and select: rhutil.__redraw()
+    return ids
+
+
 def ObjectsByType(geometry_type, select=False, state=0):
     """Returns identifiers of all objects based on the objects' geometry type.
     Parameters:
@@ -676,57 +865,50 @@ def ObjectsByType(geometry_type, select=False, state=0):
     Returns:
       A list of Guids identifying the objects.
     """
-    bSurface = False
-    bPolySurface = False
-    bLights = False
-    bGrips = False
-    bPhantoms = False
     geometry_filter = __FilterHelper(geometry_type)
     if type(geometry_type) is int and geometry_type==0:
         geometry_filter = Rhino.DocObjects.ObjectType.AnyObject
-    if geometry_filter & Rhino.DocObjects.ObjectType.Surface: bSurface = True
-    if geometry_filter & Rhino.DocObjects.ObjectType.Brep: bPolySurface = True
-    if geometry_filter & Rhino.DocObjects.ObjectType.Light: bLights = True
-    if geometry_filter & Rhino.DocObjects.ObjectType.Grip: bGrips = True
-    if geometry_filter & Rhino.DocObjects.ObjectType.Phantom: bPhantoms = True
 
     it = Rhino.DocObjects.ObjectEnumeratorSettings()
     it.DeletedObjects = False
     it.ActiveObjects = True
     it.ReferenceObjects = True
-    it.IncludeLights = bLights
-    it.IncludeGrips = bGrips
-    it.IncludePhantoms = bPhantoms
-    if state:
-        it.NormalObjects = False
-        it.LockedObjects = False
-    if state & 1: it.NormalObjects = True
-    if state & 2: it.LockedObjects = True
-    if state & 4: it.HiddenObjects = True
+    it.IncludeLights = bool(geometry_filter & Rhino.DocObjects.ObjectType.Light)
+    it.IncludeGrips = bool(geometry_filter & Rhino.DocObjects.ObjectType.Grip)
+    it.IncludePhantoms = bool(geometry_filter & Rhino.DocObjects.ObjectType.Phantom)
+    __objectstate(it, state)
 
     object_ids = []
-    e = scriptcontext.doc.Objects.GetObjectList(it)
-    for object in e:
-        bFound = False
-        object_type = object.ObjectType
-        if object_type==Rhino.DocObjects.ObjectType.Brep and (bSurface or bPolySurface):
-            brep = rhutil.coercebrep(object.Id)
-            if brep:
-                if brep.Faces.Count==1:
-                    if bSurface: bFound = True
-                else:
-                    if bPolySurface: bFound = True
-        elif object_type & geometry_filter:
-            bFound = True
-
-        if bFound:
-            if select: object.Select(True)
-            object_ids.append(object.Id)
-
-    if object_ids and select: scriptcontext.doc.Views.Redraw()
+    for id, object in __iterobjects(it, geometry_filter):
+        if select: object.Select(True)
+        object_ids.append(id)
+    if object_ids and select: rhutil.__redraw()
     return object_ids
   
 
+def ObjectsByUserText(key, value=None, select=False):
+    """Returns identifiers of all objects that have a user text key, and
+    optionally a specific value for it. Uses an index of the objects' user
+    text instead of reading the user text of every object
+    Parameters:
+      key = the user text key name
+      value[opt] = the value of the key. If omitted, objects with any value
+        are returned
+      select[opt] = select the objects
+    Returns:
+      list of identifiers, in document order
+    Example:
+      import rhinoscriptsyntax as rs
+      ids = rs.ObjectsByUserText("ElementId", "W-1024")
+    """
+    ids = __usertextobjects(key, value, True)
+    if ids and select:
+        find = scriptcontext.doc.Objects.Find
+        for id in ids: find(id).Select(True)
+        rhutil.__redraw()
+    return ids
+
+
 def SelectedObjects(include_lights=False, include_grips=False):
     """Returns the identifiers of all objects that are currently selected
     Parameters:
@@ -745,5 +927,5 @@ def UnselectAllObjects():
       the number of objects that were unselected
     """
     rc = scriptcontext.doc.Objects.UnselectAll()
-    if rc>0: scriptcontext.doc.Views.Redraw()
+    if rc>0: rhutil.__redraw()
     return rc
@@ -0,0 +1,270 @@
+import utility as rhutil
+import Rhino
+import heapq
+
+
+class PointIndex(object):
+    """A k-d tree of 3D points that is built once and then answers nearest,
+    k-nearest and radius queries. Results are indices into the list of points
+    the index was built from
+    Example:
+      index = rhinoscript.spatialindex.PointIndex(points)
+      closest = index.Nearest(test_points)
+    """
+    def __init__(self, points):
+        """Builds the index
+        Parameters:
+          points = list of 3D points, or an N x 3 buffer of coordinates
+        """
+        coords = rhutil.coerce3dpointarray(points, True)
+        count = len(coords)/3
+        order = range(count)
+        axes = [0]*count
+        stack = [(0, count)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi-lo<=self.__leafsize: continue
+            segment = order[lo:hi]
+            # split along the axis with the largest extent
+            axis, extent = 0, -1.0
+            for i in range(3):
+                values = [coords[j*3+i] for j in segment]
+                if max(values)-min(values)>extent:
+                    axis, extent = i, max(values)-min(values)
+            segment.sort(key=lambda j: coords[j*3+axis])
+            order[lo:hi] = segment
+            mid = (lo+hi)/2
+            axes[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid+1, hi))
+        self.__order = order
+        self.__axes = axes
+        self.__coords = ([coords[j*3] for j in order],
+                         [coords[j*3+1] for j in order],
+                         [coords[j*3+2] for j in order])
+
+    __leafsize = 8
+
+    def __len__(self):
+        return len(self.__order)
+
+    def __query(self, points, func, *args):
+        point = rhutil.coerce3dpoint(points)
+        if point is not None: return func(point.X, point.Y, point.Z, *args)
+        points = rhutil.coerce3dpointlist(points, True)
+        return [func(point.X, point.Y, point.Z, *args) for point in points]
+
+    def __search(self, x, y, z, k, radius2):
+        # returns (distance squared, index) pairs sorted by distance. Keeps the
+        # k closest points when k>0, else every point within radius. Points at
+        # the same distance are ordered by index, so ties go to the lowest one
+        columns = self.__coords
+        xs, ys, zs = columns
+        order, axes, leafsize = self.__order, self.__axes, self.__leafsize
+        query = (x, y, z)
+        found = [] # max heap of (-distance squared, -index)
+        limit = radius2
+        stack = [(0, len(order), 0.0)]
+        while stack:
+            lo, hi, bound = stack.pop()
+            if bound>limit: continue
+            if hi-lo<=leafsize: mid, candidates = None, xrange(lo, hi)
+            else:
+                mid = (lo+hi)/2
+                candidates = (mid,)
+            for j in candidates:
+                dx, dy, dz = xs[j]-x, ys[j]-y, zs[j]-z
+                d = dx*dx + dy*dy + dz*dz
+                if d>limit: continue
+                if k<=0: found.append((-d, -order[j]))
+                elif len(found)<k: heapq.heappush(found, (-d, -order[j]))
+                else: heapq.heappushpop(found, (-d, -order[j]))
+                if k>0 and len(found)==k: limit = -found[0][0]
+            if mid is None: continue
+            axis = axes[mid]
+            diff = query[axis] - columns[axis][mid]
+            if diff<0: near, far = (lo, mid), (mid+1, hi)
+            else: near, far = (mid+1, hi), (lo, mid)
+            stack.append((far[0], far[1], diff*diff))
+            stack.append((near[0], near[1], 0.0))
+        found.sort(reverse=True)
+        return [(-d, -i) for d, i in found]
+
+    def __nearest(self, x, y, z):
+        rc = self.__search(x, y, z, 1, float("inf"))
+        if rc: return rc[0][1]
+
+    def __knearest(self, x, y, z, k):
+        return [i for d, i in self.__search(x, y, z, k, float("inf"))]
+
+    def __inradius(self, x, y, z, radius):
+        return [i for d, i in self.__search(x, y, z, 0, radius*radius)]
+
+    def Nearest(self, points):
+        """Finds the closest indexed point
+        Parameters:
+          points = a test point, or a list of test points
+        Returns:
+          index of the closest point for a single test point
+          list of indices for a list of test points
+        """
+        return self.__query(points, self.__nearest)
+
+    def KNearest(self, points, count):
+        """Finds the closest indexed points
+        Parameters:
+          points = a test point, or a list of test points
+          count = number of points to find for each test point
+        Returns:
+          list of indices sorted by distance for a single test point
+          list of lists of indices for a list of test points
+        """
+        return self.__query(points, self.__knearest, count)
+
+    def InRadius(self, points, radius):
+        """Finds the indexed points within a distance of test points
+        Parameters:
+          points = a test point, or a list of test points
+          radius = distance from the test points
+        Returns:
+          list of indices sorted by distance for a single test point
+          list of lists of indices for a list of test points
+        """
+        return self.__query(points, self.__inradius, radius)
+
+
+class ObjectIndex(object):
+    """A bounding box tree of objects that is built once and then answers
+    nearest, k-nearest and radius queries using the exact closest point on
+    each candidate object. Point, point cloud, curve, surface, polysurface
+    and mesh objects are supported
+    Example:
+      index = rhinoscript.spatialindex.ObjectIndex(object_ids)
+      results = index.Nearest(test_points)
+    """
+    def __init__(self, object_ids):
+        """Builds the index
+        Parameters:
+          object_ids = identifiers of the objects to index
+        """
+        items = []
+        for id in rhutil.coerceguidlist(object_ids):
+            geometry = rhutil.coercegeometry(id, True)
+            bbox = geometry.GetBoundingBox(True)
+            if not bbox.IsValid: continue
+            box = (bbox.Min.X, bbox.Min.Y, bbox.Min.Z, bbox.Max.X, bbox.Max.Y, bbox.Max.Z)
+            items.append((box, len(items), id, geometry))
+        self.__items = items
+        self.__root = self.__build(items) if items else None
+
+    __leafsize = 4
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __build(self, items):
+        # node = [box, child nodes or None, items]
+        box = tuple(min(item[0][i] for item in items) for i in range(3)) + \
+              tuple(max(item[0][i] for item in items) for i in range(3, 6))
+        if len(items)<=self.__leafsize: return [box, None, items]
+        axis = max(range(3), key=lambda i: box[i+3]-box[i])
+        items = sorted(items, key=lambda item: item[0][axis]+item[0][axis+3])
+        mid = len(items)/2
+        return [box, (self.__build(items[:mid]), self.__build(items[mid:])), None]
+
+    def __closestpoint(self, geometry, point):
+        if isinstance(geometry, Rhino.Geometry.Point): return geometry.Location
+        if isinstance(geometry, Rhino.Geometry.PointCloud):
+            index = geometry.ClosestPoint(point)
+            if index>=0: return geometry[index].Location
+        elif isinstance(geometry, Rhino.Geometry.Curve):
+            rc, t = geometry.ClosestPoint(point)
+            if rc: return geometry.PointAt(t)
+        elif isinstance(geometry, Rhino.Geometry.Brep) or isinstance(geometry, Rhino.Geometry.Mesh):
+            return geometry.ClosestPoint(point)
+
+    def __query(self, points, func, *args):
+        point = rhutil.coerce3dpoint(points)
+        if point is not None: return func(point, *args)
+        points = rhutil.coerce3dpointlist(points, True)
+        return [func(point, *args) for point in points]
+
+    def __search(self, point, k, radius):
+        # returns (distance, id, point on object) tuples sorted by distance.
+        # Keeps the k closest objects when k>0, else every object within radius.
+        # Objects at the same distance keep the order they were indexed in
+        if self.__root is None: return []
+        x, y, z = point.X, point.Y, point.Z
+        def boxdistance2(box):
+            dx = max(box[0]-x, 0.0, x-box[3])
+            dy = max(box[1]-y, 0.0, y-box[4])
+            dz = max(box[2]-z, 0.0, z-box[5])
+            return dx*dx + dy*dy + dz*dz
+        found = [] # max heap of (-distance, -position, id, point on object)
+        limit = radius
+        queue = [(boxdistance2(self.__root[0]), 0, self.__root)]
+        counter = 1
+        while queue:
+            bound, unused, node = heapq.heappop(queue)
+            if bound>limit*limit: break
+            box, children, items = node
+            if children:
+                for child in children:
+                    heapq.heappush(queue, (boxdistance2(child[0]), counter, child))
+                    counter += 1
+                continue
+            for box, position, id, geometry in items:
+                if boxdistance2(box)>limit*limit: continue
+                closest = self.__closestpoint(geometry, point)
+                if closest is None: continue
+                d = point.DistanceTo(closest)
+                if d>limit: continue
+                item = (-d, -position, id, closest)
+                if k<=0: found.append(item)
+                elif len(found)<k: heapq.heappush(found, item)
+                elif item[:2]>found[0][:2]: heapq.heapreplace(found, item)
+                if k>0 and len(found)==k: limit = -found[0][0]
+        found.sort(key=lambda item: (-item[0], -item[1]))
+        return [(-d, id, closest) for d, position, id, closest in found]
+
+    def __nearest(self, point):
+        rc = self.__search(point, 1, float("inf"))
+        if rc: return rc[0][1], rc[0][2]
+
+    def __knearest(self, point, k):
+        return [(id, closest) for d, id, closest in self.__search(point, k, float("inf"))]
+
+    def __inradius(self, point, radius):
+        return [id for d, id, closest in self.__search(point, 0, radius)]
+
+    def Nearest(self, points):
+        """Finds the closest indexed object
+        Parameters:
+          points = a test point, or a list of test points
+        Returns:
+          (closest object_id, point on object) for a single test point
+          list of (closest object_id, point on object) for a list of test points
+        """
+        return self.__query(points, self.__nearest)
+
+    def KNearest(self, points, count):
+        """Finds the closest indexed objects
+        Parameters:
+          points = a test point, or a list of test points
+          count = number of objects to find for each test point
+        Returns:
+          list of (object_id, point on object) sorted by distance for a single
+          test point, a list of those lists for a list of test points
+        """
+        return self.__query(points, self.__knearest, count)
+
+    def InRadius(self, points, radius):
+        """Finds the indexed objects within a distance of test points
+        Parameters:
+          points = a test point, or a list of test points
+          radius = distance from the test points
+        Returns:
+          list of object ids sorted by distance for a single test point
+          list of lists of object ids for a list of test points
+        """
+        return self.__query(points, self.__inradius, radius)
@@ -1,5 +1,6 @@
 import scriptcontext
 import math
+import array
 import Rhino
 import System.Guid
 import utility as rhutil
@@ -18,7 +19,7 @@ def AddBox(corners):
     if not brep: raise ValueError("unable to create brep from box")
     rc = scriptcontext.doc.Objects.AddBrep(brep)
     if rc==System.Guid.Empty: raise Exception("unable to add brep to document")
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -47,7 +48,7 @@ def AddCone(base, height, radius, cap=True):
     cone = Rhino.Geometry.Cone(plane, height, radius)
     brep = Rhino.Geometry.Brep.CreateFromCone(cone, cap)
     rc = scriptcontext.doc.Objects.AddBrep(brep)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -82,7 +83,7 @@ def AddCutPlane(object_ids, start_point, end_point, normal=None):
     if surface is None: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddSurface(surface)
     if id==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -119,7 +120,7 @@ def AddCylinder(base, height, radius, cap=True):
     brep = cylinder.ToBrep(cap, cap)
     id = scriptcontext.doc.Objects.AddBrep(brep)
     if id==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -136,7 +137,7 @@ def AddEdgeSrf(curve_ids):
     if brep is None: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddBrep(brep)
     if id==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -153,7 +154,7 @@ def AddNetworkSrf(curves, continuity=1, edge_tolerance=0, interior_tolerance=0,
     surf, err = Rhino.Geometry.NurbsSurface.CreateNetworkSurface(curves, continuity, edge_tolerance, interior_tolerance, angle_tolerance)
     if surf:
         rc = scriptcontext.doc.Objects.AddSurface(surf)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -195,7 +196,7 @@ def AddNurbsSurface(point_count, points, knots_u, knots_v, degree, weights=None)
     if not ns.IsValid: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddSurface(ns)
     if id==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -220,7 +221,7 @@ def AddPipe(curve_id, parameters, radii, blend_type=0, cap=0, fit=False):
     cap = System.Enum.ToObject(Rhino.Geometry.PipeCapMode, cap)
     breps = Rhino.Geometry.Brep.CreatePipe(rail, parameters, radii, blend_type==0, cap, fit, abs_tol, ang_tol)
     rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in breps]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -238,7 +239,7 @@ def AddPlanarSrf(object_ids):
     breps = Rhino.Geometry.Brep.CreatePlanarBreps(curves)
     if breps:
         rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in breps]
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -259,7 +260,7 @@ def AddPlaneSurface(plane, u_dir, v_dir):
     if plane_surface is None: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddSurface(plane_surface)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -334,7 +335,7 @@ def AddLoftSrf(object_ids, start=None, end=None, loft_type=0, simplify_method=0,
     for brep in breps:
         id = scriptcontext.doc.Objects.AddBrep(brep)
         if id!=System.Guid.Empty: idlist.append(id)
-    if idlist: scriptcontext.doc.Views.Redraw()
+    if idlist: rhutil.__redraw()
     return idlist
 
 
@@ -355,7 +356,7 @@ def AddRevSrf(curve_id, axis, start_angle=0.0, end_angle=360.0):
     srf = Rhino.Geometry.RevSurface.Create(curve, axis, start_angle, end_angle)
     if not srf: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddSurface(srf)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -376,7 +377,7 @@ def AddSphere(center_or_plane, radius):
     sphere = Rhino.Geometry.Sphere(center, radius)
     rc = scriptcontext.doc.Objects.AddSphere(sphere)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -411,7 +412,7 @@ def AddSrfContourCrvs(object_id, points_or_plane, interval=None):
     for crv in curves:
         id = scriptcontext.doc.Objects.AddCurve(crv)
         if id!=System.Guid.Empty: rc.append(id)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -430,7 +431,7 @@ def AddSrfControlPtGrid(count, points, degree=(3,3)):
     if not surf: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddSurface(surf)
     if id!=System.Guid.Empty:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return id
 
 
@@ -451,7 +452,7 @@ def AddSrfPt(points):
     if surface is None: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddSurface(surface)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -471,7 +472,7 @@ def AddSrfPtGrid(count, points, degree=(3,3), closed=(False,False)):
     if not surf: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddSurface(surf)
     if id!=System.Guid.Empty:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return id
 
 
@@ -492,7 +493,7 @@ def AddSweep1(rail, shapes, closed=False):
     breps = Rhino.Geometry.Brep.CreateFromSweep(rail, shapes, closed, tolerance)
     if not breps: return scriptcontext.errorhandler()
     rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in breps]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -514,7 +515,7 @@ def AddSweep2(rails, shapes, closed=False):
     breps = Rhino.Geometry.Brep.CreateFromSweep(rail1, rail2, shapes, closed, tolerance)
     if not breps: return scriptcontext.errorhandler()
     rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in breps]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -542,11 +543,11 @@ def AddTorus(base, major_radius, minor_radius, direction=None):
     torus = Rhino.Geometry.Torus(baseplane, major_radius, minor_radius)
     revsurf = torus.ToRevSurface()
     rc = scriptcontext.doc.Objects.AddSurface(revsurf)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
-def BooleanDifference(input0, input1, delete_input=True):
+def BooleanDifference(input0, input1, delete_input=True, parallel=False):
     """Performs a boolean difference operation on two sets of input surfaces
     and polysurfaces. For more details, see the BooleanDifference command in
     the Rhino help file
@@ -554,6 +555,9 @@ def BooleanDifference(input0, input1, delete_input=True):
         input0 = list of surfaces to subtract from
         input1 = list of surfaces to be subtracted
         delete_input[opt] = delete all input objects
+        parallel[opt] = subtract from each surface of input0 separately, on
+          multiple threads, using only the surfaces of input1 whose bounding
+          boxes overlap it
     Returns:
         list of identifiers of newly created objects on success
         None on error
@@ -567,14 +571,25 @@ def BooleanDifference(input0, input1, delete_input=True):
     breps0 = [rhutil.coercebrep(id, True) for id in input0]
     breps1 = [rhutil.coercebrep(id, True) for id in input1]
     tolerance = scriptcontext.doc.ModelAbsoluteTolerance
-    newbreps = Rhino.Geometry.Brep.CreateBooleanDifference(breps0, breps1, tolerance)
+    if parallel:
+        boxes1 = [rhutil.__boxtuple(brep) for brep in breps1]
+        def difference(brep):
+            box = rhutil.__boxtuple(brep)
+            cutters = [cutter for cutter, other in zip(breps1, boxes1) if rhutil.__boxesoverlap(box, other, tolerance)]
+            if not cutters: return [brep]
+            return Rhino.Geometry.Brep.CreateBooleanDifference([brep], cutters, tolerance)
+        results = rhutil.__parallelmap(difference, breps0)
+        if None in results: return scriptcontext.errorhandler()
+        newbreps = [brep for result in results for brep in result]
+    else:
+        newbreps = Rhino.Geometry.Brep.CreateBooleanDifference(breps0, breps1, tolerance)
     if newbreps is None: return scriptcontext.errorhandler()
     
     rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in newbreps]
     if delete_input:
         for id in input0: scriptcontext.doc.Objects.Delete(id, True)
         for id in input1: scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -605,17 +620,23 @@ def BooleanIntersection(input0, input1, delete_input=True):
     if delete_input:
         for id in input0: scriptcontext.doc.Objects.Delete(id, True)
         for id in input1: scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
-def BooleanUnion(input, delete_input=True):
+def BooleanUnion(input, delete_input=True, parallel=False):
     """Performs a boolean union operation on a set of input surfaces and
     polysurfaces. For more details, see the BooleanUnion command in the
     Rhino help file
     Parameters:
         input = list of surfaces to union
         delete_input[opt] = delete all input objects
+        parallel[opt] = group the surfaces into clusters of overlapping
+          bounding boxes and union the clusters, and chunks of large
+          clusters, on multiple threads before merging the partial results.
+          Intended for large numbers of parts. Surfaces that do not
+          intersect any other surface are not part of the result and are not
+          deleted
     Returns:
         list of identifiers of newly created objects on success
         None on error
@@ -623,13 +644,20 @@ def BooleanUnion(input, delete_input=True):
     if len(input)<2: return scriptcontext.errorhandler()
     breps = [rhutil.coercebrep(id, True) for id in input]
     tolerance = scriptcontext.doc.ModelAbsoluteTolerance
-    newbreps = Rhino.Geometry.Brep.CreateBooleanUnion(breps, tolerance)
+    if parallel:
+        boxes = [rhutil.__boxtuple(brep) for brep in breps]
+        union = lambda items: Rhino.Geometry.Brep.CreateBooleanUnion(items, tolerance)
+        newbreps, used = rhutil.__parallelunion(breps, boxes, union, tolerance)
+        if not newbreps: newbreps = None
+        input = [input[i] for i in used]
+    else:
+        newbreps = Rhino.Geometry.Brep.CreateBooleanUnion(breps, tolerance)
     if newbreps is None: return scriptcontext.errorhandler()
     
     rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in newbreps]
     if delete_input:
         for id in input: scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -677,7 +705,7 @@ def CapPlanarHoles(surface_id):
             newbrep.Flip()
         surface_id = rhutil.coerceguid(surface_id)
         if surface_id and scriptcontext.doc.Objects.Replace(surface_id, newbrep):
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
             return True
     return False
 
@@ -704,7 +732,7 @@ def DuplicateEdgeCurves(object_id, select=False):
             if rc==System.Guid.Empty: return None
             curves.append(rc)
             if select: rhobject.SelectObject(rc)
-    if curves: scriptcontext.doc.Views.Redraw()
+    if curves: rhutil.__redraw()
     return curves
 
 
@@ -723,7 +751,7 @@ def DuplicateSurfaceBorder(surface_id):
     curves = Rhino.Geometry.Curve.JoinCurves(curves, tolerance)
     if curves is None: return scriptcontext.errorhandler()
     rc = [scriptcontext.doc.Objects.AddCurve(c) for c in curves]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -754,7 +782,7 @@ def ExtendSurface(surface_id, parameter, length, smooth=True):
     if newsrf:
         surface_id = rhutil.coerceguid(surface_id)
         if surface_id: scriptcontext.doc.Objects.Replace(surface_id, newsrf)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return newsrf is not None
 
 
@@ -778,7 +806,7 @@ def ExplodePolysurfaces(object_ids, delete_input=False):
                 face_id = scriptcontext.doc.Objects.AddBrep(copyface)
                 if face_id!=System.Guid.Empty: ids.append(face_id)
             if delete_input: scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return ids
 
 
@@ -815,7 +843,7 @@ def ExtractIsoCurve(surface_id, parameter, direction):
             for curve in curves:
                 id = scriptcontext.doc.Objects.AddCurve(curve)
                 if id!=System.Guid.Empty: ids.append(id)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return ids
 
 
@@ -842,7 +870,7 @@ def ExtractSurface(object_id, face_indices, copy=False):
         for index in face_indices: brep.Faces.RemoveAt(index)
         id = rhutil.coerceguid(object_id)
         scriptcontext.doc.Objects.Replace(id, brep)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -860,7 +888,7 @@ def ExtrudeCurve(curve_id, path_id):
     srf = Rhino.Geometry.SumSurface.Create(curve1, curve2)
     rc = scriptcontext.doc.Objects.AddSurface(srf)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -878,7 +906,7 @@ def ExtrudeCurvePoint(curve_id, point):
     srf = Rhino.Geometry.Surface.CreateExtrusionToPoint(curve, point)
     rc = scriptcontext.doc.Objects.AddSurface(srf)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -898,7 +926,7 @@ def ExtrudeCurveStraight(curve_id, start_point, end_point):
     srf = Rhino.Geometry.Surface.CreateExtrusion(curve, vec)
     rc = scriptcontext.doc.Objects.AddSurface(srf)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -916,7 +944,7 @@ def ExtrudeSurface(surface, curve, cap=True):
     newbrep = brep.Faces[0].CreateExtrusion(curve, cap)
     if newbrep:
         rc = scriptcontext.doc.Objects.AddBrep(newbrep)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -947,7 +975,7 @@ def FilletSurfaces(surface0, surface1, radius, uvparam0=None, uvparam1=None):
     rc = []
     for surf in surfaces:
         rc.append( scriptcontext.doc.Objects.AddSurface(surf) )
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -970,7 +998,7 @@ def FlipSurface(surface_id, flip=None):
         brep.Flip()
         surface_id = rhutil.coerceguid(surface_id)
         if surface_id: scriptcontext.doc.Objects.Replace(surface_id, brep)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return old_reverse
 
 
@@ -1017,7 +1045,7 @@ def IntersectBreps(brep1, brep2, tolerance=None):
         if rc==System.Guid.Empty: return scriptcontext.errorhandler()
         ids.append(rc)
     if ids:
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return ids
 
 
@@ -1277,7 +1305,7 @@ def JoinSurfaces(object_ids, delete_input=False):
         for id in object_ids:
             id = rhutil.coerceguid(id)
             scriptcontext.doc.Objects.Delete(id, True)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -1300,7 +1328,7 @@ def MakeSurfacePeriodic(surface_id, direction, delete_input=False):
         scriptcontext.doc.Objects.Replace(id, newsurf)
     else:
         id = scriptcontext.doc.Objects.AddSurface(newsurf)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -1327,7 +1355,7 @@ def OffsetSurface(surface_id, distance, tolerance=None, both_sides=False, create
     if newbrep is None: return scriptcontext.errorhandler()
     rc = scriptcontext.doc.Objects.AddBrep(newbrep)
     if rc==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -1350,7 +1378,7 @@ def PullCurve(surface, curve, delete_input=False):
     if rc:
         if delete_input and crvobj:
             scriptcontext.doc.Objects.Delete(crvobj, True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -1369,7 +1397,7 @@ def RebuildSurface(object_id, degree=(3,3), pointcount=(10,10)):
     if newsurf is None: return False
     object_id = rhutil.coerceguid(object_id)
     rc = scriptcontext.doc.Objects.Replace(object_id, newsurf)
-    if rc: scriptcontext.doc.Views.Redraw()
+    if rc: rhutil.__redraw()
     return rc
 
 
@@ -1429,7 +1457,7 @@ def ShortPath(surface_id, start_point, end_point):
     if curve is None: return scriptcontext.errorhandler()
     id = scriptcontext.doc.Objects.AddCurve(curve)
     if id==System.Guid.Empty: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return id
 
 
@@ -1454,7 +1482,7 @@ def ShrinkTrimmedSurface(object_id, create_copy=False):
         rc = scriptcontext.doc.Objects.AddBrep(brep, attr)
     else:
         rc = scriptcontext.doc.Objects.Replace(object_id, brep)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -1486,7 +1514,7 @@ def SplitBrep(brep_id, cutter_id, delete_input=False):
         brep_id = rhutil.coerceguid(brep_id)
         scriptcontext.doc.Objects.Delete(brep_id, True)
     rc = [scriptcontext.doc.Objects.AddBrep(piece) for piece in pieces]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -1757,7 +1785,7 @@ def SurfaceIsocurveDensity(surface_id, density=None):
         if density<0: density = -1
         rhino_object.Attributes.WireDensity = density
         rhino_object.CommitChanges()
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -1875,6 +1903,90 @@ def SurfacePoints(surface_id, return_all=True):
     return rc
 
 
+def SurfaceSampleGrid(surface_id, u_count, v_count, fields=("point", "normal", "curvature"), parallel=False):
+    """Evaluates a surface at a grid of parameters spanning its domain in one
+    call. The values are returned in packed arrays, ordered row by row with
+    the V direction changing fastest, so sample i*v_count+j is at the i-th U
+    and j-th V parameter
+    Parameters:
+      surface_id = the surface's identifier
+      u_count, v_count = number of samples in the U and V directions, at
+        least 2. The first and last samples lie on the domain's edges
+      fields [opt] = the values to compute
+          uv = u and v parameters, 2 values per sample
+          point = 3D point, 3 values per sample
+          normal = unit normal vector, 3 values per sample
+          frame = origin, x, y and z axis of the surface frame, 12 values per sample
+          curvature = maximum and minimum principal curvature, gaussian and
+            mean curvature, 4 values per sample. NaN where the curvature could
+            not be evaluated
+          faces = vertex indices of the quads between the samples, 4 values
+            per quad. With point this can be passed directly to AddMesh
+      parallel [opt] = evaluate the rows on multiple threads
+    Returns:
+      dictionary of field name to array.array. faces is an array of integers,
+      the other fields are arrays of doubles
+    Example:
+      import rhinoscriptsyntax as rs
+      grid = rs.SurfaceSampleGrid(id, 100, 100, ["point", "faces"])
+      rs.AddMesh(grid["point"], grid["faces"])
+    """
+    surface = rhutil.coercesurface(surface_id, True)
+    if u_count<2 or v_count<2: raise ValueError("u_count and v_count must be at least 2")
+    udomain, vdomain = surface.Domain(0), surface.Domain(1)
+    us = [udomain.ParameterAt(i/float(u_count-1)) for i in range(u_count)]
+    vs = [vdomain.ParameterAt(j/float(v_count-1)) for j in range(v_count)]
+    nan = float("nan")
+    evaluators = []
+    for field in fields:
+        if field=="uv": evaluators.append((field, lambda u, v: (u, v)))
+        elif field=="point":
+            def point(u, v):
+                p = surface.PointAt(u, v)
+                return p.X, p.Y, p.Z
+            evaluators.append((field, point))
+        elif field=="normal":
+            def normal(u, v):
+                n = surface.NormalAt(u, v)
+                return n.X, n.Y, n.Z
+            evaluators.append((field, normal))
+        elif field=="frame":
+            def frame(u, v):
+                rc, plane = surface.FrameAt(u, v)
+                if not rc: return (nan,)*12
+                o, x, y, z = plane.Origin, plane.XAxis, plane.YAxis, plane.ZAxis
+                return o.X, o.Y, o.Z, x.X, x.Y, x.Z, y.X, y.Y, y.Z, z.X, z.Y, z.Z
+            evaluators.append((field, frame))
+        elif field=="curvature":
+            def curvature(u, v):
+                c = surface.CurvatureAt(u, v)
+                if c is None: return nan, nan, nan, nan
+                return c.Kappa(0), c.Kappa(1), c.Gaussian, c.Mean
+            evaluators.append((field, curvature))
+        elif field!="faces": raise ValueError("%s is not a supported field"%field)
+    def row(u):
+        values = [array.array("d") for evaluator in evaluators]
+        for v in vs:
+            for column, (field, evaluate) in zip(values, evaluators):
+                column.extend(evaluate(u, v))
+        return values
+    if parallel: rows = rhutil.__parallelmap(row, us)
+    else: rows = [row(u) for u in us]
+    rc = {}
+    for i, (field, evaluate) in enumerate(evaluators):
+        column = array.array("d")
+        for values in rows: column.extend(values[i])
+        rc[field] = column
+    if "faces" in fields:
+        faces = array.array("i")
+        for i in range(u_count-1):
+            for j in range(v_count-1):
+                a = i*v_count + j
+                faces.extend((a, a+v_count, a+v_count+1, a+1))
+        rc["faces"] = faces
+    return rc
+
+
 def SurfaceTorus(surface_id):
     """Returns the definition of a surface torus
     Parameters:
@@ -1976,7 +2088,7 @@ def TrimBrep(object_id, cutter, tolerance=None):
                 rc.append(scriptcontext.doc.Objects.AddBrep(breps[i], attr))
     else:
         rc = [scriptcontext.doc.Objects.AddBrep(brep) for brep in breps]
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -2003,7 +2115,7 @@ def TrimSurface( surface_id, direction, interval, delete_input=False):
     if new_surface:
         rc = scriptcontext.doc.Objects.AddSurface(new_surface)
         if delete_input: scriptcontext.doc.Objects.Delete(rhutil.coerceguid(surface_id), True)
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
         return rc
 
 
@@ -2044,6 +2156,6 @@ def UnrollSurface(surface_id, explode=False, following_geometry=None, absolute_t
     for dot in dots:
         id = scriptcontext.doc.Objects.AddTextDot(dot)
         new_following.append(id)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     if following_geometry: return rc, new_following
     return rc
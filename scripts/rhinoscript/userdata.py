@@ -1,5 +1,96 @@
 import scriptcontext
 import utility as rhutil
+import Rhino
+
+
+__usertext_index = None # (doc, key -> value -> set of ids, id -> {key: value}, id -> serial number), see __usertextindex
+
+
+def __usertextindex():
+    """Returns an index of the attribute user text of the objects in the
+    active document as a tuple of (doc, key -> value -> set of object ids,
+    object id -> {key: value}, object id -> runtime serial number). Serial
+    numbers give the order in which objects were added to the document. The
+    index is built once and kept up to date by object table events, which
+    are subscribed the first time the index is built, and by
+    SetUserText/SetUserTextMany
+    """
+    global __usertext_index
+    doc = scriptcontext.doc
+    if not rhutil.__samedocument(__usertext_index, doc):
+        rhutil.__subscribe(("RhinoDoc.AddRhinoObject", __addobjectevent),
+                           ("RhinoDoc.UndeleteRhinoObject", __addobjectevent),
+                           ("RhinoDoc.DeleteRhinoObject", __deleteobjectevent),
+                           ("RhinoDoc.ModifyObjectAttributes", __modifyattributesevent))
+        __usertext_index = doc, {}, {}, {}
+        settings = Rhino.DocObjects.ObjectEnumeratorSettings()
+        settings.HiddenObjects = True
+        settings.LockedObjects = True
+        settings.IncludeLights = True
+        settings.IncludeGrips = False
+        settings.IncludePhantoms = True
+        for rhobj in doc.Objects.GetObjectList(settings):
+            __indexusertext(doc, rhobj, rhobj.Attributes)
+    return __usertext_index
+
+
+def __indexusertext(doc, rhobj, attributes):
+    """replace the index entries of an object with the user text in
+    attributes, or remove them if attributes is None
+    """
+    index = __usertext_index
+    if not rhutil.__samedocument(index, doc): return
+    doc, values, objects, order = index
+    id = rhobj.Id
+    # replace and undo add the new object before the old one with the same id
+    # may be deleted, only the indexed object can remove the entries
+    if attributes is None and order.get(id, rhobj.RuntimeSerialNumber)!=rhobj.RuntimeSerialNumber: return
+    old = objects.pop(id, None)
+    if old:
+        for key, value in old.iteritems():
+            ids = values[key][value]
+            ids.discard(id)
+            if not ids:
+                del values[key][value]
+                if not values[key]: del values[key]
+    if attributes is None or not attributes.UserStringCount:
+        order.pop(id, None)
+        return
+    userstrings = attributes.GetUserStrings()
+    new = {}
+    for i in xrange(userstrings.Count):
+        key = userstrings.GetKey(i)
+        value = userstrings.Get(key)
+        new[key] = value
+        values.setdefault(key, {}).setdefault(value, set()).add(id)
+    objects[id] = new
+    order[id] = rhobj.RuntimeSerialNumber
+
+
+def __usertextobjects(key, value=None, ordered=False):
+    """set of ids of the objects with attribute user text key, and value if
+    given. If ordered is True, a list of the ids in document order
+    """
+    index = __usertextindex()
+    values = index[1].get(key)
+    if not values: rc = set()
+    elif value is not None: rc = set(values.get(value, ()))
+    else: rc = set().union(*values.values())
+    if ordered: return sorted(rc, key=index[3].get)
+    return rc
+
+
+def __addobjectevent(sender, e):
+    __indexusertext(e.TheObject.Document, e.TheObject, e.TheObject.Attributes)
+
+
+def __deleteobjectevent(sender, e):
+    __indexusertext(e.TheObject.Document, e.TheObject, None)
+
+
+def __modifyattributesevent(sender, e):
+    __indexusertext(e.Document, e.RhinoObject, e.NewAttributes)
+
 
 def DeleteDocumentData(section=None, entry=None):
     """Removes user data strings from the current document
@@ -68,6 +159,25 @@ def GetUserText(object_id, key=None, attached_to_geometry=False):
     return [userstrings.GetKey(i) for i in range(userstrings.Count)]
 
 
+def GetUserTextMany(object_ids, key, attached_to_geometry=False):
+    """Returns the value of one user text key for many objects
+    Parameters:
+      object_ids = identifiers of the objects
+      key = the key name
+      attached_to_geometry[opt] = location on the objects to retrieve the user text
+    Returns:
+      list of values, in the order of object_ids. None for objects that do not
+      have the key
+    """
+    rc = []
+    for id in object_ids:
+        rhobj = rhutil.__findobject(rhutil.coerceguid(id, True))[0]
+        if rhobj is None: raise ValueError("%s does not exist in ObjectTable"%id)
+        if attached_to_geometry: rc.append(rhobj.Geometry.GetUserString(key))
+        else: rc.append(rhobj.Attributes.GetUserString(key))
+    return rc
+
+
 def IsDocumentData():
     """Verifies the current document contains user data
     Returns:
@@ -132,4 +242,43 @@ def SetUserText(object_id, key, value=None, attach_to_geometry=False):
     if type(key) is not str: key = str(key)
     if value and type(value) is not str: value = str(value)
     if attach_to_geometry: return obj.Geometry.SetUserString(key, value)
-    return obj.Attributes.SetUserString(key, value)
+    rc = obj.Attributes.SetUserString(key, value)
+    __indexusertext(obj.Document, obj, obj.Attributes)
+    return rc
+
+
+def SetUserTextMany(object_ids, key, values=None, attach_to_geometry=False):
+    """Sets or removes one user text key on many objects
+    Parameters:
+      object_ids = identifiers of the objects
+      key = the key name to set
+      values[opt] = a string value to set on every object, or a list of values
+          in the order of object_ids. If omitted, or for values that are None
+          or empty, the key is removed
+      attach_to_geometry[opt] = location on the objects to store the user text
+    Returns:
+      number of objects that were modified
+    """
+    doc = scriptcontext.doc
+    object_ids = list(object_ids)
+    if type(key) is not str: key = str(key)
+    if values is None or isinstance(values, basestring): values = [values]*len(object_ids)
+    else:
+        values = list(values)
+        if len(values)!=len(object_ids): raise ValueError("object_ids and values must have the same length")
+    # find every object before the first one is modified, so a missing
+    # object does not leave a partial write behind
+    rhobjs = []
+    for id in object_ids:
+        rhobj = rhutil.__findobject(rhutil.coerceguid(id, True))[0]
+        if rhobj is None: raise ValueError("%s does not exist in ObjectTable"%id)
+        rhobjs.append(rhobj)
+    rc = 0
+    for rhobj, value in zip(rhobjs, values):
+        if value and type(value) is not str: value = str(value)
+        if attach_to_geometry:
+            if rhobj.Geometry.SetUserString(key, value): rc += 1
+        elif rhobj.Attributes.SetUserString(key, value):
+            __indexusertext(doc, rhobj, rhobj.Attributes)
+            rc += 1
+    return rc
@@ -1,10 +1,14 @@
 import Rhino
 import System.Drawing.Color, System.Array, System.Guid
 import time
+import array
+import itertools
 import System.Windows.Forms.Clipboard
+import System.Threading.Tasks
 import scriptcontext
 import math
 import string
+import contextlib
 
 
 def ContextIsRhino():
@@ -168,6 +172,94 @@ def CullDuplicatePoints(points, tolerance=-1):
     return list(Rhino.Geometry.Point3d.CullDuplicates(points, tolerance))
 
 
+def __pointchunks(points, chunk_size=65536):
+    """Yields flat x,y,z coordinate arrays for a list or buffer of points. Any
+    other iterable, like a generator, is read item by item. Its items may be
+    single points or chunks of points, single points are gathered into
+    arrays of up to chunk_size points
+    """
+    if hasattr(points, "__len__"):
+        yield coerce3dpointarray(points, True)
+        return
+    pending = array.array("d")
+    for item in points:
+        point = coerce3dpoint(item)
+        if point is not None:
+            pending.extend((point.X, point.Y, point.Z))
+            if len(pending)>=chunk_size*3:
+                yield pending
+                pending = array.array("d")
+            continue
+        if pending:
+            yield pending
+            pending = array.array("d")
+        yield coerce3dpointarray(item, True)
+    if pending: yield pending
+
+
+def CullDuplicatePointsEx(points, tolerance=-1):
+    """Removes duplicates from a large set of 3D points and returns the index
+    of the remaining point that replaces each input point. Points are hashed
+    into a grid of cells the size of tolerance, so only points in neighboring
+    cells are compared. The first point of a group of duplicates is kept
+    Parameters:
+      points = list of 3D points, N x 3 buffer of coordinates, or an iterable
+        such as a generator that yields points or chunks of points. Iterables
+        are read one chunk at a time, so the input does not need to fit in
+        memory
+      tolerance [opt] = Minimum distance between points. Points within this
+        tolerance will be discarded. If omitted, Rhino's internal zero tolerance
+        is used.
+    Returns:
+      tuple of two items
+        element 0 = array.array('d') of the x,y,z coordinates of the points
+          that were kept
+        element 1 = array.array('i') with the index of the kept point that
+          replaces each input point
+    Example:
+      import rhinoscriptsyntax as rs
+      # weld the vertices of a mesh before adding it
+      vertices, index_map = rs.CullDuplicatePointsEx(vertices, 0.001)
+      faces = [[index_map[i] for i in face] for face in faces]
+      rs.AddMesh(vertices, faces)
+    """
+    if tolerance is None or tolerance <= 0:
+        tolerance = Rhino.RhinoMath.ZeroTolerance
+    unique = array.array("d")
+    index_map = array.array("i")
+    cells = {} # cell -> indices of kept points in it
+    tolerance2 = tolerance*tolerance
+    scale = 1.0/tolerance
+    floor = math.floor
+    neighbors = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1) if i or j or k]
+    for coords in __pointchunks(points):
+        for n in xrange(0, len(coords), 3):
+            x, y, z = coords[n], coords[n+1], coords[n+2]
+            cell = (int(floor(x*scale)), int(floor(y*scale)), int(floor(z*scale)))
+            found = -1
+            # most duplicates share the cell of the point they duplicate
+            for index in cells.get(cell, ()):
+                dx, dy, dz = unique[index*3]-x, unique[index*3+1]-y, unique[index*3+2]-z
+                if dx*dx + dy*dy + dz*dz <= tolerance2:
+                    found = index
+                    break
+            if found<0:
+                cx, cy, cz = cell
+                for i, j, k in neighbors:
+                    for index in cells.get((cx+i, cy+j, cz+k), ()):
+                        dx, dy, dz = unique[index*3]-x, unique[index*3+1]-y, unique[index*3+2]-z
+                        if dx*dx + dy*dy + dz*dz <= tolerance2:
+                            found = index
+                            break
+                    if found>=0: break
+            if found<0:
+                found = len(unique)/3
+                unique.extend((x, y, z))
+                cells.setdefault(cell, []).append(found)
+            index_map.append(found)
+    return unique, index_map
+
+
 def Distance(point1, point2):
     """Measures distance between two 3D points, or between a 3D point and
     an array of 3D points.
@@ -188,6 +280,51 @@ def Distance(point1, point2):
     if distances: return distances
 
 
+def EnableObjectCache(enable=True):
+    """Enables or disables the object lookup cache. While enabled, objects and
+    geometry found by id are remembered so repeated calls on the same ids do
+    not search the document again. Entries are dropped when objects are added,
+    deleted, replaced or modified, and the cache is cleared when the active
+    document changes. The cache is disabled again when the command that was
+    running when it was enabled ends, or when any command ends if it was
+    enabled outside of a command, even if the script raised an exception.
+    This way lookups do not carry over into the next script. Use
+    object_cache to enable the cache for a block of code
+    Parameters:
+      enable [opt] = True to enable, False to disable
+    Returns:
+      previous state of the object lookup cache
+    """
+    global __object_cache, __object_cache_commands
+    old = __object_cache is not None
+    if old==enable: return old
+    if enable:
+        __object_cache = scriptcontext.doc, {}
+        __object_cache_commands = list(Rhino.Commands.Command.GetCommandStack() or [])
+        __subscribe(*__objectcache_events)
+    else:
+        __unsubscribe(*__objectcache_events)
+        __object_cache = None
+    return old
+
+
+@contextlib.contextmanager
+def object_cache():
+    """Enables the object lookup cache for a block of code used in a with
+    statement, see EnableObjectCache. The previous state of the cache is
+    restored when the block ends, even if an exception is raised
+    Example:
+      import rhinoscriptsyntax as rs
+      with rs.object_cache():
+          for id in ids: rs.ObjectLayer(id)
+    """
+    old = EnableObjectCache(True)
+    try:
+        yield
+    finally:
+        EnableObjectCache(old)
+
+
 def GetSettings(filename, section=None, entry=None):
     """Returns string from a specified section in a initialization file.
     Parameters:
@@ -258,40 +395,106 @@ def SortPointList(points, tolerance=None):
     return list(Rhino.Geometry.Point3d.SortAndCullPointList(points, tolerance))
 
 
-def SortPoints(points, ascending=True, order=0):
-    "Sorts an array of 3D points"
-    def __cmpXYZ( a, b ):
-        rc = cmp(a.X, b.X)
-        if rc==0: rc = cmp(a.Y, b.Y)
-        if rc==0: rc = cmp(a.Z, b.Z)
-        return rc
-    def __cmpXZY( a, b ):
-        rc = cmp(a.X, b.X)
-        if rc==0: rc = cmp(a.Z, b.Z)
-        if rc==0: rc = cmp(a.Y, b.Y)
-        return rc
-    def __cmpYXZ( a, b ):
-        rc = cmp(a.Y, b.Y)
-        if rc==0: rc = cmp(a.X, b.X)
-        if rc==0: rc = cmp(a.Z, b.Z)
-        return rc
-    def __cmpYZX( a, b ):
-        rc = cmp(a.Y, b.Y)
-        if rc==0: rc = cmp(a.Z, b.Z)
-        if rc==0: rc = cmp(a.X, b.X)
-        return rc
-    def __cmpZXY( a, b ):
-        rc = cmp(a.Z, b.Z)
-        if rc==0: rc = cmp(a.X, b.X)
-        if rc==0: rc = cmp(a.Y, b.Y)
-        return rc
-    def __cmpZYX( a, b ):
-        rc = cmp(a.Z, b.Z)
-        if rc==0: rc = cmp(a.Y, b.Y)
-        if rc==0: rc = cmp(a.X, b.X)
-        return rc
-    sortfunc = (__cmpXYZ, __cmpXZY, __cmpYXZ, __cmpYZX, __cmpZXY, __cmpZYX)[order]
-    return sorted(points, sortfunc, None, not ascending)
+def __gridcoordinates(columns, bits):
+    "x, y and z coordinate columns scaled to integers from 0 to 2**bits-1"
+    rc = []
+    top = (1<<bits)-1
+    for column in columns:
+        low = min(column)
+        size = max(column)-low
+        scale = top/size if size>0 else 0.0
+        rc.append([int((c-low)*scale) for c in column])
+    return rc
+
+
+def __mortonkeys(columns, bits=16):
+    "Morton, or Z-order, keys of points given as coordinate columns"
+    spread = [0]*256 # the bits of a byte, moved apart to every third bit
+    for i in range(256):
+        v = 0
+        for bit in range(8):
+            if i & (1<<bit): v |= 1<<(bit*3)
+        spread[i] = v
+    def interleave(x):
+        return spread[x&255] | spread[(x>>8)&255]<<24 | spread[(x>>16)&255]<<48
+    xs, ys, zs = __gridcoordinates(columns, bits)
+    return [interleave(x)<<2 | interleave(y)<<1 | interleave(z) for x, y, z in itertools.izip(xs, ys, zs)]
+
+
+def __hilbertkeys(columns, bits=16):
+    """Hilbert curve keys of points given as coordinate columns, computed
+    with Skilling's transpose algorithm
+    """
+    top = 1<<(bits-1)
+    rc = []
+    for x in itertools.izip(*__gridcoordinates(columns, bits)):
+        x = list(x)
+        q = top
+        while q>1: # inverse undo excess work
+            p = q-1
+            for i in range(3):
+                if x[i] & q: x[0] ^= p
+                else:
+                    t = (x[0]^x[i]) & p
+                    x[0] ^= t
+                    x[i] ^= t
+            q >>= 1
+        x[1] ^= x[0] # gray encode
+        x[2] ^= x[1]
+        t = 0
+        q = top
+        while q>1:
+            if x[2] & q: t ^= q-1
+            q >>= 1
+        key = 0
+        for bit in range(bits-1, -1, -1):
+            key = key<<3 | ((x[0]^t)>>bit & 1)<<2 | ((x[1]^t)>>bit & 1)<<1 | ((x[2]^t)>>bit & 1)
+        rc.append(key)
+    return rc
+
+
+def SortPoints(points, ascending=True, order=0, grid_size=None, return_indices=False):
+    """Sorts an array of 3D points. The coordinates are read once and the
+    points are sorted by a key, points with equal keys keep their order
+    Parameters:
+      points = list of 3D points, or an N x 3 buffer of coordinates
+      ascending[opt] = sort in ascending order
+      order[opt] = the sort order
+          0 = X, Y, Z
+          1 = X, Z, Y
+          2 = Y, X, Z
+          3 = Y, Z, X
+          4 = Z, X, Y
+          5 = Z, Y, X
+          6 = Morton, or Z-order, spatial order
+          7 = Hilbert curve spatial order
+        Spatial orders keep points that are close to each other close in the
+        sorted list
+      grid_size[opt] = for orders 0 to 5, coordinates are snapped down to a
+        grid of this size before they are compared, so coordinates in the same
+        grid cell sort as equal. This is not a tolerance: two coordinates
+        closer than grid_size can still lie in neighboring cells
+      return_indices[opt] = return the indices of the points in sorted order
+        instead of the points
+    Returns:
+      list of sorted 3D points, or list of indices if return_indices is True
+    """
+    if not 0<=order<=7: raise ValueError("order must be between 0 and 7")
+    if points is None or (hasattr(points, "__len__") and len(points)==0): return []
+    coords = coerce3dpointarray(points, True)
+    columns = [coords[0::3], coords[1::3], coords[2::3]]
+    if order==6: keys = __mortonkeys(columns)
+    elif order==7: keys = __hilbertkeys(columns)
+    else:
+        axes = ((0,1,2), (0,2,1), (1,0,2), (1,2,0), (2,0,1), (2,1,0))[order]
+        columns = [columns[axis] for axis in axes]
+        if grid_size:
+            columns = [[math.floor(c/grid_size) for c in column] for column in columns]
+        keys = zip(*columns)
+    indices = sorted(xrange(len(keys)), key=keys.__getitem__, reverse=not ascending)
+    if return_indices: return indices
+    points = coerce3dpointlist(points, True)
+    return [points[i] for i in indices]
 
 
 def Str2Pt(point):
@@ -371,25 +574,97 @@ def coerce3dvector(vector, raise_on_error=False):
     if raise_on_error: raise ValueError("Could not convert %s to a Vector3d" % vector)
 
 
+def __packedvalues(values, typecode="d"):
+    """Returns a flat sequence of numbers for array.array, memoryview and numpy
+    style buffers. None is returned for any other kind of input. Memoryviews
+    are read as values of their own native format. Byte formats are only
+    accepted when typecode is a byte format too, raw bytes are never
+    reinterpreted as other values
+    """
+    if isinstance(values, array.array): return values
+    if isinstance(values, memoryview):
+        format = values.format
+        if format in ("h", "H", "i", "I", "l", "L", "f", "d") or \
+            (format in ("b", "B") and typecode in ("b", "B")):
+            return array.array(format, values.tobytes())
+        raise ValueError("unsupported memoryview format %s, expected %s"%(format, typecode))
+    if hasattr(values, "__array_interface__") and hasattr(values, "ravel"):
+        return values.ravel().tolist()
+
+
+def __flatpointlist(values):
+    "Convert a flat x,y,z,x,y,z... sequence of numbers into a list of Point3d"
+    point3d = Rhino.Geometry.Point3d
+    it = iter(values)
+    return [point3d(x, y, z) for x, y, z in itertools.izip(it, it, it)]
+
+
 def coerce3dpointlist(points, raise_on_error=False):
-    if isinstance(points, System.Array[Rhino.Geometry.Point3d]):
-        return list(points)
-    if isinstance(points, Rhino.Collections.Point3dList): return list(points)
-    if type(points) is list or type(points) is tuple:
+    """Convert input into a list of Rhino.Geometry.Point3d if possible. The
+    shape of the input is detected once and converted in a single pass.
+    Point3dList, Point3d arrays and lists that only contain Point3d are
+    returned as is, without being copied. Flat lists of numbers,
+    array.array, memoryview and numpy buffers are read as x,y,z triples
+    """
+    if isinstance(points, Rhino.Collections.Point3dList): return points
+    if isinstance(points, System.Array[Rhino.Geometry.Point3d]): return points
+    values = __packedvalues(points)
+    if values is not None:
+        if len(values)>2: return __flatpointlist(values)
+    elif type(points) is list or type(points) is tuple:
         count = len(points)
-        if count>10 and type(points[0]) is Rhino.Geometry.Point3d: return points
-        if count>0 and (coerce3dpoint(points[0]) is not None):
-            return [coerce3dpoint(points[i], raise_on_error) for i in xrange(count)]
-        elif count>2 and type(points[0]) is not list:
-            point_count = count/3
-            rc = []
-            for i in xrange(point_count):
-                pt = Rhino.Geometry.Point3d(points[i*3], points[i*3+1], points[i*3+2])
-                rc.append(pt)
-            return rc
+        first = points[0] if count else None
+        t = type(first)
+        if t is Rhino.Geometry.Point3d:
+            for point in points:
+                if type(point) is not Rhino.Geometry.Point3d: break
+            else:
+                return points
+        elif t is float or t is int or t is long:
+            if count>2: return __flatpointlist(points)
+        elif (t is tuple or t is list) and len(first)==3:
+            point3d = Rhino.Geometry.Point3d
+            try:
+                return [point3d(x, y, z) for x, y, z in points]
+            except:
+                pass # mixed input, fall back to converting item by item
+        if count>0 and (coerce3dpoint(first) is not None):
+            return [coerce3dpoint(point, raise_on_error) for point in points]
+        elif count>2 and t is not list:
+            return __flatpointlist(points)
     if raise_on_error: raise ValueError("Could not convert %s to a list of points" % points)
 
 
+def coerce3dpointarray(points, raise_on_error=False):
+    """Convert input into a flat array.array('d') of x,y,z coordinates. This
+    is the packed form used by functions that work on large point sets. An
+    array.array('d') is returned as is, without being copied
+    """
+    if isinstance(points, array.array) and points.typecode=="d":
+        if len(points)%3==0: return points
+    else:
+        values = __packedvalues(points)
+        if values is None and (type(points) is list or type(points) is tuple):
+            if points and type(points[0]) in (float, int, long): values = points
+        if values is not None and len(values)%3==0:
+            try:
+                return array.array("d", values)
+            except TypeError:
+                pass
+        if values is None:
+            points = coerce3dpointlist(points, raise_on_error)
+            if points is not None:
+                rc = array.array("d", [0.0]) * (len(points)*3)
+                i = 0
+                for point in points:
+                    rc[i] = point.X
+                    rc[i+1] = point.Y
+                    rc[i+2] = point.Z
+                    i += 3
+                return rc
+    if raise_on_error: raise ValueError("Could not convert %s to an array of points" % points)
+
+
 def coerce2dpointlist(points):
     if points is None or isinstance(points, System.Array[Rhino.Geometry.Point2d]):
         return points
@@ -495,10 +770,113 @@ def coercecolor(c, raise_if_bad_input=False):
     if raise_if_bad_input: raise TypeError("%s can not be converted to a Color"%c)
 
 
+__batches = [] # redraw statistics of the active batches, innermost last
+
+
+def __redraw():
+    """Redraws all views. Inside of a document.batch block the redraw is skipped
+    and counted, the batch redraws once when it ends
+    """
+    if __batches:
+        for stats in __batches: stats["redraws_avoided"] += 1
+    else:
+        scriptcontext.doc.Views.Redraw()
+
+
+__subscribed_events = [] # (event name, handler) pairs, see __subscribe
+
+
+def __samedocument(cache, doc):
+    "True if a (doc, ...) cache tuple belongs to doc"
+    return cache is not None and cache[0].RuntimeSerialNumber==doc.RuntimeSerialNumber
+
+
+def __rhinoevent(name):
+    "the owner and name of a Rhino event given by its path in the Rhino namespace"
+    owner, _, name = name.rpartition(".")
+    return reduce(getattr, owner.split("."), Rhino), name
+
+
+def __subscribe(*handlers):
+    """Subscribes (event name, handler) pairs to Rhino events once. Event names
+    are paths in the Rhino namespace like "RhinoDoc.AddRhinoObject". Caches
+    subscribe their handlers when they are first built, so scripts that never
+    use them do not pay for the events
+    """
+    for handler in handlers:
+        if handler in __subscribed_events: continue
+        owner, name = __rhinoevent(handler[0])
+        event = getattr(owner, name)
+        event += handler[1]
+        __subscribed_events.append(handler)
+
+
+def __unsubscribe(*handlers):
+    "Removes (event name, handler) pairs subscribed with __subscribe"
+    for handler in handlers:
+        if handler not in __subscribed_events: continue
+        owner, name = __rhinoevent(handler[0])
+        event = getattr(owner, name)
+        event -= handler[1]
+        __subscribed_events.remove(handler)
+
+
+__object_cache = None # (doc, id -> (RhinoObject, GeometryBase)), see __findobject
+__object_cache_commands = [] # ids of the commands running when the cache was enabled
+
+
+def __objectcache_objectevent(sender, e):
+    "drop an added, deleted, replaced or undeleted object from the lookup cache"
+    if __object_cache: __object_cache[1].pop(e.ObjectId, None)
+
+
+def __objectcache_attributesevent(sender, e):
+    "drop an object with modified attributes from the lookup cache"
+    if __object_cache: __object_cache[1].pop(e.RhinoObject.Id, None)
+
+
+def __objectcache_closeevent(sender, e):
+    "empty the lookup cache when a document is closed"
+    if __object_cache: __object_cache[1].clear()
+
+
+def __objectcache_endcommandevent(sender, e):
+    "disable the lookup cache when the command that enabled it ends"
+    if not __object_cache_commands or e.CommandId in __object_cache_commands:
+        EnableObjectCache(False)
+
+
+__objectcache_events = (("RhinoDoc.AddRhinoObject", __objectcache_objectevent),
+                        ("RhinoDoc.DeleteRhinoObject", __objectcache_objectevent),
+                        ("RhinoDoc.ReplaceRhinoObject", __objectcache_objectevent),
+                        ("RhinoDoc.UndeleteRhinoObject", __objectcache_objectevent),
+                        ("RhinoDoc.ModifyObjectAttributes", __objectcache_attributesevent),
+                        ("RhinoDoc.CloseDocument", __objectcache_closeevent),
+                        ("Commands.Command.EndCommand", __objectcache_endcommandevent))
+
+
+def __findobject(object_id):
+    """Returns a (RhinoObject, GeometryBase) tuple for a Guid, using the object
+    lookup cache when it is enabled. (None, None) if the object does not exist
+    """
+    global __object_cache
+    cache = __object_cache
+    if cache is not None:
+        if not __samedocument(cache, scriptcontext.doc):
+            cache = __object_cache = scriptcontext.doc, {}
+        rc = cache[1].get(object_id)
+        if rc is not None: return rc
+    rhobj = scriptcontext.doc.Objects.Find(object_id)
+    if rhobj is None: return None, None
+    rc = rhobj, rhobj.Geometry
+    if cache is not None: cache[1][object_id] = rc
+    return rc
+
+
 def coerceline(line, raise_if_bad_input=False):
     if type(line) is Rhino.Geometry.Line: return line
     guid = coerceguid(line, False)
-    if guid: line = scriptcontext.doc.Objects.Find(guid).Geometry
+    if guid: line = __findobject(guid)[1]
     if isinstance(line, Rhino.Geometry.Curve) and line.IsLinear:
         return Rhino.Geometry.Line(line.PointAtStart, line.PointAtEnd)
     points = coerce3dpointlist(line, raise_if_bad_input)
@@ -513,8 +891,8 @@ def coercegeometry(id, raise_if_missing=False):
     if isinstance(id, Rhino.DocObjects.RhinoObject): return id.Geometry
     id = coerceguid(id, raise_if_missing)
     if id:
-        rhobj = scriptcontext.doc.Objects.Find(id)
-        if rhobj: return rhobj.Geometry
+        rhobj, geometry = __findobject(id)
+        if rhobj: return geometry
     if raise_if_missing: raise ValueError("unable to convert %s into geometry"%id)
 
 
@@ -531,9 +909,8 @@ def coercecurve(id, segment_index=-1, raise_if_missing=False):
     if isinstance(id, Rhino.Geometry.Curve): return id
     if type(id) is Rhino.DocObjects.ObjRef: return id.Curve()
     id = coerceguid(id, True)
-    crvObj = scriptcontext.doc.Objects.Find(id)
+    crvObj, curve = __findobject(id)
     if crvObj:
-        curve = crvObj.Geometry
         if curve and segment_index>=0 and type(curve) is Rhino.Geometry.PolyCurve:
             curve = curve.SegmentCurve(segment_index)
         if isinstance(curve, Rhino.Geometry.Curve): return curve
@@ -545,9 +922,8 @@ def coercesurface(object_id, raise_if_missing=False):
     if isinstance(object_id, Rhino.Geometry.Surface): return object_id
     if type(object_id) is Rhino.DocObjects.ObjRef: return object_id.Face()
     object_id = coerceguid(object_id, True)
-    srfObj = scriptcontext.doc.Objects.Find(object_id)
+    srfObj, srf = __findobject(object_id)
     if srfObj:
-        srf = srfObj.Geometry
         if isinstance(srf, Rhino.Geometry.Surface): return srf
         #single face breps are considered surfaces in the context of scripts
         if isinstance(srf, Rhino.Geometry.Brep) and srf.Faces.Count==1:
@@ -561,9 +937,8 @@ def coercemesh(object_id, raise_if_missing=False):
     if isinstance(object_id, Rhino.Geometry.Mesh): return object_id
     object_id = coerceguid(object_id, raise_if_missing)
     if object_id: 
-        meshObj = scriptcontext.doc.Objects.Find(object_id)
+        meshObj, mesh = __findobject(object_id)
         if meshObj:
-            mesh = meshObj.Geometry
             if isinstance(mesh, Rhino.Geometry.Mesh): return mesh
     if raise_if_missing: raise ValueError("unable to convert %s into Mesh geometry"%object_id)
 
@@ -573,6 +948,119 @@ def coercerhinoobject(object_id, raise_if_bad_input=False, raise_if_missing=Fals
     if isinstance(object_id, Rhino.DocObjects.RhinoObject): return object_id
     object_id = coerceguid(object_id, raise_if_bad_input)
     if object_id is None: return None
-    rc = scriptcontext.doc.Objects.Find(object_id)
+    rc = __findobject(object_id)[0]
     if not rc and raise_if_missing: raise ValueError("%s does not exist in ObjectTable" % object_id)
     return rc
+
+
+def __parallelmap(func, items):
+    """Calls func on every item on the .NET thread pool and returns the
+    results in the order of items. func must not touch the document
+    """
+    items = list(items)
+    rc = [None]*len(items)
+    if len(items)<2: return [func(item) for item in items]
+    def body(i): rc[i] = func(items[i])
+    System.Threading.Tasks.Parallel.For(0, len(items), System.Action[int](body))
+    return rc
+
+
+def __boxtuple(geometry):
+    "world bounding box of geometry as a (minx, miny, minz, maxx, maxy, maxz) tuple"
+    bbox = geometry.GetBoundingBox(True)
+    return bbox.Min.X, bbox.Min.Y, bbox.Min.Z, bbox.Max.X, bbox.Max.Y, bbox.Max.Z
+
+
+def __boxesoverlap(a, b, tolerance=0.0):
+    "True if two bounding box tuples overlap or are within tolerance"
+    return a[0]<=b[3]+tolerance and b[0]<=a[3]+tolerance and \
+           a[1]<=b[4]+tolerance and b[1]<=a[4]+tolerance and \
+           a[2]<=b[5]+tolerance and b[2]<=a[5]+tolerance
+
+
+def __overlapclusters(boxes, tolerance=0.0):
+    """Groups axis aligned boxes, given as (minx, miny, minz, maxx, maxy, maxz)
+    tuples, into clusters of transitively overlapping boxes
+    Returns:
+      list of lists of box indices
+    """
+    parents = range(len(boxes))
+    def root(i):
+        while parents[i]!=i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+    # sweep along x, only boxes that are still open can overlap the next one
+    active = []
+    for i in sorted(range(len(boxes)), key=lambda i: boxes[i][0]):
+        box = boxes[i]
+        active = [j for j in active if boxes[j][3]+tolerance>=box[0]]
+        for j in active:
+            if __boxesoverlap(box, boxes[j], tolerance): parents[root(j)] = root(i)
+        active.append(i)
+    clusters = {}
+    for i in range(len(boxes)): clusters.setdefault(root(i), []).append(i)
+    return sorted(clusters.values())
+
+
+def __parallelunion(items, boxes, union, tolerance=0.0, chunk_size=8):
+    """Divide and conquer boolean union. Items are grouped into clusters of
+    overlapping bounding boxes, large clusters are split into spatially
+    sorted chunks, and the chunks are unioned on the thread pool. The partial
+    results of neighboring chunks are then unioned in rounds until one
+    result is left for every cluster. If that final union fails, the whole
+    cluster is unioned again at once, and if this fails too the cluster is
+    left out. Items that do not overlap any other item are left out as well
+    Parameters:
+      items = list of geometry
+      boxes = bounding box tuples of the items, see __overlapclusters
+      union = function that unions a list of geometry into a list of
+        geometry, or returns None on failure
+    Returns:
+      tuple containing the list of unioned geometry and the sorted list of
+      indices of the items that are part of it. Both lists are empty if
+      nothing was unioned
+    """
+    pending = [] # (cluster, list of chunks) per cluster
+    for cluster in __overlapclusters(boxes, tolerance):
+        if len(cluster)==1: continue
+        extent = [max(boxes[i][k+3] for i in cluster)-min(boxes[i][k] for i in cluster) for k in range(3)]
+        axis = extent.index(max(extent))
+        cluster.sort(key=lambda i: boxes[i][axis]+boxes[i][axis+3])
+        chunks = [[items[i] for i in cluster[j:j+chunk_size]] for j in range(0, len(cluster), chunk_size)]
+        pending.append((cluster, chunks))
+    rc, used = [], []
+    first = True
+    while pending:
+        work = [chunk for cluster, chunks in pending for chunk in chunks if len(chunk)>1]
+        results = iter(__parallelmap(union, work))
+        merged = []
+        for cluster, chunks in pending:
+            unioned = []
+            for chunk in chunks:
+                if len(chunk)<2:
+                    unioned.append(chunk)
+                    continue
+                result = next(results)
+                if result is not None: result = list(result)
+                elif len(chunks)>1:
+                    # a chunk of a larger cluster may not intersect at all,
+                    # keep its parts for the next round
+                    result = chunk
+                unioned.append(result)
+            if len(unioned)>1:
+                merged.append((cluster, [unioned[i]+unioned[i+1] if i+1<len(unioned) else unioned[i]
+                                         for i in range(0, len(unioned), 2)]))
+                continue
+            result = unioned[0]
+            if result is None and not first:
+                # the partial results can fail to union where the serial
+                # union of all parts does not, try that before giving up
+                result = union([items[i] for i in cluster])
+            if result is None: continue
+            rc.extend(result)
+            used.extend(cluster)
+        pending = merged
+        first = False
+    return rc, sorted(used)
+
@@ -43,7 +43,7 @@ def AddDetail(layout_id, corner1, corner2, title=None, projection=1):
     projection = System.Enum.ToObject(Rhino.Display.DefinedViewportProjection, projection)
     detail = layout.AddDetailView(title, corner1, corner2, projection)
     if not detail: return scriptcontext.errorhandler()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return detail.Id
 
 
@@ -124,7 +124,7 @@ def CurrentDetail(layout, detail=None, return_name=True):
         else:
             if id: page.SetActiveDetail(id)
             else: page.SetActiveDetail(detail, False)
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
     return rc
 
 
@@ -215,7 +215,7 @@ def DetailScale(detail_id, model_length=None, page_length=None):
         page_units = scriptcontext.doc.PageUnitSystem
         if detail.DetailGeometry.SetScale(model_length, model_units, page_length, page_units):
             detail.CommitChanges()
-            scriptcontext.doc.Views.Redraw()
+            rhutil.__redraw()
     return rc
 
 
@@ -750,7 +750,7 @@ def ViewDisplayMode(view=None, mode=None, return_name=True):
         else:
             desc = Rhino.Display.DisplayModeDescription.FindByName(mode)
         if desc: view.ActiveViewport.DisplayMode = desc
-        scriptcontext.doc.Views.Redraw()
+        rhutil.__redraw()
     return rc
 
 
@@ -979,7 +979,7 @@ def ZoomBoundingBox(bounding_box, view=None, all=False):
       else:
           view = __viewhelper(view)
           view.ActiveViewport.ZoomBoundingBox(bbox)
-      scriptcontext.doc.Views.Redraw()
+      rhutil.__redraw()
 
 
 def ZoomExtents(view=None, all=False):
@@ -994,7 +994,7 @@ def ZoomExtents(view=None, all=False):
     else:
         view = __viewhelper(view)
         view.ActiveViewport.ZoomExtents()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
 
 
 def ZoomSelected(view=None, all=False):
@@ -1009,4 +1009,4 @@ def ZoomSelected(view=None, all=False):
     else:
         view = __viewhelper(view)
         view.ActiveViewport.ZoomExtentsSelected()
-    scriptcontext.doc.Views.Redraw()
+    rhutil.__redraw()
@@ -14,18 +14,11 @@ def ArrayPointsOnSurface():
     columns = rs.GetInteger("Number of columns", 2, 2)
     if columns is None: return
 
-    # Get the domain of the surface
-    U = rs.SurfaceDomain(surface_id, 0)
-    V = rs.SurfaceDomain(surface_id, 1)
-    if U is None or V is None: return
+    # Evaluate the whole grid, spanning the surface's domain, in one call
+    grid = rs.SurfaceSampleGrid(surface_id, rows, columns, ["point"])
 
     # Add the points
-    for i in xrange(0,rows):
-        param0 = U[0] + (((U[1] - U[0]) / (rows-1)) * i)
-        for j in xrange(0,columns):
-            param1 = V[0] + (((V[1] - V[0]) / (columns-1)) * j)
-            point = rs.EvaluateSurface(surface_id, param0, param1)
-            rs.AddPoint(point)
+    rs.AddPoints(grid["point"])
 
 
 # Check to see if this file is being executed as the "main" python
@@ -1,4 +1,4 @@
-# Export the coordinates of point and point cloud objects to a text file.
+# Export the coordinates of point and point cloud objects to a point file.
 import rhinoscriptsyntax as rs
 
 def ExportPoints():
@@ -7,21 +7,12 @@ def ExportPoints():
     if( objectIds==None ): return
 
     #Get the filename to create
-    filter = "Text File (*.txt)|*.txt|All Files (*.*)|*.*||"
+    filter = "Text File (*.txt)|*.txt|CSV File (*.csv)|*.csv|PLY File (*.ply)|*.ply|All Files (*.*)|*.*||"
     filename = rs.SaveFileName("Save point coordinates as", filter)
     if( filename==None ): return
     
-    file = open(filename, "w")
-    for id in objectIds:
-        #process point clouds
-        if( rs.IsPointCloud(id) ):
-            points = rs.PointCloudPoints(id)
-            for pt in points:
-                file.writeline(str(pt))
-        elif( rs.IsPoint(id) ):
-            point = rs.PointCoordinates(id)
-            file.writeline(str(point))
-    file.close()
+    #point clouds are written in chunks
+    rs.ExportPoints(objectIds, filename)
 
 
 ##########################################################################
@@ -1,27 +1,14 @@
-# Import points from a text file
+# Import points from a text, PTS or PLY file
 import rhinoscriptsyntax as rs
 
 def ImportPoints():
     #prompt the user for a file to import
-    filter = "Text file (*.txt)|*.txt|All Files (*.*)|*.*||"
+    filter = "Point Files (*.txt;*.xyz;*.csv;*.pts;*.ply)|*.txt;*.xyz;*.csv;*.pts;*.ply|All Files (*.*)|*.*||"
     filename = rs.OpenFileName("Open Point File", filter)
     if not filename: return
     
-    #read each line from the file
-    file = open(filename, "r")
-    contents = file.readlines()
-    file.close()
-
-    # local helper function    
-    def __point_from_string(text):
-        items = text.strip("()\n").split(",")
-        x = float(items[0])
-        y = float(items[1])
-        z = float(items[2])
-        return x, y, z
-
-    contents = [__point_from_string(line) for line in contents]
-    rs.AddPoints(contents)
+    #read the file in chunks and add a point object for every point
+    rs.ImportPoints(filename, point_cloud=False)
 
 
 
@@ -24,3 +24,13 @@ if val:
 # save the value for use in the future
 scriptcontext.sticky["my_key"] = stickyval
 
+
+# Large values, like meshes or analysis results, should go into a bounded
+# cache instead. It is also kept in sticky, but evicts the least recently
+# used values when it grows past its limit
+cache = scriptcontext.sticky_cache(max_bytes=100*1024*1024)
+squares = cache.get("squares", region="sample")
+if squares is None:
+    squares = [i*i for i in xrange(100000)]
+    cache.set("squares", squares, region="sample")
+print "cache =", cache.stats("sample")
@@ -1,5 +1,12 @@
 # scriptcontext module
 import RhinoPython.Host as __host
+import collections
+import cPickle
+import hashlib
+import os
+import sys
+import threading
+import time
 
 '''The Active Rhino document (Rhino.RhinoDoc in RhinoCommon) while a script
 is executing. This variable is set by Rhino before the exection of every script.
@@ -34,3 +41,326 @@ def errorhandler():
     replace the scriptcontext.errorhandler value
     '''
     return None
+
+
+class StickyCache(object):
+    """A bounded cache for values that are reused between executions of
+    scripts, like meshes, analysis grids or intersection results. Unlike
+    sticky, the cache does not grow without limit. When it holds more than
+    max_items values or max_bytes bytes, the least recently used values are
+    evicted. Values can expire after ttl seconds and are kept in regions, so
+    scripts that share the cache do not overwrite each other's keys.
+    Evicted values that can be pickled are written to spill_directory, if
+    given, and read back when they are asked for again.
+    Use sticky_cache to get a cache that is kept in sticky.
+    Parameters:
+      name = name of the cache, used to name the files of spilled values
+      max_bytes[opt] = maximum estimated size of the values in memory
+      max_items[opt] = maximum number of values in memory
+      ttl[opt] = default number of seconds after which values expire
+      spill_directory[opt] = directory to write evicted values to
+    Example:
+      import scriptcontext
+      cache = scriptcontext.sticky_cache(max_bytes=200*1024*1024)
+      mesh = cache.get(brep_id, region="meshes")
+      if mesh is None:
+          mesh = CreateMesh(brep_id)
+          cache.set(brep_id, mesh, region="meshes")
+    """
+    __missing = object()
+
+    def __init__(self, name="default", max_bytes=None, max_items=None, ttl=None, spill_directory=None):
+        self.name = name
+        self.ttl = ttl
+        self.spill_directory = spill_directory
+        self.__entries = collections.OrderedDict() # (region, key) -> [value, size, expires]
+        self.__bytes = 0
+        self.__stats = {}
+        self.__lock = threading.RLock()
+        self.__max_bytes = max_bytes
+        self.__max_items = max_items
+
+    @property
+    def max_bytes(self):
+        "maximum estimated size of the values in memory, lowering it evicts values right away"
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self.__lock:
+            self.__max_bytes = value
+            self.__evict()
+
+    @property
+    def max_items(self):
+        "maximum number of values in memory, lowering it evicts values right away"
+        return self.__max_items
+
+    @max_items.setter
+    def max_items(self, value):
+        with self.__lock:
+            self.__max_items = value
+            self.__evict()
+
+    def __len__(self): return len(self.__entries)
+    def __contains__(self, key):
+        # does not count a hit or a miss or mark the value as recently used,
+        # so "if key in cache: cache[key]" counts one hit
+        with self.__lock:
+            entry = self.__entries.get(("", key))
+            if entry is not None: return entry[2] is None or entry[2]>time.time()
+            filename = self.__spillfile("", key)
+            return filename is not None and os.path.isfile(filename)
+    def __getitem__(self, key):
+        value = self.get(key, self.__missing)
+        if value is self.__missing: raise KeyError(key)
+        return value
+    def __setitem__(self, key, value): self.set(key, value)
+    def __delitem__(self, key):
+        if not self.remove(key): raise KeyError(key)
+
+    def __count(self, region, name, amount=1):
+        stats = self.__stats.get(region)
+        if stats is None:
+            stats = self.__stats[region] = dict.fromkeys(("hits", "misses", "evictions", "expirations", "spills", "loads"), 0)
+        stats[name] += amount
+
+    def __estimatesize(self, value, depth=0):
+        "rough size of a value in bytes"
+        if hasattr(value, "MemoryEstimate"):
+            try:
+                return int(value.MemoryEstimate())
+            except Exception:
+                pass
+        if hasattr(value, "itemsize") and hasattr(value, "__len__"):
+            return value.itemsize*len(value) + 64
+        try:
+            size = sys.getsizeof(value)
+        except (AttributeError, TypeError, NotImplementedError):
+            size = 64
+        if depth<3:
+            if isinstance(value, (list, tuple, set, frozenset)):
+                size += sum(self.__estimatesize(item, depth+1) for item in value)
+            elif isinstance(value, dict):
+                for item in value.iteritems(): size += self.__estimatesize(item, depth+1)
+        return size
+
+    def __spillprefix(self, region=None):
+        "start of the names of the spilled files of the cache, or of one region"
+        rc = hashlib.md5(repr(self.name)).hexdigest()[:8] + "-"
+        if region is None: return rc
+        return rc + hashlib.md5(repr(region)).hexdigest()[:8] + "-"
+
+    def __spillfile(self, region, key):
+        "name of the file a value is spilled to"
+        if not self.spill_directory: return None
+        filename = self.__spillprefix(region) + hashlib.md5(repr(key)).hexdigest() + ".pickle"
+        return os.path.join(self.spill_directory, filename)
+
+    def __spill(self, region, key, value, expires):
+        "writes an evicted value to disk, returns True if the value was written"
+        filename = self.__spillfile(region, key)
+        if filename is None: return False
+        try:
+            data = cPickle.dumps((key, expires, value), cPickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if not os.path.isdir(self.spill_directory): os.makedirs(self.spill_directory)
+        file = open(filename, "wb")
+        try:
+            file.write(data)
+        finally:
+            file.close()
+        self.__count(region, "spills")
+        return True
+
+    def __load(self, region, key):
+        "reads a spilled value back from disk. Returns (found, value, expires)"
+        filename = self.__spillfile(region, key)
+        if filename is None or not os.path.isfile(filename): return False, None, None
+        try:
+            file = open(filename, "rb")
+            try:
+                stored_key, expires, value = cPickle.load(file)
+            finally:
+                file.close()
+        except Exception:
+            return False, None, None
+        if stored_key!=key: return False, None, None
+        os.remove(filename)
+        if expires is not None and expires<=time.time():
+            self.__count(region, "expirations")
+            return False, None, None
+        self.__count(region, "loads")
+        return True, value, expires
+
+    def __discard(self, entry_key):
+        entry = self.__entries.pop(entry_key, None)
+        if entry is not None: self.__bytes -= entry[1]
+        return entry
+
+    def __evict(self):
+        "removes least recently used values until the cache is within its limits"
+        now = time.time()
+        while self.__entries and ((self.max_items is not None and len(self.__entries)>self.max_items) or
+                                  (self.max_bytes is not None and self.__bytes>self.max_bytes)):
+            entry_key, (value, size, expires) = self.__entries.popitem(last=False)
+            self.__bytes -= size
+            region, key = entry_key
+            if expires is not None and expires<=now:
+                self.__count(region, "expirations")
+                continue
+            self.__count(region, "evictions")
+            self.__spill(region, key, value, expires)
+
+    def get(self, key, default=None, region=""):
+        """Returns a cached value and marks it as most recently used
+        Parameters:
+          key = the key of the value
+          default[opt] = value returned if the key is not in the cache
+          region[opt] = the region of the key
+        Returns:
+          the cached value, or default
+        """
+        with self.__lock:
+            entry_key = (region, key)
+            entry = self.__entries.get(entry_key)
+            if entry is not None:
+                if entry[2] is None or entry[2]>time.time():
+                    del self.__entries[entry_key]
+                    self.__entries[entry_key] = entry
+                    self.__count(region, "hits")
+                    return entry[0]
+                self.__discard(entry_key)
+                self.__count(region, "expirations")
+            elif self.spill_directory:
+                found, value, expires = self.__load(region, key)
+                if found:
+                    self.__store(region, key, value, None, expires)
+                    self.__count(region, "hits")
+                    return value
+            self.__count(region, "misses")
+            return default
+
+    def __store(self, region, key, value, size, expires):
+        if size is None: size = self.__estimatesize(value)
+        entry_key = (region, key)
+        self.__discard(entry_key)
+        if self.max_bytes is not None and size>self.max_bytes:
+            # the value alone is larger than the cache
+            self.__count(region, "evictions")
+            return self.__spill(region, key, value, expires)
+        self.__entries[entry_key] = [value, size, expires]
+        self.__bytes += size
+        self.__evict()
+        return entry_key in self.__entries
+
+    def set(self, key, value, region="", ttl=None, size=None):
+        """Adds or replaces a value in the cache
+        Parameters:
+          key = the key of the value. Keys of values that are spilled to disk
+            should have a repr that does not change between sessions, like
+            strings, numbers, Guids or tuples of those
+          value = the value to cache
+          region[opt] = the region of the key
+          ttl[opt] = seconds after which the value expires. If omitted, the
+            ttl of the cache is used
+          size[opt] = size of the value in bytes. If omitted, the size is
+            estimated
+        Returns:
+          True if the value is kept in memory, False if it was evicted or
+          spilled right away because it is larger than max_bytes
+        """
+        if ttl is None: ttl = self.ttl
+        expires = None
+        if ttl is not None: expires = time.time() + ttl
+        with self.__lock:
+            if self.spill_directory:
+                filename = self.__spillfile(region, key)
+                if os.path.isfile(filename): os.remove(filename)
+            return self.__store(region, key, value, size, expires)
+
+    def remove(self, key, region=""):
+        """Removes a value from the cache and from the spill directory
+        Returns:
+          True if the value was in the cache
+        """
+        with self.__lock:
+            rc = self.__discard((region, key)) is not None
+            filename = self.__spillfile(region, key)
+            if filename and os.path.isfile(filename):
+                os.remove(filename)
+                rc = True
+            return rc
+
+    def clear(self, region=None):
+        """Removes all values, or all values of one region, from the cache and
+        from the spill directory. Statistics of the removed regions are reset
+        """
+        with self.__lock:
+            if region is None:
+                self.__entries.clear()
+                self.__bytes = 0
+                self.__stats.clear()
+            else:
+                for entry_key in [k for k in self.__entries if k[0]==region]:
+                    self.__discard(entry_key)
+                self.__stats.pop(region, None)
+            if self.spill_directory and os.path.isdir(self.spill_directory):
+                prefix = self.__spillprefix(region)
+                for filename in os.listdir(self.spill_directory):
+                    if filename.startswith(prefix) and filename.endswith(".pickle"):
+                        os.remove(os.path.join(self.spill_directory, filename))
+
+    def memoize(self, region="", ttl=None):
+        """Returns a decorator that caches the results of a function by its
+        arguments. The arguments must be hashable
+        Example:
+          cache = scriptcontext.sticky_cache()
+          @cache.memoize(region="contours")
+          def Contours(brep_id, interval): ...
+        """
+        def decorator(function):
+            def wrapper(*args, **kwargs):
+                key = (function.__module__, function.__name__, args, tuple(sorted(kwargs.items())))
+                value = self.get(key, self.__missing, region)
+                if value is self.__missing:
+                    value = function(*args, **kwargs)
+                    self.set(key, value, region, ttl)
+                return value
+            wrapper.__name__ = function.__name__
+            wrapper.__doc__ = function.__doc__
+            return wrapper
+        return decorator
+
+    def stats(self, region=None):
+        """Returns the statistics of the cache, or of one region, as a dict with
+        items, bytes, hits, misses, evictions, expirations, spills and loads
+        """
+        with self.__lock:
+            rc = dict.fromkeys(("hits", "misses", "evictions", "expirations", "spills", "loads"), 0)
+            for r, stats in self.__stats.iteritems():
+                if region is None or r==region:
+                    for name, value in stats.iteritems(): rc[name] += value
+            entries = [entry for (r, key), entry in self.__entries.iteritems() if region is None or r==region]
+            rc["items"] = len(entries)
+            rc["bytes"] = sum(entry[1] for entry in entries)
+            return rc
+
+
+def sticky_cache(name="default", max_bytes=None, max_items=None, ttl=None, spill_directory=None):
+    """Returns the StickyCache with a name, creating it the first time it is
+    asked for. The cache is kept in sticky, so its values survive between
+    executions of scripts. Limits that are given replace the limits of an
+    existing cache, values over lower limits are evicted right away
+    """
+    sticky_key = "scriptcontext.StickyCache." + name
+    cache = sticky.get(sticky_key)
+    if cache is None:
+        cache = sticky[sticky_key] = StickyCache(name, max_bytes, max_items, ttl, spill_directory)
+        return cache
+    if max_bytes is not None: cache.max_bytes = max_bytes
+    if max_items is not None: cache.max_items = max_items
+    if ttl is not None: cache.ttl = ttl
+    if spill_directory is not None: cache.spill_directory = spill_directory
+    return cache